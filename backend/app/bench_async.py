@@ -0,0 +1,184 @@
+"""
+Benchmark the public read endpoints with the sync and the async database mode.
+
+Builds a scratch SQLite database with finished, published tournaments
+linked to a ranking, then starts uvicorn once per mode (ASYNC_DATABASE=0
+and 1) with the public response cache disabled so that every request
+reaches the database.  Many concurrent keep-alive clients request a mix
+of public and standings endpoints; throughput and latency percentiles
+are reported for each mode.
+Run: python -m app.bench_async [--clients N] [--seconds S] [--tournaments T]
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def build_database(url: str, tournaments: int, players: int) -> Tuple[List[int], int]:
+    """Fill a fresh database; returns (tournament ids, ranking id)."""
+    os.environ["DATABASE_URL"] = url
+    from app.core.database import SessionLocal
+    from app.core.migrations import upgrade_database
+    from app.models import Player, Ranking, Tournament, TournamentPlayer, BracketMatch, PoolMatch, User
+    from app.services.pool_service import generate_pools, update_pool_match_score, get_pool_players_split
+    from app.services.bracket_service import generate_bracket, update_bracket_match_score
+    from app.services.ranking_job_service import wait_for_ranking_jobs
+
+    upgrade_database()
+    rng = random.Random(1)
+    db = SessionLocal()
+    try:
+        owner = User(username="bench", email="bench@example.com", hashed_password="-", role="admin", is_approved=True)
+        db.add(owner)
+        roster = [Player(name=f"Player {i}") for i in range(players)]
+        db.add_all(roster)
+        db.commit()
+        ranking = Ranking(name="Bench", created_by=owner.id)
+        db.add(ranking)
+        db.commit()
+        tournament_ids = []
+        for k in range(tournaments):
+            t = Tournament(name=f"Bench {k}", created_by=owner.id, ranking_id=ranking.id, is_published=True)
+            db.add(t)
+            db.commit()
+            for p in rng.sample(roster, players - k % 3):
+                db.add(TournamentPlayer(tournament_id=t.id, player_id=p.id))
+            db.commit()
+            generate_pools(db, t)
+            for m in db.query(PoolMatch).filter(PoolMatch.tournament_id == t.id).all():
+                update_pool_match_score(db, m.id, 3, rng.randint(0, 2))
+            split = get_pool_players_split(db, t.id, 2)
+            generate_bracket(
+                db, t, split["winners"],
+                loser_player_ids=split["losers"] or None, player_pool_map=split["player_pool_map"],
+            )
+            while True:
+                todo = [
+                    m for m in db.query(BracketMatch).filter(BracketMatch.tournament_id == t.id).all()
+                    if m.played != 1 and m.player1_id and m.player2_id
+                ]
+                if not todo:
+                    break
+                update_bracket_match_score(db, todo[0].id, 3, rng.randint(0, 2))
+            tournament_ids.append(t.id)
+        wait_for_ranking_jobs(120)
+        return tournament_ids, ranking.id
+    finally:
+        db.close()
+
+
+async def _request(reader, writer, path: str) -> int:
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {k.lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+    return status
+
+
+async def _client(port: int, paths: List[str], deadline: float, latencies: List[float], errors: List[int]):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    rng = random.Random(id(latencies) ^ id(reader))
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = await _request(reader, writer, rng.choice(paths))
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def _load(port: int, paths: List[str], clients: int, seconds: float) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors: List[int] = []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(_client(port, paths, deadline, latencies, errors) for _ in range(clients)))
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies), "rps": len(latencies) / seconds, "errors": len(errors),
+        "p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99),
+    }
+
+
+def _serve(url: str, port: int, async_mode: bool) -> subprocess.Popen:
+    env = dict(
+        os.environ, DATABASE_URL=url, ASYNC_DATABASE="1" if async_mode else "0", PUBLIC_CACHE_SIZE="0",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    for _ in range(200):
+        try:
+            asyncio.run(_health(port))
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise SystemExit("uvicorn did not start")
+
+
+async def _health(port: int) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        await _request(reader, writer, "/api/health")
+    finally:
+        writer.close()
+
+
+def run(clients: int, seconds: float, tournaments: int, players: int, port: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        tournament_ids, ranking_id = build_database(url, tournaments, players)
+        paths = [f"/api/public/rankings/{ranking_id}/standings", "/api/public/tournaments"]
+        for tid in tournament_ids:
+            paths += [f"/api/public/tournaments/{tid}{s}" for s in ("", "/pools", "/standings", "/bracket")]
+        print(f"{len(tournament_ids)} tournaments, {players} players, {clients} clients, {seconds:g}s per mode")
+        print(f"{'mode':<6} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for async_mode in (False, True):
+            server = _serve(url, port, async_mode)
+            try:
+                asyncio.run(_load(port, paths, clients, 1.0))  # warm up
+                r = asyncio.run(_load(port, paths, clients, seconds))
+            finally:
+                server.terminate()
+                server.wait()
+            print(
+                f"{'async' if async_mode else 'sync':<6} {r['requests']:>9} {r['rps']:>8.0f} "
+                f"{r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f} {r['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent connections (default: 100)")
+    parser.add_argument("--seconds", type=float, default=10, help="Measured seconds per mode (default: 10)")
+    parser.add_argument("--tournaments", type=int, default=8, help="Tournaments to create (default: 8)")
+    parser.add_argument("--players", type=int, default=24, help="Players per tournament (default: 24)")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the benchmark server")
+    args = parser.parse_args()
+    run(args.clients, args.seconds, args.tournaments, args.players, args.port)
@@ -0,0 +1,149 @@
+"""
+Benchmark the serialization of the bracket and pools list responses.
+
+"before" is the model path: one BracketMatchOut / PoolMatchOut per row,
+returned through ``response_model`` (validated and serialized again by
+FastAPI).  "after" is the fast path the endpoints use: plain row dicts
+encoded to JSON bytes by the precompiled ``*_rows_adapter``.  Both run
+through a real FastAPI app on synthetic rows, so database time is left
+out and only the response building is compared.
+Run: python -m app.bench_serialization [ROWS ...]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import os
+import time
+from typing import Any, Dict, List
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+
+from app.core.streaming import json_array_response
+from app.schemas.tournament import (
+    BracketMatchOut, PoolMatchOut, PoolOut, bracket_rows_adapter, pool_rows_adapter,
+)
+
+POOL_MATCHES = 10  # a pool of five players
+
+
+def make_bracket_rows(n: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i, "tournament_id": 1, "bracket_type": "winner" if i % 3 else "loser",
+            "round_number": i % 7 + 1, "match_number": i,
+            "player1_id": i * 2, "player2_id": i * 2 + 1 if i % 5 else None,
+            "player1_legs": 4, "player2_legs": i % 4,
+            "winner_id": i * 2, "loser_id": i * 2 + 1 if i % 5 else None, "played": 1,
+            "next_winner_match_id": i + 1, "next_loser_match_id": None,
+            "player1_name": f"Player {i * 2}", "player2_name": f"Player {i * 2 + 1}" if i % 5 else None,
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def make_pool_rows(n: int) -> List[Dict[str, Any]]:
+    pools = []
+    for p in range(1, n // POOL_MATCHES + 1):
+        name = f"Pool {p}"
+        players = [
+            {"player_id": p * 10 + k, "player_name": f"Player {p * 10 + k}", "seed": None}
+            for k in range(5)
+        ]
+        matches = [
+            {
+                "id": p * 100 + k, "pool_id": p, "tournament_id": 1,
+                "player1_id": p * 10 + k % 5, "player2_id": p * 10 + (k + 1) % 5,
+                "player1_legs": 3, "player2_legs": k % 3, "winner_id": p * 10 + k % 5,
+                "played": 1, "round_number": k + 1, "play_order": k + 1,
+                "player1_name": f"Player {p * 10 + k % 5}",
+                "player2_name": f"Player {p * 10 + (k + 1) % 5}",
+                "winner_name": f"Player {p * 10 + k % 5}", "pool_name": name,
+            }
+            for k in range(POOL_MATCHES)
+        ]
+        pools.append({"id": p, "tournament_id": 1, "name": name, "players": players, "matches": matches})
+    return pools
+
+
+def build_app(bracket: List[Dict[str, Any]], pools: List[Dict[str, Any]]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before/bracket", response_model=List[BracketMatchOut])
+    def before_bracket():
+        return [BracketMatchOut(**row) for row in bracket]
+
+    @app.get("/before/pools", response_model=List[PoolOut])
+    def before_pools():
+        return [
+            PoolOut(
+                id=p["id"], tournament_id=p["tournament_id"], name=p["name"],
+                players=p["players"], matches=[PoolMatchOut(**m) for m in p["matches"]],
+            )
+            for p in pools
+        ]
+
+    @app.get("/after/bracket", response_model=List[BracketMatchOut])
+    def after_bracket():
+        return json_array_response(bracket_rows_adapter.dump_json(bracket))
+
+    @app.get("/after/pools", response_model=List[PoolOut])
+    def after_pools():
+        return json_array_response(pool_rows_adapter.dump_json(pools))
+
+    return app
+
+
+async def _get(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [],
+        "client": ("bench", 0), "server": ("bench", 80),
+    }
+    chunks = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+def _best_of(app: FastAPI, path: str, repeat: int):
+    best, body = None, b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = asyncio.run(_get(app, path))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+
+def run(sizes: List[int], repeat: int = 3) -> None:
+    print(f"{'endpoint':<8} {'rows':>7} {'before ms':>10} {'after ms':>9} {'speedup':>8} {'bytes':>10}")
+    for n in sizes:
+        app = build_app(make_bracket_rows(n), make_pool_rows(n))
+        for resource in ("bracket", "pools"):
+            before, old_body = _best_of(app, f"/before/{resource}", repeat)
+            after, new_body = _best_of(app, f"/after/{resource}", repeat)
+            if json.loads(old_body) != json.loads(new_body):
+                raise SystemExit(f"{resource}: fast path output differs at {n} rows")
+            print(
+                f"{resource:<8} {n:>7} {before * 1000:>10.1f} {after * 1000:>9.1f} "
+                f"{before / after:>7.1f}x {len(new_body):>10}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 10000, 50000],
+                        help="Match rows per payload (default: 1000 10000 50000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is kept")
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,113 @@
+"""
+Check that a database created by the baseline code upgrades and starts.
+
+Builds a scratch SQLite database at the baseline revision and fills it
+the way the baseline code left it: two played tournaments in a ranking,
+then a deleted player whose roster, match and ranking rows were left
+behind (foreign keys were not enforced).  Then starts the app on it
+(migrations, ``PRAGMA foreign_key_check`` and the startup backfills) and
+checks that the dangling rows are gone and the derived tables are built.
+Run: python -m app.check_migrations
+"""
+import os
+import sys
+import tempfile
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PLAYERS = 6
+TOURNAMENTS = 2
+
+
+def _baseline_rows():
+    """(table, columns, rows) inserted at the baseline revision."""
+    rows = [
+        ("users", "id, username, email, hashed_password, role, is_approved",
+         [(1, "check", "check@example.com", "-", "admin", 1)]),
+        ("players", "id, name", [(p, f"Player {p}") for p in range(1, PLAYERS + 1)]),
+        ("rankings", "id, name, points_mode, created_by", [(1, "Check", "fixed", 1)]),
+    ]
+    tournaments, roster, pools, matches, entries = [], [], [], [], []
+    match_id = 0
+    for t in range(1, TOURNAMENTS + 1):
+        tournaments.append((t, f"Check {t}", f"2025-0{t}-01", "finished", 0, 1, 1))
+        pools.append((t, t, "A"))
+        for p in range(1, PLAYERS + 1):
+            roster.append((len(roster) + 1, t, p, t))
+            entries.append((len(entries) + 1, 1, t, p, p, 10 * (PLAYERS - p)))
+        order = 0
+        for a in range(1, PLAYERS + 1):
+            for b in range(a + 1, PLAYERS + 1):
+                match_id += 1
+                order += 1
+                matches.append((match_id, t, t, a, b, 3, 1, a, 1, order))
+    rows += [
+        ("tournaments", "id, name, start_date, status, is_published, ranking_id, created_by", tournaments),
+        ("pools", "id, tournament_id, name", pools),
+        ("tournament_players", "id, tournament_id, player_id, pool_id", roster),
+        ("pool_matches",
+         "id, pool_id, tournament_id, player1_id, player2_id, player1_legs, player2_legs, winner_id, played, play_order",
+         matches),
+        ("ranking_entries", "id, ranking_id, tournament_id, player_id, placement, points", entries),
+    ]
+    return rows
+
+
+def _build_baseline(engine) -> None:
+    from alembic import command
+    from app.core.migrations import alembic_config
+
+    config = alembic_config()
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "0001")
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        for table, columns, rows in _baseline_rows():
+            marks = ", ".join("?" for _ in columns.split(","))
+            for row in rows:
+                connection.exec_driver_sql(f"INSERT INTO {table} ({columns}) VALUES ({marks})", row)
+        # The baseline delete_player: only the player row goes
+        connection.exec_driver_sql("DELETE FROM players WHERE id = 1")
+        connection.commit()
+        connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+
+def check() -> int:
+    """Return the number of failed checks."""
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'baseline.db')}"
+        from app.core.database import SessionLocal, engine
+
+        _build_baseline(engine)
+        import app.main  # noqa: F401  (migrates and runs the startup backfills)
+        failures: List[str] = []
+        db = SessionLocal()
+        try:
+            def count(sql: str) -> int:
+                return db.connection().exec_driver_sql(sql).scalar()
+
+            if db.connection().exec_driver_sql("PRAGMA foreign_key_check").fetchall():
+                failures.append("dangling foreign keys remain")
+            for table in ("tournament_players", "pool_matches", "ranking_entries", "ranking_standings"):
+                column = "player1_id" if table == "pool_matches" else "player_id"
+                if count(f"SELECT COUNT(*) FROM {table} WHERE {column} = 1"):
+                    failures.append(f"{table} still has rows of the deleted player")
+            if count("SELECT COUNT(*) FROM ranking_standings") != PLAYERS - 1:
+                failures.append("ranking standings were not rebuilt")
+            if count("SELECT COUNT(*) FROM rating_changes") != count("SELECT COUNT(*) FROM pool_matches"):
+                failures.append("ratings were not backfilled")
+            if count("SELECT COUNT(*) FROM player_stats") != PLAYERS - 1:
+                failures.append("player stats were not backfilled")
+        finally:
+            db.close()
+        engine.dispose()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print(f"Baseline database upgraded: {'ok' if not failures else f'{len(failures)} failure(s)'}")
+    return len(failures)
+
+
+if __name__ == "__main__":
+    sys.exit(1 if check() else 0)
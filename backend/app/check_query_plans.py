@@ -0,0 +1,152 @@
+"""
+Check that the main service queries use an index, not a table scan.
+
+Builds a scratch SQLite database through the migrations and plays a
+tournament linked to a ranking through the services (pool generation,
+pool and bracket scoring, ranking recalculation), then runs the pool,
+bracket, ranking and player read services.  Every SQL statement they
+issue is recorded and explained with EXPLAIN QUERY PLAN; a full scan of
+one of the match, roster or ranking-entry tables fails the check.
+Run: python -m app.check_query_plans [--verbose]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tables that grow with every tournament; scanning one of them is a regression
+WATCHED_TABLES = {
+    "pools", "pool_matches", "bracket_matches", "tournament_players",
+    "ranking_entries", "ranking_standings",
+}
+_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+def _record(engine, statements: Dict[str, Any]):
+    from sqlalchemy import event
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if executemany and parameters and isinstance(parameters[0], (list, tuple, dict)):
+            parameters = parameters[0]
+        statements.setdefault(statement, parameters if isinstance(parameters, dict) else tuple(parameters or ()))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return lambda: event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _build(db, players: int, rng: random.Random) -> Tuple[int, int, List[int]]:
+    """A finished tournament linked to a ranking: (tournament id, ranking id, player ids)."""
+    from app.models import BracketMatch, Player, PoolMatch, Ranking, Tournament, TournamentPlayer, User
+    from app.services.bracket_service import generate_bracket, update_bracket_match_score
+    from app.services.pool_service import generate_pools, get_pool_players_split, update_pool_match_score
+    from app.services.ranking_job_service import wait_for_ranking_jobs
+
+    owner = User(username="check", email="check@example.com", hashed_password="-", role="admin", is_approved=True)
+    roster = [Player(name=f"Player {i}") for i in range(players)]
+    db.add(owner)
+    db.add_all(roster)
+    db.commit()
+    ranking = Ranking(name="Check", created_by=owner.id)
+    db.add(ranking)
+    db.commit()
+    t = Tournament(name="Check", created_by=owner.id, ranking_id=ranking.id, is_published=True)
+    db.add(t)
+    db.commit()
+    for p in roster:
+        db.add(TournamentPlayer(tournament_id=t.id, player_id=p.id))
+    db.commit()
+    generate_pools(db, t)
+    for m in db.query(PoolMatch).filter(PoolMatch.tournament_id == t.id).all():
+        update_pool_match_score(db, m.id, 3, rng.randint(0, 2))
+    split = get_pool_players_split(db, t.id, 2)
+    generate_bracket(
+        db, t, split["winners"],
+        loser_player_ids=split["losers"] or None, player_pool_map=split["player_pool_map"],
+    )
+    while True:
+        todo = [
+            m for m in db.query(BracketMatch).filter(BracketMatch.tournament_id == t.id).all()
+            if m.played != 1 and m.player1_id and m.player2_id
+        ]
+        if not todo:
+            break
+        update_bracket_match_score(db, todo[0].id, 3, rng.randint(0, 2))
+    wait_for_ranking_jobs(60)
+    return t.id, ranking.id, [p.id for p in roster]
+
+
+def _read(db, tournament_id: int, ranking_id: int, player_ids: List[int]) -> None:
+    from app.services.bracket_service import get_bracket_rows
+    from app.services.head_to_head_service import get_head_to_head, get_rivals
+    from app.services.match_history_service import get_player_matches
+    from app.services.player_stats_service import get_player_stats
+    from app.services.pool_service import get_pool_rows, get_pool_standings
+    from app.services.ranking_history_service import get_ranking_history
+    from app.services.ranking_service import get_player_ranking_position, get_ranking_standings
+
+    get_pool_rows(db, tournament_id)
+    get_pool_standings(db, tournament_id)
+    get_bracket_rows(db, tournament_id)
+    get_ranking_standings(db, ranking_id)
+    get_ranking_history(db, ranking_id)
+    get_player_ranking_position(db, ranking_id, player_ids[0])
+    get_player_matches(db, player_ids[0])
+    get_player_stats(db, player_ids[0])
+    get_head_to_head(db, player_ids[0], player_ids[1])
+    get_rivals(db, player_ids[0])
+
+
+def check(players: int = 16, verbose: bool = False) -> int:
+    """Return the number of statements whose plan scans a watched table."""
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'plans.db')}"
+        from app.core.database import SessionLocal, engine
+        from app.core.migrations import upgrade_database
+
+        upgrade_database()
+        statements: Dict[str, Any] = {}
+        stop = _record(engine, statements)
+        db = SessionLocal()
+        try:
+            tournament_id, ranking_id, player_ids = _build(db, players, random.Random(1))
+            db.expire_all()
+            _read(db, tournament_id, ranking_id, player_ids)
+        finally:
+            db.close()
+            stop()
+
+        checked = failures = 0
+        with engine.connect() as conn:
+            for statement, parameters in statements.items():
+                # The plan of an INSERT only lists the child-table foreign key
+                # checks, which SQLite skips unless a deferred violation is pending
+                if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+                    continue
+                checked += 1
+                plan = [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                scans = [
+                    m.group(1) for m in (_SCAN.match(step) for step in plan)
+                    if m and m.group(1) in WATCHED_TABLES
+                ]
+                if scans:
+                    failures += 1
+                if scans or verbose:
+                    print(("SCAN " + ", ".join(scans) if scans else "ok") + ": " + " ".join(statement.split()))
+                    for step in plan:
+                        print(f"    {step}")
+        engine.dispose()
+        print(f"{checked} statements checked, {failures} with a full table scan")
+        return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--players", type=int, default=16, help="Players in the scratch tournament (default: 16)")
+    parser.add_argument("--verbose", action="store_true", help="Print the plan of every statement")
+    args = parser.parse_args()
+    sys.exit(1 if check(args.players, args.verbose) else 0)
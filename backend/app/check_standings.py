@@ -0,0 +1,54 @@
+"""
+Verify (and optionally rebuild) the materialized ranking standings.
+
+Compares every RankingStanding row against a full recomputation from the
+ranking's RankingEntry rows.
+Run: python -m app.check_standings [--rebuild] [RANKING_ID ...]
+"""
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.core.migrations import upgrade_database
+from app.models.ranking import Ranking
+from app.services.ranking_service import (
+    verify_ranking_standings, rebuild_ranking_standings,
+)
+
+upgrade_database()
+
+
+def check(ranking_ids=None, rebuild: bool = False) -> int:
+    """Return the number of rankings whose standings did not match."""
+    db = SessionLocal()
+    try:
+        query = db.query(Ranking.id, Ranking.name)
+        if ranking_ids:
+            query = query.filter(Ranking.id.in_(ranking_ids))
+        drifted = 0
+        for rid, name in query.order_by(Ranking.id).all():
+            mismatches = verify_ranking_standings(db, rid)
+            if not mismatches:
+                print(f"Ranking {rid} ({name}): OK")
+                continue
+            drifted += 1
+            print(f"Ranking {rid} ({name}): {len(mismatches)} mismatched player(s)")
+            for m in mismatches:
+                print(f"  player {m['player_id']}: expected {m['expected']}, found {m['actual']}")
+            if rebuild:
+                rows = rebuild_ranking_standings(db, rid)
+                print(f"  rebuilt {rows} standing row(s)")
+        return drifted
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("ranking_ids", nargs="*", type=int, help="Rankings to check (default: all)")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild rankings that do not match")
+    args = parser.parse_args()
+    drifted = check(args.ranking_ids, rebuild=args.rebuild)
+    sys.exit(1 if drifted and not args.rebuild else 0)
@@ -4,15 +4,58 @@ from typing import List
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./tournaments.db"
+    # Read-only engine of the GET endpoints; READ_DATABASE_URL defaults to
+    # DATABASE_URL and may point at a replica of it
+    READ_DATABASE_URL: str = ""
+    READ_POOL_SIZE: int = 20
+    READ_MAX_OVERFLOW: int = 20
+    # Async engine for the async read endpoints (needs aiosqlite for SQLite).
+    # ASYNC_DATABASE_URL defaults to the read database with the async driver.
+    ASYNC_DATABASE: bool = False
+    ASYNC_DATABASE_URL: str = ""
+    ASYNC_POOL_SIZE: int = 20
+    # SQLite profile, applied to every new connection (empty / 0 keeps
+    # SQLite's default), and the connection pool of the writer engine
+    SQLITE_JOURNAL_MODE: str = "wal"
+    SQLITE_SYNCHRONOUS: str = "normal"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_FOREIGN_KEYS: bool = True
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
     SECRET_KEY: str = "change-me-to-a-random-secret-key-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
+    # Public response cache: maximum entries and seconds an entry may live
+    PUBLIC_CACHE_SIZE: int = 1024
+    PUBLIC_CACHE_TTL_SECONDS: int = 60
+    # Largest standings page kept in the public cache; bigger or unpaged ones are streamed
+    PUBLIC_CACHE_MAX_PAGE: int = 100
+    # Most player_id values one public history request may ask for
+    PUBLIC_HISTORY_MAX_PLAYERS: int = 20
+    # Live push: events buffered per spectator, seconds between keep-alives
+    LIVE_QUEUE_SIZE: int = 64
+    LIVE_HEARTBEAT_SECONDS: int = 15
 
     @property
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def read_database_url(self) -> str:
+        return self.READ_DATABASE_URL or self.DATABASE_URL
+
+    @property
+    def async_database_url(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        if self.read_database_url.startswith("sqlite:"):
+            return "sqlite+aiosqlite:" + self.read_database_url[len("sqlite:"):]
+        raise ValueError("Set ASYNC_DATABASE_URL for a non-SQLite read database")
+
     class Config:
         env_file = ".env"
 
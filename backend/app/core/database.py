@@ -1,23 +1,190 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
 
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+def _is_memory(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.rstrip("/") in ("sqlite:", "sqlite+pysqlite:"))
+
+
+def _engine_args(url: str, pool_size: int, max_overflow: int) -> Dict[str, Any]:
+    args: Dict[str, Any] = {}
+    if url.startswith("sqlite"):
+        args["connect_args"] = {"check_same_thread": False}
+    if not _is_memory(url):
+        # An in-memory database lives in a single connection and keeps its own pool
+        args.update(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=settings.DB_POOL_TIMEOUT)
+    return args
+
+
+# Writer engine: every write, and all work outside the GET endpoints
+engine = create_engine(
+    settings.DATABASE_URL, **_engine_args(settings.DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+# ── SQLite profile ──
+def sqlite_pragmas() -> List[Tuple[str, Any]]:
+    """The PRAGMAs set on every new SQLite connection, from the SQLITE_* settings."""
+    pragmas: List[Tuple[str, Any]] = []
+    # First, so that the PRAGMAs below already wait on a locked database
+    if settings.SQLITE_BUSY_TIMEOUT_MS:
+        pragmas.append(("busy_timeout", settings.SQLITE_BUSY_TIMEOUT_MS))
+    if settings.SQLITE_JOURNAL_MODE:
+        pragmas.append(("journal_mode", settings.SQLITE_JOURNAL_MODE))
+    if settings.SQLITE_SYNCHRONOUS:
+        pragmas.append(("synchronous", settings.SQLITE_SYNCHRONOUS))
+    if settings.SQLITE_CACHE_SIZE_KB:
+        # A negative cache_size is in KiB rather than pages
+        pragmas.append(("cache_size", -settings.SQLITE_CACHE_SIZE_KB))
+    if settings.SQLITE_MMAP_SIZE:
+        pragmas.append(("mmap_size", settings.SQLITE_MMAP_SIZE))
+    pragmas.append(("foreign_keys", "ON" if settings.SQLITE_FOREIGN_KEYS else "OFF"))
+    return pragmas
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def use_sqlite_profile(bind: Engine) -> None:
+    """Apply the SQLite profile to every connection ``bind`` opens."""
+    if bind.dialect.name == "sqlite":
+        event.listen(bind, "connect", _apply_sqlite_pragmas)
+
+
+_SYNCHRONOUS_NAMES = {0: "off", 1: "normal", 2: "full", 3: "extra"}
+
+
+def database_settings(bind: Engine = None) -> Dict[str, Any]:
+    """The settings a connection of ``bind`` actually runs with, read back from the database."""
+    bind = bind or engine
+    effective: Dict[str, Any] = {"dialect": bind.dialect.name, "pool": type(bind.pool).__name__}
+    if isinstance(bind.pool, QueuePool):
+        effective["pool_size"] = bind.pool.size()
+    if bind.dialect.name != "sqlite":
+        return effective
+    with bind.connect() as conn:
+        for name in (
+            "journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "foreign_keys", "query_only",
+        ):
+            effective[name] = conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+    effective["synchronous"] = _SYNCHRONOUS_NAMES.get(effective["synchronous"], effective["synchronous"])
+    effective["foreign_keys"] = bool(effective["foreign_keys"])
+    effective["query_only"] = bool(effective["query_only"])
+    return effective
+
+
+def _query_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def use_read_only(bind: Engine) -> None:
+    """Make every connection ``bind`` opens refuse writes."""
+    if bind.dialect.name == "sqlite":
+        event.listen(bind, "connect", _query_only)
+
+
+use_sqlite_profile(engine)
+
+# Reader engine of the GET endpoints: its own pool of query_only
+# connections, which under WAL read the last committed state without
+# waiting for the writer.  READ_DATABASE_URL may point it at a replica.
+# An in-memory database exists only in the writer's connection, so it is
+# read through the writer engine.
+if settings.read_database_url == settings.DATABASE_URL and _is_memory(settings.DATABASE_URL):
+    read_engine = engine
+else:
+    read_engine = create_engine(
+        settings.read_database_url,
+        **_engine_args(settings.read_database_url, settings.READ_POOL_SIZE, settings.READ_MAX_OVERFLOW),
+    )
+    use_sqlite_profile(read_engine)
+    use_read_only(read_engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Optional async engine (ASYNC_DATABASE) for the async read endpoints
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DATABASE:
+    try:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        async_engine = create_async_engine(
+            settings.async_database_url,
+            pool_size=settings.ASYNC_POOL_SIZE, max_overflow=0,
+        )
+    except ImportError as e:
+        raise RuntimeError(f"ASYNC_DATABASE needs the async driver: {e}") from e
+    use_sqlite_profile(async_engine.sync_engine)
+    use_read_only(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
 class Base(DeclarativeBase):
     pass
 
 
 def get_db():
+    """Writer session, for endpoints that change data."""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Read-only session on the reader pool, for GET endpoints."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class DatabaseRunner:
+    """
+    Database access for ``async def`` endpoints.
+
+    ``await runner.run(fn, *args)`` calls the synchronous ``fn(session, *args)``
+    (any service function).  With ASYNC_DATABASE it runs on the event loop
+    over the async engine, so a request waiting on the database holds a
+    pooled connection but no thread; otherwise it runs on the threadpool
+    with a reader session.  Either way the session is read-only.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if AsyncSessionLocal is not None:
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+async def get_db_runner():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield DatabaseRunner(session)
+        return
+    db: Session = ReadSessionLocal()
+    try:
+        yield DatabaseRunner(db)
+    finally:
+        db.close()
@@ -0,0 +1,38 @@
+import secrets
+
+from fastapi import HTTPException, Request, Response
+
+
+def new_epoch() -> int:
+    """Random per-row value that tells a recreated row from a deleted one with the same id."""
+    return secrets.randbits(31)
+
+
+def make_etag(*parts: object) -> str:
+    """Weak ETag built from version counters (``W/"12.7"``)."""
+    return 'W/"' + ".".join(str(p) for p in parts) + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match names ``etag`` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def check_etag(request: Request, response: Response, etag: str) -> None:
+    """
+    Set ``etag`` on the response, or answer 304 Not Modified when the
+    client already has it so the handler never builds the body.
+    """
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
@@ -0,0 +1,43 @@
+"""
+Schema migrations (Alembic; revisions in backend/migrations/versions).
+
+``upgrade_database`` brings a database to the latest revision and runs on
+every startup.  Databases created by ``Base.metadata.create_all`` before
+migrations existed have tables but no ``alembic_version``: they are
+stamped at the baseline revision first, and the later revisions add
+whatever they are missing.  On SQLite the migrated database must then pass
+``PRAGMA foreign_key_check``, since every connection enforces foreign keys.
+"""
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from app.core.database import engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    return Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+
+
+def upgrade_database(bind: Engine = None) -> None:
+    """Migrate the database of ``bind`` (default: the writer engine) to the latest revision."""
+    config = alembic_config()
+    with (bind or engine).connect() as connection:
+        config.attributes["connection"] = connection
+        tables = set(inspect(connection).get_table_names())
+        if tables and "alembic_version" not in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+        if connection.dialect.name == "sqlite":
+            violations = connection.exec_driver_sql("PRAGMA foreign_key_check").fetchall()
+            if violations:
+                tables = sorted({row[0] for row in violations})
+                raise RuntimeError(
+                    f"Database has {len(violations)} dangling foreign key(s) in: {', '.join(tables)}"
+                )
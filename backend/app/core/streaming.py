@@ -0,0 +1,42 @@
+import json
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import ReadSessionLocal
+
+
+def encode_json_array(items: Iterable[Any]) -> bytes:
+    """Encode ``items`` as a JSON array the same way ``stream_json_array`` streams them."""
+    return b"[" + b",".join(json.dumps(item, default=str).encode("utf-8") for item in items) + b"]"
+
+
+def json_array_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Send an already encoded JSON array (e.g. a cached one)."""
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def stream_json_array(
+    produce: Callable[[Session], Iterable[Any]],
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """
+    Stream the items yielded by ``produce`` as a JSON array.
+
+    The request's own session is closed before a streaming body is sent,
+    so ``produce`` gets a dedicated session that lives as long as the stream.
+    """
+    def _body():
+        db = ReadSessionLocal()
+        try:
+            yield b"["
+            separator = b""
+            for item in produce(db):
+                yield separator + json.dumps(item, default=str).encode("utf-8")
+                separator = b","
+            yield b"]"
+        finally:
+            db.close()
+
+    return StreamingResponse(_body(), media_type="application/json", headers=headers)
@@ -1,22 +1,64 @@
+import logging
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.routers import auth, players, tournaments, users, public, rankings
+from app.core.database import engine, read_engine, database_settings
+from app.core.migrations import upgrade_database
+from app.routers import auth, players, tournaments, users, public, rankings, ratings
+
+logger = logging.getLogger(__name__)
 
 # Check if DB file exists before creating tables
 _db_path = settings.DATABASE_URL.replace("sqlite:///", "")
 _is_fresh = not os.path.exists(_db_path)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Create or migrate the schema
+upgrade_database()
+
+# Report the connection settings the database actually runs with
+for _role, _bind in (("writer", engine), ("reader", read_engine)):
+    logger.info("Database %s: %s", _role, ", ".join(f"{k}={v}" for k, v in database_settings(_bind).items()))
 
 # Seed admin + sample players on first run
 if _is_fresh:
     from app.seed import seed
     seed()
+else:
+    # Backfill materialized ranking standings for databases created before
+    # the ranking_standings table existed
+    from app.services.ranking_service import backfill_ranking_standings
+    backfill_ranking_standings()
+
+    # Build career stats for databases created before player_stats existed
+    from app.services.player_stats_service import backfill_player_stats
+    backfill_player_stats()
+
+    # Build the head-to-head index for databases created before it existed
+    from app.services.head_to_head_service import backfill_head_to_head
+    backfill_head_to_head()
+
+    # Rate the results of databases created before ratings existed, or
+    # logged before the rating order was
+    from app.services.rating_service import backfill_ratings
+    backfill_ratings()
+
+    # Pick up automatic ranking recalculations left over by a previous run
+    from app.services.ranking_job_service import resume_ranking_jobs
+    resume_ranking_jobs()
+
+    # Expire results that left rolling ranking windows while we were down
+    from app.services.ranking_window_service import roll_forward_rankings
+    roll_forward_rankings()
+
+# Build the dashboard counters (fresh databases) and correct any drift
+from app.services.dashboard_service import backfill_dashboard_counters
+backfill_dashboard_counters()
+
+# Roll rolling ranking windows forward once a day
+from app.services.ranking_window_service import start_window_scheduler
+start_window_scheduler()
 
 app = FastAPI(
     title="Tournament Manager",
@@ -31,6 +73,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 app.include_router(auth.router)
@@ -39,6 +82,7 @@ app.include_router(tournaments.router)
 app.include_router(users.router)
 app.include_router(public.router)
 app.include_router(rankings.router)
+app.include_router(ratings.router)
 
 
 @app.get("/api/health")
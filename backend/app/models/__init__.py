@@ -4,10 +4,16 @@ from app.models.tournament import Tournament, TournamentStatus
 from app.models.tournament_models import (
     TournamentPlayer, Pool, PoolMatch, BracketMatch
 )
-from app.models.ranking import Ranking, RankingEntry
+from app.models.ranking import Ranking, RankingEntry, RankingStanding, RankingJob
+from app.models.rating import PlayerRating, RatingChange
+from app.models.player_stats import PlayerStats
+from app.models.head_to_head import HeadToHead, HeadToHeadMatch
+from app.models.dashboard import DashboardCounters
 
 __all__ = [
     "User", "Player", "Tournament", "TournamentStatus",
     "TournamentPlayer", "Pool", "PoolMatch", "BracketMatch",
-    "Ranking", "RankingEntry",
+    "Ranking", "RankingEntry", "RankingStanding", "RankingJob",
+    "PlayerRating", "RatingChange", "PlayerStats",
+    "HeadToHead", "HeadToHeadMatch", "DashboardCounters",
 ]
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer
+
+from app.core.database import Base
+
+
+class DashboardCounters(Base):
+    """
+    Dashboard totals, one row per tournament owner plus a global row
+    (owner_id 0).
+
+    Adjusted by delta in the same transaction as the tournament, player and
+    score writes they count; the dashboard service can reconcile the table
+    against the source tables.  Player totals are global, so only the
+    global row's ``total_players`` is maintained.
+    """
+    __tablename__ = "dashboard_counters"
+
+    owner_id = Column(Integer, primary_key=True, autoincrement=False)
+    active_tournaments = Column(Integer, default=0, nullable=False)
+    total_tournaments = Column(Integer, default=0, nullable=False)
+    total_players = Column(Integer, default=0, nullable=False)
+    matches_played = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, UniqueConstraint, func
+
+from app.core.database import Base
+
+
+class HeadToHead(Base):
+    """
+    Record of a pair of players across all tournaments.
+
+    Keyed by the ordered pair (player_low_id < player_high_id) and kept up
+    to date by the pool and bracket scoring services.
+    """
+    __tablename__ = "head_to_head"
+    __table_args__ = (
+        Index("ix_head_to_head_high", "player_high_id"),
+    )
+
+    player_low_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    player_high_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    matches = Column(Integer, default=0, nullable=False)
+    low_wins = Column(Integer, default=0, nullable=False)
+    high_wins = Column(Integer, default=0, nullable=False)
+    low_legs = Column(Integer, default=0, nullable=False)
+    high_legs = Column(Integer, default=0, nullable=False)
+
+
+class HeadToHeadMatch(Base):
+    """One counted pool or bracket match between a pair, for the pair's match list."""
+    __tablename__ = "head_to_head_matches"
+    __table_args__ = (
+        UniqueConstraint("match_type", "match_id", name="uq_head_to_head_matches_match"),
+        Index("ix_head_to_head_matches_pair", "player_low_id", "player_high_id", "id"),
+        Index("ix_head_to_head_matches_tournament", "tournament_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    player_low_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), nullable=False)
+    player_high_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), nullable=False)
+    match_type = Column(String(20), nullable=False)  # "pool" or "bracket"
+    match_id = Column(Integer, nullable=False)
+    tournament_id = Column(Integer, ForeignKey("tournaments.id", ondelete="CASCADE"), nullable=False)
+    winner_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    low_legs = Column(Integer, default=0, nullable=False)
+    high_legs = Column(Integer, default=0, nullable=False)
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now())
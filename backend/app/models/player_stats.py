@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class PlayerStats(Base):
+    """
+    Career aggregates of a player across all tournaments.
+
+    Kept up to date by delta from the pool and bracket scoring services;
+    the player stats service can rebuild the whole table from the match
+    tables.  Only matches with both players count; placements count for
+    finished tournaments where the player got a bracket placement.
+    """
+    __tablename__ = "player_stats"
+
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    matches_played = Column(Integer, default=0, nullable=False)
+    matches_won = Column(Integer, default=0, nullable=False)
+    legs_won = Column(Integer, default=0, nullable=False)
+    legs_lost = Column(Integer, default=0, nullable=False)
+    titles = Column(Integer, default=0, nullable=False)
+    tournaments_placed = Column(Integer, default=0, nullable=False)
+    placement_sum = Column(Integer, default=0, nullable=False)
+
+    player = relationship("Player")
@@ -1,9 +1,10 @@
 from sqlalchemy import (
-    Column, Integer, String, DateTime, ForeignKey, func
+    Column, Integer, String, Date, DateTime, Boolean, ForeignKey, Index, UniqueConstraint, func
 )
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.core.etag import new_epoch
 
 
 class Ranking(Base):
@@ -30,6 +31,19 @@ class Ranking(Base):
     points_seventh = Column(Integer, default=2)
     points_eighth = Column(Integer, default=1)
     points_participation = Column(Integer, default=0)
+    # Rolling window: only results of tournaments dated within the last
+    # window_days count (NULL = all results).  window_cutoff is the cutoff
+    # the materialized standings currently reflect; results dated on or
+    # before it have expired.
+    window_days = Column(Integer, nullable=True)
+    window_cutoff = Column(Date, nullable=True)
+    # Best-N: only each player's best_n highest results count toward the
+    # total (NULL = all results)
+    best_n = Column(Integer, nullable=True)
+    # Bumped whenever the ranking's entries change; keys in-process caches
+    entries_version = Column(Integer, default=0, nullable=False)
+    # Random per row; ETags that include entries_version include it too
+    epoch = Column(Integer, default=new_epoch, nullable=False)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -37,10 +51,17 @@ class Ranking(Base):
     creator = relationship("User")
     tournaments = relationship("Tournament", back_populates="ranking")
     entries = relationship("RankingEntry", back_populates="ranking", cascade="all, delete-orphan")
+    standings = relationship("RankingStanding", back_populates="ranking", cascade="all, delete-orphan")
 
 
 class RankingEntry(Base):
     __tablename__ = "ranking_entries"
+    __table_args__ = (
+        # Also the (ranking_id, tournament_id) index of a tournament's entries
+        UniqueConstraint("ranking_id", "tournament_id", "player_id", name="uq_ranking_entries_player"),
+        # A player's results; player_id first for the foreign-key checks
+        Index("ix_ranking_entries_player", "player_id", "ranking_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ranking_id = Column(Integer, ForeignKey("rankings.id", ondelete="CASCADE"), nullable=False)
@@ -48,7 +69,67 @@ class RankingEntry(Base):
     player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), nullable=False)
     placement = Column(Integer, nullable=True)  # final placement in tournament (1=winner, etc.)
     points = Column(Integer, default=0)
+    # Scoring facts captured from the bracket so points can be re-scored
+    # when the ranking configuration changes (NULL on legacy entries)
+    bracket_placement = Column(Integer, nullable=True)
+    in_winner_bracket = Column(Boolean, nullable=True)
+    winner_bracket_wins = Column(Integer, nullable=True)
+    loser_bracket_wins = Column(Integer, nullable=True)
 
     ranking = relationship("Ranking", back_populates="entries")
     tournament = relationship("Tournament")
     player = relationship("Player")
+
+
+class RankingStanding(Base):
+    """
+    Materialized per-player totals of a ranking.
+
+    Maintained incrementally by the ranking service whenever the
+    RankingEntry rows of a tournament change, so standings reads never
+    have to re-aggregate every entry of the ranking.
+    """
+    __tablename__ = "ranking_standings"
+    __table_args__ = (
+        UniqueConstraint("ranking_id", "player_id", name="uq_ranking_standings_player"),
+        Index("ix_ranking_standings_order", "ranking_id", "total_points", "best_placement"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ranking_id = Column(Integer, ForeignKey("rankings.id", ondelete="CASCADE"), nullable=False)
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), nullable=False)
+    total_points = Column(Integer, default=0, nullable=False)
+    tournaments_played = Column(Integer, default=0, nullable=False)
+    best_placement = Column(Integer, nullable=True)
+
+    ranking = relationship("Ranking", back_populates="standings")
+    player = relationship("Player")
+
+
+class RankingJob(Base):
+    """
+    Pending or last finished automatic recalculation of one tournament's
+    ranking entries.
+
+    There is at most one row per (ranking, tournament): repeated triggers
+    while a job is queued coalesce into it.  ``generation`` is bumped on
+    every trigger so a job that was re-triggered while running is run
+    again instead of being marked done.
+    """
+    __tablename__ = "ranking_jobs"
+    __table_args__ = (
+        UniqueConstraint("ranking_id", "tournament_id", name="uq_ranking_jobs_tournament"),
+        Index("ix_ranking_jobs_status", "status"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ranking_id = Column(Integer, ForeignKey("rankings.id", ondelete="CASCADE"), nullable=False)
+    tournament_id = Column(Integer, ForeignKey("tournaments.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), default="queued", nullable=False)  # queued, running, done, failed
+    generation = Column(Integer, default=1, nullable=False)
+    triggers = Column(Integer, default=1, nullable=False)
+    runs = Column(Integer, default=0, nullable=False)
+    error = Column(String, nullable=True)
+    requested_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
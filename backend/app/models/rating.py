@@ -0,0 +1,48 @@
+from sqlalchemy import (
+    Column, Integer, Float, String, Date, DateTime, ForeignKey, Index, UniqueConstraint, func
+)
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class PlayerRating(Base):
+    __tablename__ = "player_ratings"
+
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    rating = Column(Float, nullable=False)
+    matches_rated = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    player = relationship("Player")
+
+
+class RatingChange(Base):
+    """
+    One rated match result, at its place in the rating order
+    (played_on, tournament_id, position, match_type, match_id).
+
+    The ratings both players had before the match are kept as a checkpoint,
+    so a corrected result only needs to replay the later changes that
+    involve affected players.  played_on and position are NULL only on
+    changes logged before the order existed, until the startup backfill.
+    """
+    __tablename__ = "rating_changes"
+    __table_args__ = (
+        UniqueConstraint("match_type", "match_id", name="uq_rating_changes_match"),
+        Index("ix_rating_changes_order", "played_on", "tournament_id", "position", "match_type", "match_id"),
+        Index("ix_rating_changes_winner", "winner_id"),
+        Index("ix_rating_changes_loser", "loser_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    match_type = Column(String(20), nullable=False)  # "pool" or "bracket"
+    match_id = Column(Integer, nullable=False)
+    tournament_id = Column(Integer, ForeignKey("tournaments.id", ondelete="CASCADE"), nullable=False)
+    played_on = Column(Date, nullable=True)  # tournament start date, else its creation date
+    position = Column(Integer, nullable=True)  # pool play order, bracket rounds after the pools
+    winner_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    loser_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    winner_before = Column(Float, nullable=False)
+    loser_before = Column(Float, nullable=False)
+    delta = Column(Float, nullable=False)  # gained by the winner, lost by the loser
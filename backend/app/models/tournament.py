@@ -5,6 +5,7 @@ from sqlalchemy.orm import relationship
 import enum
 
 from app.core.database import Base
+from app.core.etag import new_epoch
 # NOTE: Ranking import is deferred to avoid circular imports; relationship uses string ref.
 
 
@@ -31,7 +32,15 @@ class Tournament(Base):
         String(30), default=TournamentStatus.NOT_STARTED, nullable=False
     )
     is_published = Column(Boolean, default=False, nullable=False)
-    ranking_id = Column(Integer, ForeignKey("rankings.id", ondelete="SET NULL"), nullable=True)
+    ranking_id = Column(Integer, ForeignKey("rankings.id", ondelete="SET NULL"), nullable=True, index=True)
+    # Bumped on every bracket or roster change; keys the bracket facts cache
+    bracket_version = Column(Integer, default=0, nullable=False)
+    # Bumped by every write to the tournament, its players, pools, matches
+    # or ranking link; tournament read endpoints derive their ETag from it
+    version = Column(Integer, default=0, nullable=False)
+    # Random per row and part of the ETag: SQLite may give a new tournament
+    # the id of a deleted one, whose version also started at 0
+    epoch = Column(Integer, default=new_epoch, nullable=False)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
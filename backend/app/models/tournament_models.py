@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, ForeignKey, DateTime, String, func
+    Column, Integer, ForeignKey, DateTime, String, Index, func
 )
 from sqlalchemy.orm import relationship
 
@@ -8,6 +8,12 @@ from app.core.database import Base
 
 class TournamentPlayer(Base):
     __tablename__ = "tournament_players"
+    __table_args__ = (
+        # Player counts of the tournament list
+        Index("ix_tournament_players_tournament", "tournament_id"),
+        # Pool rosters
+        Index("ix_tournament_players_pool", "pool_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     tournament_id = Column(Integer, ForeignKey("tournaments.id", ondelete="CASCADE"), nullable=False)
@@ -22,6 +28,9 @@ class TournamentPlayer(Base):
 
 class Pool(Base):
     __tablename__ = "pools"
+    __table_args__ = (
+        Index("ix_pools_tournament", "tournament_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     tournament_id = Column(Integer, ForeignKey("tournaments.id", ondelete="CASCADE"), nullable=False)
@@ -34,6 +43,13 @@ class Pool(Base):
 
 class PoolMatch(Base):
     __tablename__ = "pool_matches"
+    __table_args__ = (
+        # Per-player match history, newest tournament first
+        Index("ix_pool_matches_player1", "player1_id", "tournament_id"),
+        Index("ix_pool_matches_player2", "player2_id", "tournament_id"),
+        Index("ix_pool_matches_pool", "pool_id"),
+        Index("ix_pool_matches_tournament", "tournament_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     pool_id = Column(Integer, ForeignKey("pools.id", ondelete="CASCADE"), nullable=False)
@@ -55,6 +71,15 @@ class PoolMatch(Base):
 
 class BracketMatch(Base):
     __tablename__ = "bracket_matches"
+    __table_args__ = (
+        Index("ix_bracket_matches_player1", "player1_id", "tournament_id"),
+        Index("ix_bracket_matches_player2", "player2_id", "tournament_id"),
+        # A tournament's bracket in display order
+        Index("ix_bracket_matches_tournament", "tournament_id", "bracket_type", "round_number", "match_number"),
+        # Feeder lookups; also keep foreign-key checks on deletes from scanning
+        Index("ix_bracket_matches_next_winner", "next_winner_match_id"),
+        Index("ix_bracket_matches_next_loser", "next_loser_match_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     tournament_id = Column(Integer, ForeignKey("tournaments.id", ondelete="CASCADE"), nullable=False)
@@ -74,6 +74,8 @@ def change_password(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect",
         )
-    current_user.hashed_password = get_password_hash(data.new_password)
+    # current_user comes from a read-only session; change the writer's copy
+    user = db.get(User, current_user.id)
+    user.hashed_password = get_password_hash(data.new_password)
     db.commit()
     return {"message": "Password updated successfully"}
@@ -1,20 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, UploadFile, File
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import csv
 import io
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import require_admin, get_current_user
 from app.models.player import Player
+from app.models.player_stats import PlayerStats
+from app.models.ranking import RankingEntry
+from app.models.tournament import Tournament
+from app.models.tournament_models import TournamentPlayer
 from app.models.user import User
-from app.schemas.player import PlayerCreate, PlayerUpdate, PlayerOut
+from app.schemas.player import (
+    PlayerCreate, PlayerUpdate, PlayerOut, PlayerStatsOut, HeadToHeadOut, RivalOut, PlayerMatchOut,
+)
+from app.services.player_stats_service import get_player_stats, rebuild_player_stats
+from app.services.head_to_head_service import get_head_to_head, get_rivals
+from app.services.match_history_service import get_player_matches
+from app.services.dashboard_service import record_players_changed
+from app.services.bracket_facts_service import bump_bracket_version
+from app.services.ranking_service import bump_entries_version
+from app.services.tournament_version_service import bump_player_tournaments
+from app.services.public_cache_service import invalidate_all_rankings
 
 router = APIRouter(prefix="/api/players", tags=["players"])
 
 
 @router.get("", response_model=List[PlayerOut])
-def list_players(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_players(db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     return db.query(Player).order_by(Player.name).all()
 
 
@@ -22,6 +37,7 @@ def list_players(db: Session = Depends(get_db), current_user: User = Depends(get
 def create_player(data: PlayerCreate, db: Session = Depends(get_db), current_user: User = Depends(require_admin)):
     player = Player(**data.model_dump())
     db.add(player)
+    record_players_changed(db, 1)
     db.commit()
     db.refresh(player)
     return player
@@ -38,6 +54,7 @@ def bulk_create_players(
         player = Player(**p.model_dump())
         db.add(player)
         created.append(player)
+    record_players_changed(db, len(created))
     db.commit()
     for p in created:
         db.refresh(p)
@@ -63,14 +80,21 @@ async def import_csv(
         if player.name:
             db.add(player)
             created.append(player)
+    record_players_changed(db, len(created))
     db.commit()
     for p in created:
         db.refresh(p)
     return created
 
 
+@router.post("/stats/rebuild")
+def rebuild_stats(db: Session = Depends(get_db), current_user: User = Depends(require_admin)):
+    """Recompute every player's career stats from the match tables."""
+    return {"players_written": rebuild_player_stats(db)}
+
+
 @router.get("/{player_id}", response_model=PlayerOut)
-def get_player(player_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_player(player_id: int, db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     player = db.query(Player).filter(Player.id == player_id).first()
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
@@ -87,6 +111,8 @@ def update_player(
         raise HTTPException(status_code=404, detail="Player not found")
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(player, key, value)
+    bump_player_tournaments(db, player.id)
+    invalidate_all_rankings(db)
     db.commit()
     db.refresh(player)
     return player
@@ -97,5 +123,83 @@ def delete_player(player_id: int, db: Session = Depends(get_db), current_user: U
     player = db.query(Player).filter(Player.id == player_id).first()
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
+    # The delete cascades to the player's roster and ranking rows: the
+    # cached rosters and the rankings built from them must follow
+    tournaments = (
+        db.query(Tournament)
+        .join(TournamentPlayer, TournamentPlayer.tournament_id == Tournament.id)
+        .filter(TournamentPlayer.player_id == player.id)
+        .all()
+    )
+    ranking_ids = {t.ranking_id for t in tournaments if t.ranking_id} | {
+        rid for (rid,) in db.query(RankingEntry.ranking_id).filter(RankingEntry.player_id == player.id).distinct()
+    }
+    db.query(PlayerStats).filter(PlayerStats.player_id == player.id).delete()
+    record_players_changed(db, -1)
+    bump_player_tournaments(db, player.id)
+    for t in tournaments:
+        bump_bracket_version(t)
+    for rid in sorted(ranking_ids):
+        bump_entries_version(db, rid, rebuilt=True)
+    invalidate_all_rankings(db)
     db.delete(player)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Match and rating rows keep their players (foreign keys are enforced)
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Player has recorded results and cannot be deleted")
+
+
+@router.get("/{player_id}/stats", response_model=PlayerStatsOut)
+def get_stats(player_id: int, db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)):
+    if db.get(Player, player_id) is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return get_player_stats(db, player_id)
+
+
+@router.get("/{player_id}/head-to-head/{opponent_id}", response_model=HeadToHeadOut)
+def head_to_head(
+    player_id: int, opponent_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
+    if player_id == opponent_id:
+        raise HTTPException(status_code=400, detail="Pick two different players")
+    found = db.query(Player.id).filter(Player.id.in_([player_id, opponent_id])).count()
+    if found < 2:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return get_head_to_head(db, player_id, opponent_id, limit)
+
+
+@router.get("/{player_id}/rivals", response_model=List[RivalOut])
+def rivals(
+    player_id: int, limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
+    if db.get(Player, player_id) is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return get_rivals(db, player_id, limit)
+
+
+@router.get("/{player_id}/matches", response_model=List[PlayerMatchOut])
+def player_matches(
+    player_id: int, response: Response,
+    limit: int = Query(50, ge=1, le=500), after: Optional[str] = None,
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
+    """
+    Played pool and bracket matches of a player, newest tournament first.
+
+    The ``X-Next-Cursor`` response header is the ``after`` value of the
+    next page.
+    """
+    if db.get(Player, player_id) is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    try:
+        matches, next_cursor = get_player_matches(db, player_id, limit, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return matches
@@ -1,18 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Callable, List, Optional
+import asyncio
+from datetime import date
 
-from app.core.database import get_db
-from app.models.player import Player
+from app.core.config import settings
+from app.core.database import DatabaseRunner, ReadSessionLocal, get_db_runner
+from app.core.etag import check_etag
 from app.models.tournament import Tournament
-from app.models.tournament_models import TournamentPlayer, Pool, PoolMatch, BracketMatch
+from app.models.tournament_models import TournamentPlayer
 from app.models.ranking import Ranking
 from app.schemas.tournament import (
-    TournamentOut, PoolOut, PoolMatchOut, StandingEntry, BracketMatchOut,
+    TournamentOut, PoolOut, StandingEntry, BracketMatchOut,
+    pool_rows_adapter, bracket_rows_adapter,
 )
-from app.schemas.ranking import RankingOut, RankingStandingEntry
-from app.services.pool_service import get_pool_standings
-from app.services.ranking_service import get_ranking_standings
+from app.schemas.ranking import (
+    RankingOut, RankingStandingEntry, RankingPlayerHistory, RankingPlayerPosition,
+)
+from app.services.pool_service import get_pool_rows, get_pool_standings
+from app.services.bracket_service import get_bracket_rows
+from app.core.streaming import encode_json_array, json_array_response, stream_json_array
+from app.services.ranking_service import (
+    get_player_ranking_position, get_ranking_standings_page,
+    iter_ranking_standings, paginate_standings,
+)
+from app.services.ranking_history_service import (
+    get_ranking_standings_as_of, get_ranking_points_series,
+)
+from app.services.listing_service import list_tournaments, list_rankings
+from app.services.tournament_version_service import tournament_etag
+from app.services.public_cache_service import public_cache
+from app.services.live_service import CLOSED, RESYNC, live_hub
 
 router = APIRouter(prefix="/api/public", tags=["public"])
 
@@ -25,32 +45,85 @@ def _get_published_tournament(tid: int, db: Session) -> Tournament:
     return t
 
 
+async def _cached_tournament_read(
+    request: Request, response: Response, runner: DatabaseRunner, tid: int, resource: str,
+    build: Callable[[Session, Tournament], Any], with_ranking: bool = False,
+) -> Any:
+    """
+    Serve a published tournament read from the public cache.  A hit answers
+    from the cached ETag and body without touching the database; a miss
+    builds the body and stores it, tagged with the tournament (and, for
+    ``with_ranking`` reads, its ranking).
+    """
+    key = ("tournament", tid, resource)
+    cached = public_cache.get(key)
+    if cached is not None:
+        etag, value = cached
+        check_etag(request, response, etag)
+        return value
+    generation = public_cache.generation
+
+    def _load(db: Session):
+        t = _get_published_tournament(tid, db)
+        etag = tournament_etag(db, t, with_ranking=with_ranking)
+        check_etag(request, response, etag)
+        return t.ranking_id, etag, build(db, t)
+
+    ranking_id, etag, value = await runner.run(_load)
+    tags = [("tournament", tid)]
+    if with_ranking and ranking_id:
+        tags.append(("ranking", ranking_id))
+    public_cache.put(key, tags, etag, value, generation)
+    return value
+
+
+def _get_public_ranking(rid: int, db: Session) -> Ranking:
+    r = db.query(Ranking).filter(Ranking.id == rid).first()
+    if not r:
+        raise HTTPException(status_code=404, detail="Ranking not found")
+    return r
+
+
 @router.get("/tournaments", response_model=List[TournamentOut])
-def list_published_tournaments(db: Session = Depends(get_db)):
-    tournaments = (
-        db.query(Tournament)
-        .filter(Tournament.is_published == True)
-        .order_by(Tournament.created_at.desc())
-        .all()
-    )
-    result = []
-    for t in tournaments:
-        out = TournamentOut.model_validate(t)
-        out.player_count = (
-            db.query(TournamentPlayer)
-            .filter(TournamentPlayer.tournament_id == t.id)
-            .count()
-        )
-        if t.ranking_id:
-            ranking = db.query(Ranking).filter(Ranking.id == t.ranking_id).first()
-            out.ranking_name = ranking.name if ranking else None
-        result.append(out)
-    return result
+async def list_published_tournaments(
+    response: Response,
+    tournament_status: Optional[str] = Query(None, alias="status"),
+    date_from: Optional[date] = None, date_to: Optional[date] = None,
+    name: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500), after: Optional[str] = None,
+    runner: DatabaseRunner = Depends(get_db_runner),
+):
+    def _load(db: Session):
+        try:
+            rows, next_cursor = list_tournaments(
+                db, published_only=True,
+                status=tournament_status, date_from=date_from, date_to=date_to, name=name,
+                limit=limit, after=after,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        result = []
+        for t, player_count, _, ranking_name in rows:
+            out = TournamentOut.model_validate(t)
+            out.player_count = player_count
+            out.ranking_name = ranking_name if t.ranking_id else None
+            result.append(out)
+        return result
+
+    return await runner.run(_load)
 
 
 @router.get("/tournaments/{tid}", response_model=TournamentOut)
-def get_published_tournament(tid: int, db: Session = Depends(get_db)):
-    t = _get_published_tournament(tid, db)
+async def get_published_tournament(
+    tid: int, request: Request, response: Response,
+    runner: DatabaseRunner = Depends(get_db_runner),
+):
+    return await _cached_tournament_read(request, response, runner, tid, "detail", _tournament_out)
+
+
+def _tournament_out(db: Session, t: Tournament) -> TournamentOut:
     out = TournamentOut.model_validate(t)
     out.player_count = (
         db.query(TournamentPlayer).filter(TournamentPlayer.tournament_id == t.id).count()
@@ -62,104 +135,137 @@ def get_published_tournament(tid: int, db: Session = Depends(get_db)):
 
 
 @router.get("/tournaments/{tid}/pools", response_model=List[PoolOut])
-def get_published_pools(tid: int, db: Session = Depends(get_db)):
-    _get_published_tournament(tid, db)
-    pools = db.query(Pool).filter(Pool.tournament_id == tid).all()
-    result = []
-    for pool in pools:
-        tp_list = db.query(TournamentPlayer).filter(TournamentPlayer.pool_id == pool.id).all()
-        players = []
-        for tp in tp_list:
-            p = db.query(Player).filter(Player.id == tp.player_id).first()
-            players.append({
-                "player_id": tp.player_id,
-                "player_name": p.name if p else "Unknown",
-                "seed": tp.seed,
-            })
-
-        matches = (
-            db.query(PoolMatch)
-            .filter(PoolMatch.pool_id == pool.id)
-            .order_by(PoolMatch.play_order.asc().nullslast(), PoolMatch.id.asc())
-            .all()
-        )
-        match_list = []
-        for m in matches:
-            p1 = db.query(Player).filter(Player.id == m.player1_id).first()
-            p2 = db.query(Player).filter(Player.id == m.player2_id).first()
-            w = db.query(Player).filter(Player.id == m.winner_id).first() if m.winner_id else None
-            match_list.append(PoolMatchOut(
-                id=m.id,
-                pool_id=m.pool_id,
-                tournament_id=m.tournament_id,
-                player1_id=m.player1_id,
-                player2_id=m.player2_id,
-                player1_legs=m.player1_legs,
-                player2_legs=m.player2_legs,
-                winner_id=m.winner_id,
-                played=m.played,
-                round_number=m.round_number,
-                play_order=m.play_order,
-                player1_name=p1.name if p1 else None,
-                player2_name=p2.name if p2 else None,
-                winner_name=w.name if w else None,
-                pool_name=pool.name,
-            ))
-
-        result.append(PoolOut(
-            id=pool.id,
-            tournament_id=pool.tournament_id,
-            name=pool.name,
-            players=players,
-            matches=match_list,
-        ))
-    return result
+async def get_published_pools(
+    tid: int, request: Request, response: Response,
+    runner: DatabaseRunner = Depends(get_db_runner),
+):
+    body = await _cached_tournament_read(
+        request, response, runner, tid, "pools",
+        lambda db, t: pool_rows_adapter.dump_json(get_pool_rows(db, t.id)),
+    )
+    return json_array_response(body, headers=dict(response.headers))
+
+
+def _is_published(tid: int) -> bool:
+    # Own short-lived session: a live connection must not hold a pooled one
+    db = ReadSessionLocal()
+    try:
+        return db.query(Tournament.id).filter(
+            Tournament.id == tid, Tournament.is_published == True,
+        ).first() is not None
+    finally:
+        db.close()
+
+
+@router.get("/tournaments/{tid}/live")
+async def stream_tournament_events(tid: int):
+    """
+    Server-Sent Events stream of a published tournament's changes
+    (``pool_match``, ``bracket_match``, ``standings``, ``pools_generated``,
+    ``bracket_generated``, ``status`` and ``resync``).  Ends with a
+    ``closed`` event when the tournament is unpublished.
+    """
+    if not await run_in_threadpool(_is_published, tid):
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    subscription = live_hub.subscribe(tid)
+
+    async def _events():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                data = await subscription.next(settings.LIVE_HEARTBEAT_SECONDS)
+                if data is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                if data == RESYNC and not await run_in_threadpool(_is_published, tid):
+                    data = CLOSED
+                yield f"data: {data}\n\n"
+                if data == CLOSED:
+                    return
+        finally:
+            live_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        _events(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/tournaments/{tid}/ws")
+async def tournament_events_socket(websocket: WebSocket, tid: int):
+    """WebSocket carrying the same events as the SSE stream, one JSON text frame each."""
+    if not await run_in_threadpool(_is_published, tid):
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    subscription = live_hub.subscribe(tid)
+
+    async def _send():
+        while True:
+            data = await subscription.next(settings.LIVE_HEARTBEAT_SECONDS)
+            if data == RESYNC and not await run_in_threadpool(_is_published, tid):
+                data = CLOSED
+            await websocket.send_text(data if data is not None else '{"type":"ping"}')
+            if data == CLOSED:
+                await websocket.close(code=4404)
+                return
+
+    sender = asyncio.ensure_future(_send())
+    try:
+        # Client messages are ignored; reading notices the disconnect promptly
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.cancel()
+        live_hub.unsubscribe(subscription)
+
+
+@router.get("/live/stats")
+async def get_live_stats():
+    """Open live channels, subscribers and backpressure counters."""
+    return live_hub.stats()
 
 
 @router.get("/tournaments/{tid}/standings", response_model=List[StandingEntry])
-def get_published_standings(tid: int, db: Session = Depends(get_db)):
-    _get_published_tournament(tid, db)
-    return get_pool_standings(db, tid)
+async def get_published_standings(
+    tid: int, request: Request, response: Response,
+    runner: DatabaseRunner = Depends(get_db_runner),
+):
+    return await _cached_tournament_read(
+        request, response, runner, tid, "standings", lambda db, t: get_pool_standings(db, t.id),
+    )
 
 
 @router.get("/tournaments/{tid}/bracket", response_model=List[BracketMatchOut])
-def get_published_bracket(tid: int, db: Session = Depends(get_db)):
-    _get_published_tournament(tid, db)
-    matches = (
-        db.query(BracketMatch)
-        .filter(BracketMatch.tournament_id == tid)
-        .order_by(BracketMatch.bracket_type, BracketMatch.round_number, BracketMatch.match_number)
-        .all()
+async def get_published_bracket(
+    tid: int, request: Request, response: Response,
+    runner: DatabaseRunner = Depends(get_db_runner),
+):
+    body = await _cached_tournament_read(
+        request, response, runner, tid, "bracket",
+        lambda db, t: bracket_rows_adapter.dump_json(get_bracket_rows(db, t.id)),
     )
-    result = []
-    for m in matches:
-        p1 = db.query(Player).filter(Player.id == m.player1_id).first() if m.player1_id else None
-        p2 = db.query(Player).filter(Player.id == m.player2_id).first() if m.player2_id else None
-        result.append(BracketMatchOut(
-            id=m.id, tournament_id=m.tournament_id,
-            bracket_type=m.bracket_type, round_number=m.round_number,
-            match_number=m.match_number,
-            player1_id=m.player1_id, player2_id=m.player2_id,
-            player1_legs=m.player1_legs, player2_legs=m.player2_legs,
-            winner_id=m.winner_id, loser_id=m.loser_id, played=m.played,
-            next_winner_match_id=m.next_winner_match_id,
-            next_loser_match_id=m.next_loser_match_id,
-            player1_name=p1.name if p1 else None,
-            player2_name=p2.name if p2 else None,
-        ))
-    return result
+    return json_array_response(body, headers=dict(response.headers))
 
 
 @router.get("/tournaments/{tid}/ranking-points")
-def get_published_ranking_points(tid: int, db: Session = Depends(get_db)):
+async def get_published_ranking_points(
+    tid: int, request: Request, response: Response,
+    runner: DatabaseRunner = Depends(get_db_runner),
+):
     """Get ranking points per player for a published tournament."""
+    return await _cached_tournament_read(
+        request, response, runner, tid, "ranking-points", _ranking_points_out, with_ranking=True,
+    )
+
+
+def _ranking_points_out(db: Session, t: Tournament) -> List[dict]:
     from app.models.ranking import RankingEntry
-    t = _get_published_tournament(tid, db)
     if not t.ranking_id:
         return []
     entries = (
         db.query(RankingEntry)
-        .filter(RankingEntry.ranking_id == t.ranking_id, RankingEntry.tournament_id == tid)
+        .filter(RankingEntry.ranking_id == t.ranking_id, RankingEntry.tournament_id == t.id)
         .all()
     )
     return [
@@ -175,35 +281,129 @@ def get_published_ranking_points(tid: int, db: Session = Depends(get_db)):
 
 # ── Public Rankings ──
 @router.get("/rankings", response_model=List[RankingOut])
-def list_public_rankings(db: Session = Depends(get_db)):
+async def list_public_rankings(
+    response: Response, name: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500), after: Optional[str] = None,
+    runner: DatabaseRunner = Depends(get_db_runner),
+):
     """List all rankings (public view)."""
-    rankings = db.query(Ranking).order_by(Ranking.created_at.desc()).all()
-    result = []
-    for r in rankings:
-        out = RankingOut.model_validate(r)
-        out.tournament_count = (
-            db.query(Tournament)
-            .filter(Tournament.ranking_id == r.id)
-            .count()
-        )
-        result.append(out)
-    return result
+    def _load(db: Session):
+        try:
+            rows, next_cursor = list_rankings(db, name=name, limit=limit, after=after)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        result = []
+        for r, tournament_count, _ in rows:
+            out = RankingOut.model_validate(r)
+            out.tournament_count = tournament_count
+            result.append(out)
+        return result
+
+    return await runner.run(_load)
 
 
 @router.get("/rankings/{rid}", response_model=RankingOut)
-def get_public_ranking(rid: int, db: Session = Depends(get_db)):
-    r = db.query(Ranking).filter(Ranking.id == rid).first()
-    if not r:
-        raise HTTPException(status_code=404, detail="Ranking not found")
-    out = RankingOut.model_validate(r)
-    out.tournament_count = db.query(Tournament).filter(Tournament.ranking_id == r.id).count()
-    return out
+async def get_public_ranking(rid: int, runner: DatabaseRunner = Depends(get_db_runner)):
+    def _load(db: Session):
+        r = _get_public_ranking(rid, db)
+        out = RankingOut.model_validate(r)
+        out.tournament_count = db.query(Tournament).filter(Tournament.ranking_id == r.id).count()
+        return out
+
+    return await runner.run(_load)
 
 
 @router.get("/rankings/{rid}/standings", response_model=List[RankingStandingEntry])
-def get_public_ranking_standings(rid: int, db: Session = Depends(get_db)):
-    r = db.query(Ranking).filter(Ranking.id == rid).first()
-    if not r:
-        raise HTTPException(status_code=404, detail="Ranking not found")
-    return get_ranking_standings(db, rid)
+async def get_public_ranking_standings(
+    rid: int, as_of: Optional[date] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000), after: Optional[str] = None,
+    include_results: bool = False, runner: DatabaseRunner = Depends(get_db_runner),
+):
+    def _load(db: Session):
+        _get_public_ranking(rid, db)
+        try:
+            if as_of is not None:
+                standings = get_ranking_standings_as_of(db, rid, as_of)
+                if not include_results:
+                    standings = [{**s, "tournament_results": []} for s in standings]
+                page, next_cursor = paginate_standings(standings, limit, after)
+                produce = lambda _db: page
+            else:
+                keys, next_cursor = get_ranking_standings_page(db, rid, limit, after)
+                produce = lambda stream_db: iter_ranking_standings(stream_db, rid, keys, include_results)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return produce, next_cursor
+
+    if limit is None or limit > settings.PUBLIC_CACHE_MAX_PAGE:
+        # Whole or large standings would pin multi-megabyte bodies in the
+        # cache: stream them like the private endpoint does
+        produce, next_cursor = await runner.run(_load)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return stream_json_array(produce, headers=headers)
+
+    def _load_page(db: Session):
+        produce, next_cursor = _load(db)
+        return encode_json_array(produce(db)), next_cursor
+
+    key = ("ranking", rid, "standings", as_of, limit, after, include_results)
+    cached = public_cache.get(key)
+    if cached is None:
+        generation = public_cache.generation
+        body, next_cursor = await runner.run(_load_page)
+        public_cache.put(key, [("ranking", rid)], None, (body, next_cursor), generation)
+    else:
+        body, next_cursor = cached[1]
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return json_array_response(body, headers=headers)
+
+
+@router.get("/rankings/{rid}/players/{pid}", response_model=RankingPlayerPosition)
+async def get_public_player_position(
+    rid: int, pid: int, runner: DatabaseRunner = Depends(get_db_runner),
+):
+    def _load(db: Session):
+        _get_public_ranking(rid, db)
+        return get_player_ranking_position(db, rid, pid)
+
+    position = await runner.run(_load)
+    if position is None:
+        raise HTTPException(status_code=404, detail="Player not ranked")
+    return position
+
+
+@router.get("/rankings/{rid}/history", response_model=List[RankingPlayerHistory])
+async def get_public_ranking_history(
+    rid: int, player_id: Optional[List[int]] = Query(None),
+    runner: DatabaseRunner = Depends(get_db_runner),
+):
+    if player_id and len(player_id) > settings.PUBLIC_HISTORY_MAX_PLAYERS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.PUBLIC_HISTORY_MAX_PLAYERS} player_id values",
+        )
+
+    def _load(db: Session):
+        _get_public_ranking(rid, db)
+        return get_ranking_points_series(db, rid, player_id)
+
+    if not player_id:
+        # The all-player series grows with the ranking: not cached
+        return await runner.run(_load)
+
+    key = ("ranking", rid, "history", tuple(player_id))
+    cached = public_cache.get(key)
+    if cached is not None:
+        return cached[1]
+    generation = public_cache.generation
+    series = await runner.run(_load)
+    public_cache.put(key, [("ranking", rid)], None, series, generation)
+    return series
+
+
+@router.get("/cache/stats")
+async def get_public_cache_stats():
+    """Hit, miss, eviction and invalidation counters of the public response cache."""
+    return public_cache.stats()
 
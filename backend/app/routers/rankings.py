@@ -1,18 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date
+import json
 
-from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.database import DatabaseRunner, get_db, get_db_runner, get_read_db, SessionLocal
+from app.core.security import get_current_user, require_admin
 from app.models.user import User
-from app.models.ranking import Ranking, RankingEntry
+from app.models.ranking import Ranking, RankingEntry, RankingJob
 from app.models.tournament import Tournament
 from app.schemas.ranking import (
     RankingCreate, RankingUpdate, RankingOut,
-    RankingStandingEntry, RankingEntryOut,
+    RankingStandingEntry, RankingEntryOut, RankingPlayerHistory, RankingPlayerPosition,
+    RankingJobOut,
 )
+from app.core.streaming import stream_json_array
 from app.services.ranking_service import (
-    get_ranking_standings, recalculate_ranking_entries,
+    PointsConfig, recalculate_ranking_entries, rescore_ranking_entries, get_player_ranking_position,
+    get_ranking_standings_page, iter_ranking_standings, paginate_standings, set_ranking_window,
+    set_ranking_best_n,
+)
+from app.services.ranking_job_service import list_ranking_jobs, retry_ranking_job
+from app.services.listing_service import list_rankings as list_ranking_rows
+from app.services.tournament_version_service import bump_tournament_versions
+from app.services.public_cache_service import invalidate_ranking
+from app.services.ranking_batch_service import iter_recalculate_ranking, recalculate_ranking
+from app.services.ranking_history_service import (
+    get_ranking_standings_as_of, get_ranking_points_series,
 )
 
 router = APIRouter(prefix="/api/rankings", tags=["rankings"])
@@ -28,25 +43,38 @@ def _get_ranking_with_access(rid: int, db: Session, user: User) -> Ranking:
     return r
 
 
+def _check_best_n(best_n: Optional[int]) -> None:
+    if best_n is not None and best_n < 1:
+        raise HTTPException(status_code=400, detail="best_n must be at least 1")
+
+
+def _ranking_list_out(row) -> RankingOut:
+    """RankingOut of a listing_service row."""
+    r, tournament_count, username = row
+    out = RankingOut.model_validate(r)
+    out.tournament_count = tournament_count
+    out.created_by_username = username
+    return out
+
+
 # ── CRUD ──
 @router.get("", response_model=List[RankingOut])
-def list_rankings(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    query = db.query(Ranking)
-    if current_user.role != "admin":
-        query = query.filter(Ranking.created_by == current_user.id)
-    rankings = query.order_by(Ranking.created_at.desc()).all()
-    result = []
-    for r in rankings:
-        out = RankingOut.model_validate(r)
-        out.tournament_count = (
-            db.query(Tournament)
-            .filter(Tournament.ranking_id == r.id)
-            .count()
+def list_rankings(
+    response: Response, name: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500), after: Optional[str] = None,
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
+    """Rankings, newest first; ``limit`` for keyset pages (``X-Next-Cursor`` header)."""
+    try:
+        rows, next_cursor = list_ranking_rows(
+            db, created_by=None if current_user.role == "admin" else current_user.id,
+            name=name, limit=limit, after=after,
         )
-        if r.creator:
-            out.created_by_username = r.creator.username
-        result.append(out)
-    return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [_ranking_list_out(row) for row in rows]
 
 
 @router.post("", response_model=RankingOut, status_code=status.HTTP_201_CREATED)
@@ -54,8 +82,12 @@ def create_ranking(
     data: RankingCreate, db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    _check_best_n(data.best_n)
     ranking = Ranking(**data.model_dump(), created_by=current_user.id)
     db.add(ranking)
+    db.flush()
+    if ranking.window_days:
+        set_ranking_window(db, ranking)
     db.commit()
     db.refresh(ranking)
     out = RankingOut.model_validate(ranking)
@@ -64,8 +96,17 @@ def create_ranking(
     return out
 
 
+@router.get("/jobs", response_model=List[RankingJobOut])
+def list_all_ranking_jobs(
+    job_status: Optional[str] = Query(None, alias="status"),
+    db: Session = Depends(get_read_db), current_user: User = Depends(require_admin),
+):
+    """Automatic recalculation jobs of all rankings (``?status=failed`` for failures)."""
+    return list_ranking_jobs(db, status=job_status)
+
+
 @router.get("/{rid}", response_model=RankingOut)
-def get_ranking(rid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_ranking(rid: int, db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     r = _get_ranking_with_access(rid, db, current_user)
     out = RankingOut.model_validate(r)
     out.tournament_count = db.query(Tournament).filter(Tournament.ranking_id == r.id).count()
@@ -80,8 +121,26 @@ def update_ranking(
     current_user: User = Depends(get_current_user),
 ):
     r = _get_ranking_with_access(rid, db, current_user)
-    for key, val in data.model_dump(exclude_unset=True).items():
+    changes = data.model_dump(exclude_unset=True)
+    _check_best_n(changes.get("best_n"))
+    scoring_changed = any(
+        getattr(r, key) != val for key, val in changes.items() if key in PointsConfig._fields
+    )
+    window_changed = "window_days" in changes and changes["window_days"] != r.window_days
+    best_n_changed = "best_n" in changes and changes["best_n"] != r.best_n
+    if "name" in changes and changes["name"] != r.name:
+        # Tournament reads show the ranking name
+        bump_tournament_versions(db, Tournament.ranking_id == r.id)
+    for key, val in changes.items():
         setattr(r, key, val)
+    if scoring_changed and rescore_ranking_entries(db, r) is None:
+        # Legacy entries lack scoring facts: rebuild them from the brackets
+        db.commit()
+        recalculate_ranking(db, r.id)
+    if window_changed:
+        set_ranking_window(db, r)
+    elif best_n_changed:
+        set_ranking_best_n(db, r)
     db.commit()
     db.refresh(r)
     out = RankingOut.model_validate(r)
@@ -93,29 +152,96 @@ def update_ranking(
 def delete_ranking(rid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     r = _get_ranking_with_access(rid, db, current_user)
     # Unlink tournaments
+    bump_tournament_versions(db, Tournament.ranking_id == r.id)
     db.query(Tournament).filter(Tournament.ranking_id == r.id).update({"ranking_id": None})
+    db.query(RankingJob).filter(RankingJob.ranking_id == r.id).delete()
+    invalidate_ranking(db, r.id)
     db.delete(r)
     db.commit()
 
 
 # ── Standings ──
 @router.get("/{rid}/standings", response_model=List[RankingStandingEntry])
-def get_standings(rid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_standings(
+    rid: int, as_of: Optional[date] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000), after: Optional[str] = None,
+    include_results: bool = False,
+    runner: DatabaseRunner = Depends(get_db_runner), current_user: User = Depends(get_current_user),
+):
+    """
+    Standings ordered by total points, best placement and player id.
+
+    Pass ``limit`` for keyset pagination; the ``X-Next-Cursor`` response
+    header is the ``after`` value of the next page.  The per-tournament
+    breakdown is only included with ``include_results=true``.
+    """
+    def _load(db: Session):
+        _get_ranking_with_access(rid, db, current_user)
+        try:
+            if as_of is not None:
+                standings = get_ranking_standings_as_of(db, rid, as_of)
+                if not include_results:
+                    standings = [{**s, "tournament_results": []} for s in standings]
+                page, next_cursor = paginate_standings(standings, limit, after)
+                produce = lambda _db: page
+            else:
+                keys, next_cursor = get_ranking_standings_page(db, rid, limit, after)
+                produce = lambda stream_db: iter_ranking_standings(stream_db, rid, keys, include_results)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return produce, next_cursor
+
+    produce, next_cursor = await runner.run(_load)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return stream_json_array(produce, headers=headers)
+
+
+@router.get("/{rid}/players/{pid}", response_model=RankingPlayerPosition)
+def get_player_position(
+    rid: int, pid: int, db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Rank, points, gaps to the neighbouring players and breakdown of one player."""
+    _get_ranking_with_access(rid, db, current_user)
+    position = get_player_ranking_position(db, rid, pid)
+    if position is None:
+        raise HTTPException(status_code=404, detail="Player not ranked")
+    return position
+
+
+@router.get("/{rid}/history", response_model=List[RankingPlayerHistory])
+def get_history(
+    rid: int, player_id: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
+    """Cumulative points after each tournament, per player (all players by default)."""
     _get_ranking_with_access(rid, db, current_user)
-    return get_ranking_standings(db, rid)
+    return get_ranking_points_series(db, rid, player_id)
 
 
 # ── Recalculate ──
 @router.post("/{rid}/recalculate")
 def recalculate_all(rid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    """Recalculate ranking entries for all tournaments in this ranking."""
+    """
+    Recalculate ranking entries for all tournaments in this ranking.
+
+    Streams newline-delimited JSON progress events; the last line carries
+    ``tournaments_processed``, ``entries_created`` and ``rows_changed``.
+    """
     r = _get_ranking_with_access(rid, db, current_user)
-    tournaments = db.query(Tournament).filter(Tournament.ranking_id == r.id).all()
-    total_entries = 0
-    for t in tournaments:
-        entries = recalculate_ranking_entries(db, r.id, t.id)
-        total_entries += len(entries)
-    return {"tournaments_processed": len(tournaments), "entries_created": total_entries}
+
+    def _progress():
+        # The request session is closed once streaming starts; use our own
+        batch_db = SessionLocal()
+        try:
+            for event in iter_recalculate_ranking(batch_db, r.id):
+                yield json.dumps(event) + "\n"
+        except ValueError as e:
+            yield json.dumps({"stage": "error", "detail": str(e)}) + "\n"
+        finally:
+            batch_db.close()
+
+    return StreamingResponse(_progress(), media_type="application/x-ndjson")
 
 
 @router.post("/{rid}/recalculate/{tid}")
@@ -123,16 +249,43 @@ def recalculate_tournament(
     rid: int, tid: int, db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Recalculate ranking entries for a specific tournament."""
+    """
+    Recalculate ranking entries for a specific tournament.
+
+    Only entries that differ are written; ``rows_changed`` counts them.
+    """
+    _get_ranking_with_access(rid, db, current_user)
+    return recalculate_ranking_entries(db, rid, tid)
+
+
+# ── Automatic recalculation jobs ──
+@router.get("/{rid}/jobs", response_model=List[RankingJobOut])
+def get_ranking_jobs(
+    rid: int, job_status: Optional[str] = Query(None, alias="status"),
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
+    _get_ranking_with_access(rid, db, current_user)
+    return list_ranking_jobs(db, ranking_id=rid, status=job_status)
+
+
+@router.post("/{rid}/jobs/{job_id}/retry", response_model=RankingJobOut)
+def retry_job(
+    rid: int, job_id: int, db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
     _get_ranking_with_access(rid, db, current_user)
-    entries = recalculate_ranking_entries(db, rid, tid)
-    return {"entries_created": len(entries)}
+    job = db.query(RankingJob).filter(RankingJob.id == job_id, RankingJob.ranking_id == rid).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    retry_ranking_job(db, job)
+    db.refresh(job)
+    return job
 
 
 # ── Tournaments in ranking ──
 @router.get("/{rid}/tournaments")
 def get_ranking_tournaments(
-    rid: int, db: Session = Depends(get_db),
+    rid: int, db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     _get_ranking_with_access(rid, db, current_user)
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.database import get_db, get_read_db
+from app.core.security import require_admin, get_current_user
+from app.models.player import Player
+from app.models.user import User
+from app.schemas.rating import PlayerRatingOut, WinProbabilityOut, RatingReplayOut
+from app.services.rating_service import (
+    get_rating_table, get_ratings, win_probability, replay_all_ratings,
+)
+
+router = APIRouter(prefix="/api/ratings", tags=["ratings"])
+
+
+@router.get("", response_model=List[PlayerRatingOut])
+def list_ratings(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    return get_rating_table(db, limit)
+
+
+@router.get("/win-probability", response_model=WinProbabilityOut)
+def get_win_probability(
+    player1_id: int,
+    player2_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    found = db.query(Player.id).filter(Player.id.in_([player1_id, player2_id])).count()
+    if found < len({player1_id, player2_id}):
+        raise HTTPException(status_code=404, detail="Player not found")
+    ratings = get_ratings(db, [player1_id, player2_id])
+    p1 = win_probability(ratings[player1_id], ratings[player2_id])
+    return {
+        "player1_id": player1_id,
+        "player2_id": player2_id,
+        "player1_rating": round(ratings[player1_id], 1),
+        "player2_rating": round(ratings[player2_id], 1),
+        "player1_win_probability": round(p1, 4),
+        "player2_win_probability": round(1.0 - p1, 4),
+    }
+
+
+@router.post("/replay", response_model=RatingReplayOut)
+def replay_ratings(db: Session = Depends(get_db), current_user: User = Depends(require_admin)):
+    return replay_all_ratings(db)
@@ -1,25 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date
 
-from app.core.database import get_db
+from app.core.database import DatabaseRunner, get_db, get_db_runner, get_read_db
+from app.core.etag import check_etag
+from app.core.streaming import json_array_response
 from app.core.security import require_admin, get_current_user
 from app.models.user import User
 from app.models.player import Player
 from app.models.tournament import Tournament, TournamentStatus
-from app.models.tournament_models import TournamentPlayer, Pool, PoolMatch, BracketMatch
-from app.models.ranking import Ranking
+from app.models.tournament_models import TournamentPlayer
+from app.models.ranking import Ranking, RankingJob
 from app.schemas.tournament import (
     TournamentCreate, TournamentUpdate, TournamentOut,
     PoolOut, PoolMatchOut, StandingEntry, MatchScoreUpdate,
     BracketMatchOut, AddPlayersToTournament, DashboardStats,
+    pool_rows_adapter, bracket_rows_adapter,
 )
 from app.services.pool_service import (
-    generate_pools, get_pool_standings, update_pool_match_score,
+    generate_pools, get_pool_rows, get_pool_standings, update_pool_match_score,
     get_pool_top_players, get_pool_players_split, get_pool_players_split_by_total,
 )
 from app.services.bracket_service import (
-    generate_bracket, update_bracket_match_score,
+    generate_bracket, get_bracket_rows, update_bracket_match_score,
+)
+from app.services.bracket_facts_service import bump_bracket_version
+from app.services.tournament_version_service import bump_tournament_version, tournament_etag
+from app.services.public_cache_service import invalidate_tournament
+from app.services.live_service import close_channel
+from app.services.ranking_service import (
+    remove_tournament_entries, bump_entries_version, tournament_counts, move_tournament_date,
+)
+from app.services.ranking_job_service import enqueue_ranking_job
+from app.services.rating_service import remove_match_results, move_tournament_ratings
+from app.services.player_stats_service import withdraw_tournament_stats
+from app.services.head_to_head_service import remove_pair_results
+from app.services.listing_service import list_tournaments as list_tournament_rows
+from app.services.dashboard_service import (
+    get_dashboard_counters, reconcile_dashboard_counters,
+    record_tournament_created, withdraw_tournament_counters,
 )
 
 router = APIRouter(prefix="/api/tournaments", tags=["tournaments"])
@@ -40,6 +60,16 @@ def _enrich_tournament_out(out: TournamentOut, t: Tournament, db: Session) -> To
     return out
 
 
+def _tournament_list_out(row) -> TournamentOut:
+    """TournamentOut of a listing_service row."""
+    t, player_count, username, ranking_name = row
+    out = TournamentOut.model_validate(t)
+    out.player_count = player_count
+    out.created_by_username = username
+    out.ranking_name = ranking_name if t.ranking_id else None
+    return out
+
+
 def _get_tournament_with_access(tid: int, db: Session, user: User) -> Tournament:
     """Get tournament and verify the user has access (owner or admin)."""
     t = db.query(Tournament).filter(Tournament.id == tid).first()
@@ -52,49 +82,44 @@ def _get_tournament_with_access(tid: int, db: Session, user: User) -> Tournament
 
 # ── Dashboard ──
 @router.get("/dashboard/stats", response_model=DashboardStats)
-def dashboard_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    base_query = db.query(Tournament)
-    if current_user.role != "admin":
-        base_query = base_query.filter(Tournament.created_by == current_user.id)
-
-    active = base_query.filter(
-        Tournament.status.in_([TournamentStatus.POOL_STAGE, TournamentStatus.KNOCKOUT_STAGE])
-    ).count()
-    total_t = base_query.count()
-    total_p = db.query(Player).count()
-
-    tournament_ids = [t.id for t in base_query.all()]
-    if tournament_ids:
-        pool_matches = db.query(PoolMatch).filter(
-            PoolMatch.played == 1, PoolMatch.tournament_id.in_(tournament_ids)
-        ).count()
-        bracket_matches = db.query(BracketMatch).filter(
-            BracketMatch.played == 1, BracketMatch.tournament_id.in_(tournament_ids)
-        ).count()
-    else:
-        pool_matches = 0
-        bracket_matches = 0
-
-    return DashboardStats(
-        active_tournaments=active,
-        total_players=total_p,
-        matches_played=pool_matches + bracket_matches,
-        total_tournaments=total_t,
-    )
+def dashboard_stats(db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)):
+    """Maintained counters: admins see every tournament, users their own."""
+    owner_id = None if current_user.role == "admin" else current_user.id
+    return DashboardStats(**get_dashboard_counters(db, owner_id))
+
+
+@router.post("/dashboard/reconcile")
+def reconcile_dashboard(db: Session = Depends(get_db), current_user: User = Depends(require_admin)):
+    """Recount the dashboard counters from the source tables and correct any drift."""
+    return {"mismatches": reconcile_dashboard_counters(db)}
 
 
 # ── CRUD ──
 @router.get("", response_model=List[TournamentOut])
-def list_tournaments(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    query = db.query(Tournament)
-    if current_user.role != "admin":
-        query = query.filter(Tournament.created_by == current_user.id)
-    tournaments = query.order_by(Tournament.created_at.desc()).all()
-    result = []
-    for t in tournaments:
-        out = TournamentOut.model_validate(t)
-        result.append(_enrich_tournament_out(out, t, db))
-    return result
+def list_tournaments(
+    response: Response,
+    tournament_status: Optional[str] = Query(None, alias="status"),
+    date_from: Optional[date] = None, date_to: Optional[date] = None,
+    name: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500), after: Optional[str] = None,
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
+    """
+    Tournaments, newest first.  Filter by ``status``, start date range and
+    ``name``; pass ``limit`` for keyset pages (``X-Next-Cursor`` header).
+    """
+    try:
+        rows, next_cursor = list_tournament_rows(
+            db,
+            created_by=None if current_user.role == "admin" else current_user.id,
+            status=tournament_status, date_from=date_from, date_to=date_to, name=name,
+            limit=limit, after=after,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [_tournament_list_out(row) for row in rows]
 
 
 @router.post("", response_model=TournamentOut, status_code=status.HTTP_201_CREATED)
@@ -104,6 +129,8 @@ def create_tournament(
 ):
     tournament = Tournament(**data.model_dump(), created_by=current_user.id)
     db.add(tournament)
+    db.flush()
+    record_tournament_created(db, tournament)
     db.commit()
     db.refresh(tournament)
     out = TournamentOut.model_validate(tournament)
@@ -116,12 +143,16 @@ def create_tournament(
 
 
 @router.get("/{tid}", response_model=TournamentOut)
-def get_tournament(tid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_tournament(
+    tid: int, request: Request, response: Response,
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
     t = db.query(Tournament).filter(Tournament.id == tid).first()
     if not t:
         raise HTTPException(status_code=404, detail="Tournament not found")
     if current_user.role != "admin" and t.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
+    check_etag(request, response, tournament_etag(db, t))
     out = TournamentOut.model_validate(t)
     return _enrich_tournament_out(out, t, db)
 
@@ -136,8 +167,36 @@ def update_tournament(
         raise HTTPException(status_code=404, detail="Tournament not found")
     if current_user.role != "admin" and t.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
-    for key, val in data.model_dump(exclude_unset=True).items():
+    changes = data.model_dump(exclude_unset=True)
+    ranking_id = t.ranking_id
+    date_changed = "start_date" in changes and changes["start_date"] != t.start_date
+    counted_before = tournament_counts(db, ranking_id, t.id) if ranking_id and date_changed else None
+    relinked = "ranking_id" in changes and changes["ranking_id"] != ranking_id
+    if ranking_id and ("name" in changes or date_changed):
+        # Ranking history is ordered by tournament date and shows its name
+        bump_entries_version(db, ranking_id)
+    if ranking_id and relinked:
+        # The old ranking drops the tournament's entries and standings points
+        remove_tournament_entries(db, ranking_id, t.id)
+        db.query(RankingJob).filter(
+            RankingJob.ranking_id == ranking_id, RankingJob.tournament_id == t.id,
+        ).delete()
+        bump_entries_version(db, ranking_id)
+    for key, val in changes.items():
         setattr(t, key, val)
+    bump_tournament_version(t)
+    if t.ranking_id and relinked:
+        bump_entries_version(db, t.ranking_id)
+        if t.status == TournamentStatus.FINISHED:
+            enqueue_ranking_job(db, t.ranking_id, t.id)
+    if counted_before is not None and t.ranking_id == ranking_id:
+        # The new date may move the tournament into or out of a rolling window
+        db.flush()
+        move_tournament_date(db, ranking_id, t.id, counted_before)
+    if date_changed:
+        # Ratings are applied in date order
+        db.flush()
+        move_tournament_ratings(db, t)
     db.commit()
     db.refresh(t)
     out = TournamentOut.model_validate(t)
@@ -151,6 +210,16 @@ def delete_tournament(tid: int, db: Session = Depends(get_db), current_user: Use
         raise HTTPException(status_code=404, detail="Tournament not found")
     if current_user.role != "admin" and t.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
+    if t.ranking_id:
+        remove_tournament_entries(db, t.ranking_id, t.id)
+    remove_match_results(db, "pool", tournament_id=t.id)
+    remove_match_results(db, "bracket", tournament_id=t.id)
+    withdraw_tournament_stats(db, t, pool=True, bracket=True)
+    remove_pair_results(db, "pool", t.id)
+    remove_pair_results(db, "bracket", t.id)
+    db.query(RankingJob).filter(RankingJob.tournament_id == t.id).delete()
+    withdraw_tournament_counters(db, t)
+    invalidate_tournament(db, t.id)
     db.delete(t)
     db.commit()
 
@@ -159,6 +228,10 @@ def delete_tournament(tid: int, db: Session = Depends(get_db), current_user: Use
 def toggle_publish(tid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     t = _get_tournament_with_access(tid, db, current_user)
     t.is_published = not t.is_published
+    bump_tournament_version(t)
+    if not t.is_published:
+        # Spectators must stop receiving the tournament's changes
+        close_channel(db, t.id)
     db.commit()
     db.refresh(t)
     return {"is_published": t.is_published}
@@ -166,8 +239,12 @@ def toggle_publish(tid: int, db: Session = Depends(get_db), current_user: User =
 
 # ── Player assignment ──
 @router.get("/{tid}/players")
-def get_tournament_players(tid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    _get_tournament_with_access(tid, db, current_user)
+def get_tournament_players(
+    tid: int, request: Request, response: Response,
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
+    t = _get_tournament_with_access(tid, db, current_user)
+    check_etag(request, response, tournament_etag(db, t))
     tp_list = (
         db.query(TournamentPlayer)
         .filter(TournamentPlayer.tournament_id == tid)
@@ -204,6 +281,9 @@ def add_players_to_tournament(
         if pid not in existing:
             db.add(TournamentPlayer(tournament_id=tid, player_id=pid))
             added += 1
+    if added:
+        bump_bracket_version(t)
+        bump_tournament_version(t)
     db.commit()
     return {"added": added}
 
@@ -213,7 +293,7 @@ def remove_player_from_tournament(
     tid: int, player_id: int, db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    _get_tournament_with_access(tid, db, current_user)
+    t = _get_tournament_with_access(tid, db, current_user)
     tp = (
         db.query(TournamentPlayer)
         .filter(TournamentPlayer.tournament_id == tid, TournamentPlayer.player_id == player_id)
@@ -222,74 +302,49 @@ def remove_player_from_tournament(
     if not tp:
         raise HTTPException(status_code=404, detail="Player not in tournament")
     db.delete(tp)
+    bump_bracket_version(t)
+    bump_tournament_version(t)
     db.commit()
 
 
 # ── Pool Stage ──
 @router.post("/{tid}/generate-pools")
-def api_generate_pools(tid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def api_generate_pools(
+    tid: int, seeding: str = "random",
+    db: Session = Depends(get_db), current_user: User = Depends(get_current_user),
+):
     t = _get_tournament_with_access(tid, db, current_user)
+    if seeding not in ("random", "rating"):
+        raise HTTPException(status_code=400, detail="Seeding must be 'random' or 'rating'")
     try:
-        pools = generate_pools(db, t)
+        pools = generate_pools(db, t, seeding=seeding)
         return {"pools_created": len(pools)}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{tid}/pools", response_model=List[PoolOut])
-def get_pools(tid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    _get_tournament_with_access(tid, db, current_user)
-    pools = db.query(Pool).filter(Pool.tournament_id == tid).all()
-    result = []
-    for pool in pools:
-        tp_list = db.query(TournamentPlayer).filter(TournamentPlayer.pool_id == pool.id).all()
-        players = []
-        for tp in tp_list:
-            p = db.query(Player).filter(Player.id == tp.player_id).first()
-            players.append({
-                "player_id": tp.player_id,
-                "player_name": p.name if p else "Unknown",
-                "seed": tp.seed,
-            })
-
-        matches = db.query(PoolMatch).filter(PoolMatch.pool_id == pool.id).order_by(PoolMatch.play_order.asc().nullslast(), PoolMatch.id.asc()).all()
-        match_list = []
-        for m in matches:
-            p1 = db.query(Player).filter(Player.id == m.player1_id).first()
-            p2 = db.query(Player).filter(Player.id == m.player2_id).first()
-            w = db.query(Player).filter(Player.id == m.winner_id).first() if m.winner_id else None
-            match_list.append(PoolMatchOut(
-                id=m.id,
-                pool_id=m.pool_id,
-                tournament_id=m.tournament_id,
-                player1_id=m.player1_id,
-                player2_id=m.player2_id,
-                player1_legs=m.player1_legs,
-                player2_legs=m.player2_legs,
-                winner_id=m.winner_id,
-                played=m.played,
-                round_number=m.round_number,
-                play_order=m.play_order,
-                player1_name=p1.name if p1 else None,
-                player2_name=p2.name if p2 else None,
-                winner_name=w.name if w else None,
-                pool_name=pool.name,
-            ))
-
-        result.append(PoolOut(
-            id=pool.id,
-            tournament_id=pool.tournament_id,
-            name=pool.name,
-            players=players,
-            matches=match_list,
-        ))
-    return result
+def get_pools(
+    tid: int, request: Request, response: Response,
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
+    t = _get_tournament_with_access(tid, db, current_user)
+    check_etag(request, response, tournament_etag(db, t))
+    body = pool_rows_adapter.dump_json(get_pool_rows(db, tid))
+    return json_array_response(body, headers=dict(response.headers))
 
 
 @router.get("/{tid}/standings", response_model=List[StandingEntry])
-def get_standings(tid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    _get_tournament_with_access(tid, db, current_user)
-    return get_pool_standings(db, tid)
+async def get_standings(
+    tid: int, request: Request, response: Response,
+    runner: DatabaseRunner = Depends(get_db_runner), current_user: User = Depends(get_current_user),
+):
+    def _load(db: Session):
+        t = _get_tournament_with_access(tid, db, current_user)
+        check_etag(request, response, tournament_etag(db, t))
+        return get_pool_standings(db, tid)
+
+    return await runner.run(_load)
 
 
 @router.put("/{tid}/pool-matches/{match_id}/score", response_model=PoolMatchOut)
@@ -348,38 +403,25 @@ def api_generate_bracket(
 
 
 @router.get("/{tid}/bracket", response_model=List[BracketMatchOut])
-def get_bracket(tid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    _get_tournament_with_access(tid, db, current_user)
-    matches = (
-        db.query(BracketMatch)
-        .filter(BracketMatch.tournament_id == tid)
-        .order_by(BracketMatch.bracket_type, BracketMatch.round_number, BracketMatch.match_number)
-        .all()
-    )
-    result = []
-    for m in matches:
-        p1 = db.query(Player).filter(Player.id == m.player1_id).first() if m.player1_id else None
-        p2 = db.query(Player).filter(Player.id == m.player2_id).first() if m.player2_id else None
-        result.append(BracketMatchOut(
-            id=m.id, tournament_id=m.tournament_id,
-            bracket_type=m.bracket_type, round_number=m.round_number,
-            match_number=m.match_number,
-            player1_id=m.player1_id, player2_id=m.player2_id,
-            player1_legs=m.player1_legs, player2_legs=m.player2_legs,
-            winner_id=m.winner_id, loser_id=m.loser_id, played=m.played,
-            next_winner_match_id=m.next_winner_match_id,
-            next_loser_match_id=m.next_loser_match_id,
-            player1_name=p1.name if p1 else None,
-            player2_name=p2.name if p2 else None,
-        ))
-    return result
+def get_bracket(
+    tid: int, request: Request, response: Response,
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
+    t = _get_tournament_with_access(tid, db, current_user)
+    check_etag(request, response, tournament_etag(db, t))
+    body = bracket_rows_adapter.dump_json(get_bracket_rows(db, tid))
+    return json_array_response(body, headers=dict(response.headers))
 
 
 @router.get("/{tid}/ranking-points")
-def get_ranking_points(tid: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_ranking_points(
+    tid: int, request: Request, response: Response,
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user),
+):
     """Get ranking points per player for this tournament."""
     from app.models.ranking import RankingEntry
     t = _get_tournament_with_access(tid, db, current_user)
+    check_etag(request, response, tournament_etag(db, t, with_ranking=True))
     if not t.ranking_id:
         return []
     entries = (
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import require_admin
 from app.models.user import User
 from app.schemas.user import UserOut, UserAdminUpdate
@@ -11,13 +12,13 @@ router = APIRouter(prefix="/api/users", tags=["users"])
 
 
 @router.get("", response_model=List[UserOut])
-def list_users(db: Session = Depends(get_db), current_user: User = Depends(require_admin)):
+def list_users(db: Session = Depends(get_read_db), current_user: User = Depends(require_admin)):
     users = db.query(User).order_by(User.created_at.desc()).all()
     return [UserOut.model_validate(u) for u in users]
 
 
 @router.get("/pending", response_model=List[UserOut])
-def list_pending_users(db: Session = Depends(get_db), current_user: User = Depends(require_admin)):
+def list_pending_users(db: Session = Depends(get_read_db), current_user: User = Depends(require_admin)):
     users = db.query(User).filter(User.is_approved == False).order_by(User.created_at.desc()).all()
     return [UserOut.model_validate(u) for u in users]
 
@@ -71,4 +72,8 @@ def delete_user(user_id: int, db: Session = Depends(get_db), current_user: User
     if user.id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot delete yourself")
     db.delete(user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="User still owns tournaments or rankings")
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from typing import Optional, List
+from datetime import date, datetime
 
 
 class PlayerCreate(BaseModel):
@@ -26,5 +26,65 @@ class PlayerOut(BaseModel):
         from_attributes = True
 
 
+class PlayerStatsOut(BaseModel):
+    player_id: int
+    matches_played: int
+    matches_won: int
+    matches_lost: int
+    win_rate: Optional[float] = None
+    legs_won: int
+    legs_lost: int
+    titles: int
+    tournaments_placed: int
+    average_placement: Optional[float] = None
+
+
+class HeadToHeadMatchOut(BaseModel):
+    match_type: str
+    match_id: int
+    tournament_id: int
+    tournament_name: str
+    tournament_date: Optional[date] = None
+    winner_id: int
+    player_a_legs: int
+    player_b_legs: int
+
+
+class HeadToHeadOut(BaseModel):
+    player_a_id: int
+    player_b_id: int
+    matches_played: int
+    player_a_wins: int
+    player_b_wins: int
+    player_a_legs: int
+    player_b_legs: int
+    matches: List[HeadToHeadMatchOut] = []
+
+
+class RivalOut(BaseModel):
+    opponent_id: int
+    opponent_name: str
+    matches_played: int
+    wins: int
+    losses: int
+    legs_won: int
+    legs_lost: int
+
+
+class PlayerMatchOut(BaseModel):
+    match_type: str
+    match_id: int
+    tournament_id: int
+    tournament_name: str
+    tournament_date: Optional[date] = None
+    stage: str
+    round_number: Optional[int] = None
+    opponent_id: int
+    opponent_name: str
+    player_legs: int
+    opponent_legs: int
+    won: bool
+
+
 class PlayerBulkImport(BaseModel):
     players: list[PlayerCreate]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 
 
 class RankingCreate(BaseModel):
@@ -20,6 +20,8 @@ class RankingCreate(BaseModel):
     points_seventh: int = 2
     points_eighth: int = 1
     points_participation: int = 0
+    window_days: Optional[int] = None  # rolling window; None counts all results
+    best_n: Optional[int] = None  # count only each player's best N results
 
 
 class RankingUpdate(BaseModel):
@@ -39,6 +41,8 @@ class RankingUpdate(BaseModel):
     points_seventh: Optional[int] = None
     points_eighth: Optional[int] = None
     points_participation: Optional[int] = None
+    window_days: Optional[int] = None
+    best_n: Optional[int] = None
 
 
 class RankingOut(BaseModel):
@@ -59,6 +63,9 @@ class RankingOut(BaseModel):
     points_seventh: int
     points_eighth: int
     points_participation: int
+    window_days: Optional[int] = None
+    window_cutoff: Optional[date] = None
+    best_n: Optional[int] = None
     created_by: int
     created_by_username: Optional[str] = None
     tournament_count: Optional[int] = None
@@ -78,6 +85,7 @@ class RankingEntryOut(BaseModel):
     player_name: Optional[str] = None
     placement: Optional[int] = None
     points: int
+    counted: bool = True  # False when dropped by the ranking's best_n
 
     class Config:
         from_attributes = True
@@ -92,6 +100,57 @@ class RankingStandingEntry(BaseModel):
     tournament_results: List[RankingEntryOut] = []
 
 
+class RankingNeighbour(BaseModel):
+    player_id: int
+    player_name: str
+    rank: int
+    total_points: int
+    points_gap: int
+
+
+class RankingPlayerPosition(BaseModel):
+    player_id: int
+    player_name: str
+    rank: int
+    players_ranked: int
+    total_points: int
+    tournaments_played: int
+    best_placement: Optional[int] = None
+    above: Optional[RankingNeighbour] = None
+    below: Optional[RankingNeighbour] = None
+    tournament_results: List[RankingEntryOut] = []
+
+
+class RankingHistoryPoint(BaseModel):
+    date: date
+    tournament_id: int
+    tournament_name: Optional[str] = None
+    points: int
+    total_points: int
+
+
+class RankingPlayerHistory(BaseModel):
+    player_id: int
+    player_name: str
+    points: List[RankingHistoryPoint] = []
+
+
+class RankingJobOut(BaseModel):
+    id: int
+    ranking_id: int
+    tournament_id: int
+    status: str
+    triggers: int
+    runs: int
+    error: Optional[str] = None
+    requested_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class RankingEntryCreate(BaseModel):
     tournament_id: int
     player_id: int
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+
+
+class PlayerRatingOut(BaseModel):
+    player_id: int
+    player_name: str
+    rating: float
+    matches_rated: int
+
+
+class WinProbabilityOut(BaseModel):
+    player1_id: int
+    player2_id: int
+    player1_rating: float
+    player2_rating: float
+    player1_win_probability: float
+    player2_win_probability: float
+
+
+class RatingReplayOut(BaseModel):
+    matches_rated: int
+    players_rated: int
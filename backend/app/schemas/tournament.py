@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional, List
+from typing_extensions import TypedDict
 from datetime import date, datetime
 
 
@@ -125,6 +126,65 @@ class BracketMatchOut(BaseModel):
         from_attributes = True
 
 
+# ── Row shapes for the fast list path ──
+# Plain dicts with the same fields as PoolOut / BracketMatchOut, encoded
+# straight to JSON bytes by the precompiled adapters below: no per-row
+# model construction and no second validation through response_model.
+class PoolPlayerRow(TypedDict):
+    player_id: int
+    player_name: str
+    seed: Optional[int]
+
+
+class PoolMatchRow(TypedDict):
+    id: int
+    pool_id: int
+    tournament_id: int
+    player1_id: int
+    player2_id: int
+    player1_legs: int
+    player2_legs: int
+    winner_id: Optional[int]
+    played: int
+    round_number: int
+    play_order: Optional[int]
+    player1_name: Optional[str]
+    player2_name: Optional[str]
+    winner_name: Optional[str]
+    pool_name: Optional[str]
+
+
+class PoolRow(TypedDict):
+    id: int
+    tournament_id: int
+    name: str
+    players: List[PoolPlayerRow]
+    matches: List[PoolMatchRow]
+
+
+class BracketMatchRow(TypedDict):
+    id: int
+    tournament_id: int
+    bracket_type: str
+    round_number: int
+    match_number: int
+    player1_id: Optional[int]
+    player2_id: Optional[int]
+    player1_legs: int
+    player2_legs: int
+    winner_id: Optional[int]
+    loser_id: Optional[int]
+    played: int
+    next_winner_match_id: Optional[int]
+    next_loser_match_id: Optional[int]
+    player1_name: Optional[str]
+    player2_name: Optional[str]
+
+
+pool_rows_adapter = TypeAdapter(List[PoolRow])
+bracket_rows_adapter = TypeAdapter(List[BracketMatchRow])
+
+
 class AddPlayersToTournament(BaseModel):
     player_ids: List[int]
 
@@ -0,0 +1,138 @@
+"""
+Bracket facts: a compact, read-only snapshot of a tournament's bracket and
+roster shared by all ranking computations.
+
+Snapshots are cached in-process keyed by ``Tournament.bracket_version``,
+which every bracket or roster write bumps, so recalculating an unchanged
+tournament never touches the bracket_matches / tournament_players tables.
+"""
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, NamedTuple, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.tournament import Tournament
+from app.models.tournament_models import BracketMatch, TournamentPlayer
+
+# Maximum number of tournaments kept in the cache
+CACHE_SIZE = 1024
+
+
+class MatchFacts(NamedTuple):
+    """The fields of a BracketMatch that ranking computations depend on."""
+    bracket_type: str
+    round_number: int
+    played: int
+    winner_id: Optional[int]
+    loser_id: Optional[int]
+    player1_id: Optional[int]
+    player2_id: Optional[int]
+
+
+class BracketFacts(NamedTuple):
+    """Bracket matches (ordered by bracket type, round desc) and roster of a tournament."""
+    tournament_id: int
+    version: int
+    matches: Tuple[MatchFacts, ...]
+    roster: Tuple[int, ...]
+
+
+_cache: "OrderedDict[int, BracketFacts]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def bump_bracket_version(tournament: Tournament) -> None:
+    """Mark a tournament's bracket facts as changed (applied on flush)."""
+    tournament.bracket_version = Tournament.bracket_version + 1
+
+
+def match_facts(m: BracketMatch) -> MatchFacts:
+    """The facts of a bracket match that placements and points depend on."""
+    return MatchFacts(
+        m.bracket_type, m.round_number, m.played,
+        m.winner_id, m.loser_id, m.player1_id, m.player2_id,
+    )
+
+
+def _cached(tournament_id: int, version: int) -> Optional[BracketFacts]:
+    with _lock:
+        facts = _cache.get(tournament_id)
+        if facts is None or facts.version != version:
+            return None
+        _cache.move_to_end(tournament_id)
+        return facts
+
+
+def _store(facts: BracketFacts) -> None:
+    with _lock:
+        _cache[facts.tournament_id] = facts
+        _cache.move_to_end(facts.tournament_id)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def load_bracket_facts_bulk(
+    db: Session, versions: Dict[int, int],
+) -> Dict[int, BracketFacts]:
+    """
+    Load bracket facts for several tournaments, given their current
+    ``bracket_version``.  Cache misses are fetched together with one query
+    per table.
+    """
+    result: Dict[int, BracketFacts] = {}
+    missing: List[int] = []
+    for tid, version in versions.items():
+        facts = _cached(tid, version)
+        if facts is None:
+            missing.append(tid)
+        else:
+            result[tid] = facts
+
+    if not missing:
+        return result
+
+    matches: Dict[int, List[MatchFacts]] = {tid: [] for tid in missing}
+    rosters: Dict[int, List[int]] = {tid: [] for tid in missing}
+
+    for m in (
+        db.query(BracketMatch)
+        .filter(BracketMatch.tournament_id.in_(missing))
+        .order_by(BracketMatch.tournament_id, BracketMatch.bracket_type, BracketMatch.round_number.desc())
+    ):
+        matches[m.tournament_id].append(match_facts(m))
+
+    for tid, pid in (
+        db.query(TournamentPlayer.tournament_id, TournamentPlayer.player_id)
+        .filter(TournamentPlayer.tournament_id.in_(missing))
+    ):
+        rosters[tid].append(pid)
+
+    for tid in missing:
+        facts = BracketFacts(tid, versions[tid], tuple(matches[tid]), tuple(rosters[tid]))
+        _store(facts)
+        result[tid] = facts
+    return result
+
+
+def load_bracket_facts(
+    db: Session, tournament_id: int, version: Optional[int] = None,
+) -> BracketFacts:
+    """
+    Load the bracket facts of one tournament.
+
+    Pass ``version`` when the Tournament row is already loaded; otherwise
+    it is looked up by primary key.
+    """
+    if version is None:
+        version = (
+            db.query(Tournament.bracket_version)
+            .filter(Tournament.id == tournament_id)
+            .scalar()
+        ) or 0
+    return load_bracket_facts_bulk(db, {tournament_id: version})[tournament_id]
+
+
+def clear_bracket_facts_cache() -> None:
+    with _lock:
+        _cache.clear()
@@ -8,14 +8,25 @@ Players are spread so same-pool opponents only meet in the final if possible
 (recursive half-splitting ensures maximum separation).
 """
 import math
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
 from app.models.tournament import Tournament, TournamentStatus
 from app.models.tournament_models import BracketMatch
 from app.models.player import Player
-from app.services.ranking_service import recalculate_ranking_entries
+from app.services.bracket_facts_service import bump_bracket_version
+from app.services.tournament_version_service import bump_tournament_version
+from app.services.ranking_job_service import enqueue_ranking_job
+from app.services.player_stats_service import (
+    match_state, record_match_change, record_placements, bracket_placements, withdraw_tournament_stats,
+)
+from app.services.head_to_head_service import record_pair_result, remove_pair_results
+from app.services.rating_service import record_match_result, remove_match_results
+from app.services.dashboard_service import (
+    played_match_count, record_matches_played, set_tournament_status,
+)
+from app.services.live_service import publish_event, publish_match
 
 
 def _next_power_of_2(n: int) -> int:
@@ -138,7 +149,11 @@ def generate_bracket(
     if loser_player_ids is None:
         loser_player_ids = []
 
-    # Clear existing bracket
+    # Clear existing bracket (and withdraw its rated results and stats)
+    remove_match_results(db, "bracket", tournament_id=tournament.id)
+    withdraw_tournament_stats(db, tournament, bracket=True)
+    remove_pair_results(db, "bracket", tournament.id)
+    played_before = played_match_count(db, BracketMatch, tournament.id)
     db.query(BracketMatch).filter(
         BracketMatch.tournament_id == tournament.id
     ).delete()
@@ -240,6 +255,12 @@ def generate_bracket(
             for i, cm in enumerate(current):
                 cm.next_winner_match_id = next_rnd[i // 2].id
 
+    # First-round byes are marked played; later auto-advances count themselves
+    db.flush()
+    record_matches_played(
+        db, tournament, played_match_count(db, BracketMatch, tournament.id) - played_before,
+    )
+
     # Process WB byes
     for m in wb_rounds[1]:
         if m.winner_id and m.next_winner_match_id:
@@ -251,11 +272,38 @@ def generate_bracket(
             if m.winner_id and m.next_winner_match_id:
                 _advance_winner(db, m)
 
-    tournament.status = TournamentStatus.KNOCKOUT_STAGE
+    set_tournament_status(db, tournament, TournamentStatus.KNOCKOUT_STAGE)
+    bump_bracket_version(tournament)
+    bump_tournament_version(tournament)
+    publish_event(db, tournament.id, "bracket_generated", status=tournament.status)
     db.commit()
     return all_matches
 
 
+def get_bracket_rows(db: Session, tournament_id: int) -> List[Dict[str, Any]]:
+    """
+    A tournament's bracket matches as plain dicts shaped like BracketMatchOut
+    (see ``bracket_rows_adapter``), player names joined in: one query.
+    """
+    p1, p2 = aliased(Player), aliased(Player)
+    rows = (
+        db.query(
+            BracketMatch.id, BracketMatch.tournament_id, BracketMatch.bracket_type,
+            BracketMatch.round_number, BracketMatch.match_number,
+            BracketMatch.player1_id, BracketMatch.player2_id,
+            BracketMatch.player1_legs, BracketMatch.player2_legs,
+            BracketMatch.winner_id, BracketMatch.loser_id, BracketMatch.played,
+            BracketMatch.next_winner_match_id, BracketMatch.next_loser_match_id,
+            p1.name.label("player1_name"), p2.name.label("player2_name"),
+        )
+        .outerjoin(p1, p1.id == BracketMatch.player1_id)
+        .outerjoin(p2, p2.id == BracketMatch.player2_id)
+        .filter(BracketMatch.tournament_id == tournament_id)
+        .order_by(BracketMatch.bracket_type, BracketMatch.round_number, BracketMatch.match_number)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
 def _advance_winner(db: Session, match: BracketMatch):
     """Advance match winner to the next match slot."""
     if not match.winner_id or not match.next_winner_match_id:
@@ -269,6 +317,7 @@ def _advance_winner(db: Session, match: BracketMatch):
         elif not next_match.player2_id:
             next_match.player2_id = match.winner_id
         db.flush()
+        publish_match(db, next_match)
 
         # Auto-advance if next match has a bye
         if next_match.player1_id and not next_match.player2_id:
@@ -281,6 +330,7 @@ def _advance_winner(db: Session, match: BracketMatch):
             elif all_done and len(feeders) < 2:
                 next_match.winner_id = next_match.player1_id
                 next_match.played = 1
+                record_matches_played(db, next_match.tournament, 1)
                 _advance_winner(db, next_match)
 
 
@@ -301,6 +351,7 @@ def _cascade_reset(db: Session, match: BracketMatch, old_winner_id: int):
     # If the next match was already played, recursively reset its downstream first
     if next_match.played == 1 and next_match.winner_id:
         _cascade_reset(db, next_match, next_match.winner_id)
+    before = match_state(next_match)
 
     # Remove the old winner from the next match slot
     if next_match.player1_id == old_winner_id:
@@ -309,11 +360,17 @@ def _cascade_reset(db: Session, match: BracketMatch, old_winner_id: int):
         next_match.player2_id = None
 
     # Reset the next match result
+    if next_match.played == 1:
+        remove_match_results(db, "bracket", [next_match.id])
+        record_matches_played(db, next_match.tournament, -1)
     next_match.player1_legs = 0
     next_match.player2_legs = 0
     next_match.winner_id = None
     next_match.loser_id = None
     next_match.played = 0
+    record_match_change(db, before, None)
+    record_pair_result(db, "bracket", next_match, before, None)
+    publish_match(db, next_match)
     db.flush()
 
 
@@ -339,11 +396,17 @@ def update_bracket_match_score(
 
     new_winner_id = match.player1_id if player1_legs > player2_legs else match.player2_id
     old_winner_id = match.winner_id
+    before = match_state(match)
+
+    # Placements of a finished tournament are re-added once the correction is in
+    withdraw_tournament_stats(db, match.tournament)
 
     # If winner changed, cascade-reset downstream matches
     if old_winner_id and old_winner_id != new_winner_id:
         _cascade_reset(db, match, old_winner_id)
 
+    if match.played != 1:
+        record_matches_played(db, match.tournament, 1)
     match.player1_legs = player1_legs
     match.player2_legs = player2_legs
     match.played = 1
@@ -351,6 +414,12 @@ def update_bracket_match_score(
     match.loser_id = match.player2_id if new_winner_id == match.player1_id else match.player1_id
 
     db.flush()
+    record_match_result(db, "bracket", match.id, match.tournament_id, match.winner_id, match.loser_id)
+    after = match_state(match)
+    record_match_change(db, before, after)
+    record_pair_result(db, "bracket", match, before, after)
+
+    publish_match(db, match)
 
     # Advance winner to next match
     _advance_winner(db, match)
@@ -359,6 +428,9 @@ def update_bracket_match_score(
 
     # Check if all bracket matches are complete → tournament finished
     tournament = match.tournament
+    bump_bracket_version(tournament)
+    bump_tournament_version(tournament)
+    db.flush()
     all_bracket = db.query(BracketMatch).filter(
         BracketMatch.tournament_id == tournament.id,
     ).all()
@@ -383,14 +455,16 @@ def update_bracket_match_score(
                     break
 
         if not has_pending:
-            tournament.status = TournamentStatus.FINISHED
+            set_tournament_status(db, tournament, TournamentStatus.FINISHED)
+            publish_event(db, tournament.id, "status", status=tournament.status)
 
-            # Auto-calculate ranking points if tournament is linked to a ranking
+            # Auto-calculate ranking points in the background if the
+            # tournament is linked to a ranking
             if tournament.ranking_id:
-                try:
-                    recalculate_ranking_entries(db, tournament.ranking_id, tournament.id)
-                except (ValueError, Exception):
-                    pass  # Don't fail the match score update if ranking calc fails
+                enqueue_ranking_job(db, tournament.ranking_id, tournament.id)
+
+    if tournament.status == TournamentStatus.FINISHED:
+        record_placements(db, bracket_placements(all_bracket))
 
     db.commit()
     db.refresh(match)
@@ -0,0 +1,217 @@
+"""
+Dashboard service: maintained dashboard counters.
+
+Every write that changes a dashboard number adjusts the DashboardCounters
+rows of the tournament's owner and of the global row (owner_id 0) by
+delta, with an in-place ``UPDATE ... SET col = col + n`` inside the
+caller's transaction.  The dashboard itself is a primary-key read of at
+most two rows.  ``reconcile_dashboard_counters`` recounts everything from
+the source tables and corrects any drift.
+"""
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.dashboard import DashboardCounters
+from app.models.player import Player
+from app.models.tournament import Tournament, TournamentStatus
+from app.models.tournament_models import PoolMatch, BracketMatch
+
+# owner_id of the row counting every tournament
+GLOBAL_OWNER = 0
+
+ACTIVE_STATUSES = (TournamentStatus.POOL_STAGE, TournamentStatus.KNOCKOUT_STAGE)
+
+COUNTER_FIELDS = ("active_tournaments", "total_tournaments", "total_players", "matches_played")
+
+
+def _is_active(status: Optional[str]) -> bool:
+    return status in ACTIVE_STATUSES
+
+
+def adjust_dashboard_counters(db: Session, owner_id: Optional[int], **deltas: int) -> None:
+    """
+    Add ``deltas`` (counter name -> change) to the owner's row and the
+    global row; runs in the caller's transaction.  A missing owner row
+    starts from zero: after reconciliation every owner with tournaments
+    has one.
+    """
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    owners = [GLOBAL_OWNER] if owner_id is None else [GLOBAL_OWNER, owner_id]
+    values = {getattr(DashboardCounters, k): getattr(DashboardCounters, k) + v for k, v in deltas.items()}
+    for owner in owners:
+        updated = (
+            db.query(DashboardCounters)
+            .filter(DashboardCounters.owner_id == owner)
+            .update(values, synchronize_session=False)
+        )
+        if not updated:
+            row = DashboardCounters(owner_id=owner, **{k: 0 for k in COUNTER_FIELDS})
+            for k, v in deltas.items():
+                setattr(row, k, v)
+            db.add(row)
+            db.flush()
+
+
+def played_match_count(db: Session, model, tournament_id: int) -> int:
+    """Number of played matches of one stage (PoolMatch or BracketMatch) of a tournament."""
+    return (
+        db.query(func.count(model.id))
+        .filter(model.tournament_id == tournament_id, model.played == 1)
+        .scalar()
+    ) or 0
+
+
+def record_matches_played(db: Session, tournament: Tournament, delta: int) -> None:
+    adjust_dashboard_counters(db, tournament.created_by, matches_played=delta)
+
+
+def set_tournament_status(db: Session, tournament: Tournament, status: str) -> None:
+    """Change a tournament's status, keeping the active-tournament counters in step."""
+    change = int(_is_active(status)) - int(_is_active(tournament.status))
+    tournament.status = status
+    adjust_dashboard_counters(db, tournament.created_by, active_tournaments=change)
+
+
+def record_tournament_created(db: Session, tournament: Tournament) -> None:
+    adjust_dashboard_counters(
+        db, tournament.created_by,
+        total_tournaments=1, active_tournaments=int(_is_active(tournament.status)),
+    )
+
+
+def withdraw_tournament_counters(db: Session, tournament: Tournament) -> None:
+    """Subtract a tournament that is about to be deleted, with its played matches."""
+    adjust_dashboard_counters(
+        db, tournament.created_by,
+        total_tournaments=-1,
+        active_tournaments=-int(_is_active(tournament.status)),
+        matches_played=-(
+            played_match_count(db, PoolMatch, tournament.id)
+            + played_match_count(db, BracketMatch, tournament.id)
+        ),
+    )
+
+
+def record_players_changed(db: Session, delta: int) -> None:
+    adjust_dashboard_counters(db, None, total_players=delta)
+
+
+def get_dashboard_counters(db: Session, owner_id: Optional[int]) -> Dict[str, int]:
+    """
+    Dashboard numbers of one owner (``None`` for everything).  Player
+    totals always come from the global row.
+    """
+    owners = [GLOBAL_OWNER] if owner_id is None else [GLOBAL_OWNER, owner_id]
+    rows = {
+        r.owner_id: r
+        for r in db.query(DashboardCounters).filter(DashboardCounters.owner_id.in_(owners))
+    }
+    if GLOBAL_OWNER not in rows:
+        return compute_dashboard_counters(db, owner_id)
+    own = rows.get(GLOBAL_OWNER if owner_id is None else owner_id)
+    result = {k: getattr(own, k) if own else 0 for k in COUNTER_FIELDS}
+    result["total_players"] = rows[GLOBAL_OWNER].total_players
+    return result
+
+
+def compute_dashboard_counters(db: Session, owner_id: Optional[int]) -> Dict[str, int]:
+    """Count one owner's (or, for None / GLOBAL_OWNER, every) dashboard numbers from the source tables."""
+    if owner_id == GLOBAL_OWNER:
+        owner_id = None
+    tournaments = db.query(Tournament.id)
+    if owner_id is not None:
+        tournaments = tournaments.filter(Tournament.created_by == owner_id)
+    matches = 0
+    for model in (PoolMatch, BracketMatch):
+        query = db.query(func.count(model.id)).filter(model.played == 1)
+        if owner_id is not None:
+            query = (
+                query.join(Tournament, Tournament.id == model.tournament_id)
+                .filter(Tournament.created_by == owner_id)
+            )
+        matches += query.scalar() or 0
+    return {
+        "active_tournaments": tournaments.filter(Tournament.status.in_(ACTIVE_STATUSES)).count(),
+        "total_tournaments": tournaments.count(),
+        "total_players": db.query(func.count(Player.id)).scalar() or 0,
+        "matches_played": matches,
+    }
+
+
+def _compute_all(db: Session) -> Dict[int, Dict[str, int]]:
+    """Expected counters of every owner and the global row, by grouped counts."""
+    total_players = db.query(func.count(Player.id)).scalar() or 0
+    expected: Dict[int, Dict[str, int]] = {}
+
+    def _row(owner: int) -> Dict[str, int]:
+        return expected.setdefault(owner, {k: 0 for k in COUNTER_FIELDS})
+
+    _row(GLOBAL_OWNER)
+    counts = (
+        db.query(Tournament.created_by, Tournament.status, func.count(Tournament.id))
+        .group_by(Tournament.created_by, Tournament.status)
+    )
+    for owner, status, n in counts:
+        for row in (_row(owner), _row(GLOBAL_OWNER)):
+            row["total_tournaments"] += n
+            if _is_active(status):
+                row["active_tournaments"] += n
+    for model in (PoolMatch, BracketMatch):
+        played = (
+            db.query(Tournament.created_by, func.count(model.id))
+            .join(Tournament, Tournament.id == model.tournament_id)
+            .filter(model.played == 1)
+            .group_by(Tournament.created_by)
+        )
+        for owner, n in played:
+            _row(owner)["matches_played"] += n
+            _row(GLOBAL_OWNER)["matches_played"] += n
+    for owner, row in expected.items():
+        row["total_players"] = total_players if owner == GLOBAL_OWNER else 0
+    return expected
+
+
+def reconcile_dashboard_counters(db: Session, fix: bool = True) -> List[Dict[str, Any]]:
+    """
+    Recount every owner's counters and compare them with the stored rows.
+    With ``fix`` the drifted rows are corrected (and committed).  Returns
+    the mismatches found.
+    """
+    expected = _compute_all(db)
+    stored = {r.owner_id: r for r in db.query(DashboardCounters)}
+    mismatches = []
+    for owner in sorted(set(expected) | set(stored)):
+        want = expected.get(owner, {k: 0 for k in COUNTER_FIELDS})
+        row = stored.get(owner)
+        have = {k: getattr(row, k) for k in COUNTER_FIELDS} if row else None
+        if have == want:
+            continue
+        mismatches.append({"owner_id": owner, "expected": want, "actual": have})
+        if fix:
+            if row is None:
+                db.add(DashboardCounters(owner_id=owner, **want))
+            else:
+                for k, v in want.items():
+                    setattr(row, k, v)
+    if fix and mismatches:
+        db.commit()
+    return mismatches
+
+
+def backfill_dashboard_counters() -> int:
+    """
+    Reconcile the counters table at startup (this also builds it for
+    databases created before it existed).  Returns the number of rows
+    corrected.
+    """
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return len(reconcile_dashboard_counters(db))
+    finally:
+        db.close()
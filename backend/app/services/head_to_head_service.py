@@ -0,0 +1,258 @@
+"""
+Head-to-head service: a pair-keyed index over every counted match.
+
+Each played pool or bracket match with both players is stored once under
+its ordered pair (player_low_id, player_high_id), next to a per-pair
+aggregate row.  The scoring services report match changes here the same
+way they do for the career stats, so a head-to-head lookup is a primary
+key read plus one indexed range scan, and a player's rivals are two
+indexed lookups on the aggregate table.
+"""
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.models.head_to_head import HeadToHead, HeadToHeadMatch
+from app.models.player import Player
+from app.models.tournament import Tournament
+from app.models.tournament_models import PoolMatch, BracketMatch
+from app.services.player_stats_service import MatchState
+
+
+def _pair(a: int, b: int) -> Tuple[int, int]:
+    return (a, b) if a < b else (b, a)
+
+
+def _oriented(state: Tuple[int, int, int, int, int]) -> Tuple[int, int, int, int, int]:
+    """(low_id, high_id, low_legs, high_legs, winner_id) of a match state."""
+    p1, p2, l1, l2, winner_id = state
+    if p1 < p2:
+        return p1, p2, l1, l2, winner_id
+    return p2, p1, l2, l1, winner_id
+
+
+def _adjust(
+    db: Session, low: int, high: int, sign: int, low_legs: int, high_legs: int, winner_id: int,
+) -> HeadToHead:
+    row = db.get(HeadToHead, (low, high))
+    if row is None:
+        row = HeadToHead(
+            player_low_id=low, player_high_id=high,
+            matches=0, low_wins=0, high_wins=0, low_legs=0, high_legs=0,
+        )
+        db.add(row)
+    row.matches += sign
+    row.low_wins += sign * int(winner_id == low)
+    row.high_wins += sign * int(winner_id == high)
+    row.low_legs += sign * low_legs
+    row.high_legs += sign * high_legs
+    return row
+
+
+def _drop_empty(db: Session, rows: Iterable[HeadToHead]) -> None:
+    for row in set(rows):
+        if row.matches <= 0:
+            db.delete(row)
+    db.flush()
+
+
+def record_pair_result(
+    db: Session, match_type: str, match, before: MatchState, after: MatchState,
+) -> None:
+    """Move a match in the index from its ``before`` to its ``after`` state; does not commit."""
+    if before == after:
+        return
+    existing = None
+    touched = []
+    if before is not None:
+        existing = (
+            db.query(HeadToHeadMatch)
+            .filter(HeadToHeadMatch.match_type == match_type, HeadToHeadMatch.match_id == match.id)
+            .first()
+        )
+        if existing is not None:
+            low, high, low_legs, high_legs, winner_id = _oriented(before)
+            touched.append(_adjust(db, low, high, -1, low_legs, high_legs, winner_id))
+    if after is None:
+        if existing is not None:
+            db.delete(existing)
+        _drop_empty(db, touched)
+        return
+
+    low, high, low_legs, high_legs, winner_id = _oriented(after)
+    touched.append(_adjust(db, low, high, 1, low_legs, high_legs, winner_id))
+    if existing is None:
+        existing = HeadToHeadMatch(
+            match_type=match_type, match_id=match.id, tournament_id=match.tournament_id,
+        )
+        db.add(existing)
+    existing.player_low_id, existing.player_high_id = low, high
+    existing.winner_id = winner_id
+    existing.low_legs, existing.high_legs = low_legs, high_legs
+    _drop_empty(db, touched)
+
+
+def remove_pair_results(db: Session, match_type: str, tournament_id: int) -> int:
+    """
+    Drop a tournament's pool or bracket matches from the index before they
+    are regenerated or deleted.  Returns the number of matches removed.
+    """
+    rows = (
+        db.query(HeadToHeadMatch)
+        .filter(HeadToHeadMatch.match_type == match_type, HeadToHeadMatch.tournament_id == tournament_id)
+        .all()
+    )
+    touched = []
+    for row in rows:
+        touched.append(_adjust(
+            db, row.player_low_id, row.player_high_id, -1, row.low_legs, row.high_legs, row.winner_id,
+        ))
+        db.delete(row)
+    _drop_empty(db, touched)
+    return len(rows)
+
+
+def get_head_to_head(
+    db: Session, player_a: int, player_b: int, limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Record of ``player_a`` against ``player_b``, with their matches newest first."""
+    low, high = _pair(player_a, player_b)
+    a_is_low = player_a == low
+    agg = db.get(HeadToHead, (low, high))
+    low_wins = agg.low_wins if agg else 0
+    high_wins = agg.high_wins if agg else 0
+    low_legs = agg.low_legs if agg else 0
+    high_legs = agg.high_legs if agg else 0
+
+    query = (
+        db.query(HeadToHeadMatch, Tournament.name, Tournament.start_date)
+        .join(Tournament, Tournament.id == HeadToHeadMatch.tournament_id)
+        .filter(HeadToHeadMatch.player_low_id == low, HeadToHeadMatch.player_high_id == high)
+        .order_by(HeadToHeadMatch.id.desc())
+    )
+    if limit:
+        query = query.limit(limit)
+    matches = [
+        {
+            "match_type": m.match_type,
+            "match_id": m.match_id,
+            "tournament_id": m.tournament_id,
+            "tournament_name": name,
+            "tournament_date": start_date,
+            "winner_id": m.winner_id,
+            "player_a_legs": m.low_legs if a_is_low else m.high_legs,
+            "player_b_legs": m.high_legs if a_is_low else m.low_legs,
+        }
+        for m, name, start_date in query.all()
+    ]
+    return {
+        "player_a_id": player_a,
+        "player_b_id": player_b,
+        "matches_played": agg.matches if agg else 0,
+        "player_a_wins": low_wins if a_is_low else high_wins,
+        "player_b_wins": high_wins if a_is_low else low_wins,
+        "player_a_legs": low_legs if a_is_low else high_legs,
+        "player_b_legs": high_legs if a_is_low else low_legs,
+        "matches": matches,
+    }
+
+
+def get_rivals(db: Session, player_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+    """Opponents ``player_id`` has met most often, with the player's record against each."""
+    rivals = []
+    for side in ("low", "high"):
+        me = getattr(HeadToHead, f"player_{side}_id")
+        rows = (
+            db.query(HeadToHead)
+            .filter(me == player_id)
+            .order_by(HeadToHead.matches.desc())
+            .limit(limit)
+            .all()
+        )
+        for row in rows:
+            is_low = side == "low"
+            rivals.append({
+                "opponent_id": row.player_high_id if is_low else row.player_low_id,
+                "matches_played": row.matches,
+                "wins": row.low_wins if is_low else row.high_wins,
+                "losses": row.high_wins if is_low else row.low_wins,
+                "legs_won": row.low_legs if is_low else row.high_legs,
+                "legs_lost": row.high_legs if is_low else row.low_legs,
+            })
+    rivals.sort(key=lambda r: (-r["matches_played"], -r["wins"], r["opponent_id"]))
+    rivals = rivals[:limit]
+
+    names = dict(
+        db.query(Player.id, Player.name)
+        .filter(Player.id.in_([r["opponent_id"] for r in rivals]))
+        .all()
+    )
+    for r in rivals:
+        r["opponent_name"] = names.get(r["opponent_id"], "Unknown")
+    return rivals
+
+
+def _counted_matches(db: Session) -> Iterable[Tuple[str, Any]]:
+    """Counted matches tournament by tournament (in date order), pool stage first."""
+    by_tournament: Dict[int, List[Tuple[str, Any]]] = {}
+    for match_type, model in (("pool", PoolMatch), ("bracket", BracketMatch)):
+        for row in (
+            db.query(model.id, model.tournament_id, model.player1_id, model.player2_id,
+                     model.player1_legs, model.player2_legs, model.winner_id)
+            .filter(model.played == 1, model.player1_id.isnot(None), model.player2_id.isnot(None))
+            .order_by(model.id)
+        ):
+            by_tournament.setdefault(row.tournament_id, []).append((match_type, row))
+
+    order = (func.coalesce(Tournament.start_date, func.date(Tournament.created_at)), Tournament.id)
+    for (tid,) in db.query(Tournament.id).order_by(*order):
+        yield from by_tournament.get(tid, ())
+
+
+def rebuild_head_to_head(db: Session) -> int:
+    """Rewrite the head-to-head index from the match tables; returns the number of pairs."""
+    pairs: Dict[Tuple[int, int], Dict[str, int]] = {}
+    match_rows: List[Dict[str, Any]] = []
+    for match_type, m in _counted_matches(db):
+        low, high, low_legs, high_legs, winner_id = _oriented(
+            (m.player1_id, m.player2_id, m.player1_legs or 0, m.player2_legs or 0, m.winner_id)
+        )
+        agg = pairs.setdefault((low, high), {
+            "player_low_id": low, "player_high_id": high,
+            "matches": 0, "low_wins": 0, "high_wins": 0, "low_legs": 0, "high_legs": 0,
+        })
+        agg["matches"] += 1
+        agg["low_wins"] += int(winner_id == low)
+        agg["high_wins"] += int(winner_id == high)
+        agg["low_legs"] += low_legs
+        agg["high_legs"] += high_legs
+        match_rows.append({
+            "player_low_id": low, "player_high_id": high,
+            "match_type": match_type, "match_id": m.id, "tournament_id": m.tournament_id,
+            "winner_id": winner_id, "low_legs": low_legs, "high_legs": high_legs,
+        })
+
+    db.query(HeadToHeadMatch).delete()
+    db.query(HeadToHead).delete()
+    if match_rows:
+        db.execute(insert(HeadToHeadMatch), match_rows)
+        db.execute(insert(HeadToHead), list(pairs.values()))
+    db.commit()
+    return len(pairs)
+
+
+def backfill_head_to_head() -> int:
+    """
+    Build the index for databases created before it existed.
+    Returns the number of pairs written (0 when it was already populated).
+    """
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if db.query(HeadToHead.player_low_id).first() is not None:
+            return 0
+        return rebuild_head_to_head(db)
+    finally:
+        db.close()
@@ -0,0 +1,123 @@
+"""
+Listing service: the tournament and ranking list pages.
+
+Each page is one SELECT: the rows, their player / tournament counts as
+correlated COUNT subqueries (index lookups on tournament_players and
+tournaments.ranking_id) and the creator and ranking names as outer joins.
+Pages are keyset-paginated on the primary key, newest first, so a page
+costs the same whether it is the first or the hundredth.
+"""
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.ranking import Ranking
+from app.models.tournament import Tournament, TournamentStatus
+from app.models.tournament_models import TournamentPlayer
+from app.models.user import User
+
+# (tournament, player_count, created_by_username, ranking_name)
+TournamentRow = Tuple[Tournament, int, Optional[str], Optional[str]]
+# (ranking, tournament_count, created_by_username)
+RankingRow = Tuple[Ranking, int, Optional[str]]
+
+
+def encode_list_cursor(row_id: int) -> str:
+    return str(row_id)
+
+
+def decode_list_cursor(cursor: str) -> int:
+    try:
+        return int(cursor)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def _page(query, model, limit: Optional[int], after: Optional[str]):
+    """Apply keyset pagination (id descending); returns (rows, next_cursor)."""
+    if after:
+        query = query.filter(model.id < decode_list_cursor(after))
+    query = query.order_by(model.id.desc())
+    if limit is None:
+        return query.all(), None
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_list_cursor(rows[-1][0].id)
+
+
+def list_tournaments(
+    db: Session,
+    created_by: Optional[int] = None,
+    published_only: bool = False,
+    status: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    name: Optional[str] = None,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+) -> Tuple[List[TournamentRow], Optional[str]]:
+    """
+    One page of tournaments, newest first, with their player counts and
+    creator / ranking names.  ``date_from`` and ``date_to`` bound the start
+    date (inclusive); ``name`` is a case-insensitive substring match.
+    Raises ValueError for an unknown status or a malformed cursor.
+    """
+    if status is not None and status not in {s.value for s in TournamentStatus}:
+        raise ValueError("Invalid status")
+
+    player_count = (
+        db.query(func.count(TournamentPlayer.id))
+        .filter(TournamentPlayer.tournament_id == Tournament.id)
+        .correlate(Tournament)
+        .scalar_subquery()
+    )
+    query = (
+        db.query(Tournament, player_count, User.username, Ranking.name)
+        .outerjoin(User, User.id == Tournament.created_by)
+        .outerjoin(Ranking, Ranking.id == Tournament.ranking_id)
+    )
+    if created_by is not None:
+        query = query.filter(Tournament.created_by == created_by)
+    if published_only:
+        query = query.filter(Tournament.is_published == True)
+    if status is not None:
+        query = query.filter(Tournament.status == status)
+    if date_from is not None:
+        query = query.filter(Tournament.start_date >= date_from)
+    if date_to is not None:
+        query = query.filter(Tournament.start_date <= date_to)
+    if name:
+        query = query.filter(Tournament.name.ilike(f"%{name}%"))
+    return _page(query, Tournament, limit, after)
+
+
+def list_rankings(
+    db: Session,
+    created_by: Optional[int] = None,
+    name: Optional[str] = None,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+) -> Tuple[List[RankingRow], Optional[str]]:
+    """
+    One page of rankings, newest first, with their tournament counts and
+    creator names.  Raises ValueError for a malformed cursor.
+    """
+    tournament_count = (
+        db.query(func.count(Tournament.id))
+        .filter(Tournament.ranking_id == Ranking.id)
+        .correlate(Ranking)
+        .scalar_subquery()
+    )
+    query = (
+        db.query(Ranking, tournament_count, User.username)
+        .outerjoin(User, User.id == Ranking.created_by)
+    )
+    if created_by is not None:
+        query = query.filter(Ranking.created_by == created_by)
+    if name:
+        query = query.filter(Ranking.name.ilike(f"%{name}%"))
+    return _page(query, Ranking, limit, after)
@@ -0,0 +1,241 @@
+"""
+Live service: push of tournament changes to spectators.
+
+Services describe what changed (a scored match, a pool whose standings
+moved, a regenerated bracket, a status change) with ``publish_match`` /
+``publish_event``.  The events are collected on the session, encoded once
+when the transaction commits and handed to the in-process ``LiveHub``;
+a rollback discards them.  The hub fans each event out to the
+tournament's subscribers (SSE streams and WebSockets) without touching
+the database.
+
+Every subscriber has a bounded queue.  A subscriber that falls behind
+does not slow the publisher or grow without bound: its backlog is dropped
+and replaced by a single ``resync`` event, after which the client
+refetches the tournament.
+
+Unpublishing a tournament closes its channel: every subscriber gets a
+final ``closed`` event and is dropped, so no further changes reach it.
+"""
+import asyncio
+import json
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.tournament_models import PoolMatch, BracketMatch
+
+_PENDING_KEY = "live_pending"
+_ENCODED_KEY = "live_encoded"
+_CLOSE_KEY = "live_close"
+
+RESYNC = json.dumps({"type": "resync"}, separators=(",", ":"))
+CLOSED = json.dumps({"type": "closed"}, separators=(",", ":"))
+
+_POOL_MATCH_FIELDS = ("id", "pool_id", "player1_legs", "player2_legs", "winner_id", "played")
+_BRACKET_MATCH_FIELDS = (
+    "id", "bracket_type", "round_number", "match_number", "player1_id", "player2_id",
+    "player1_legs", "player2_legs", "winner_id", "loser_id", "played",
+)
+
+
+def encode_event(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, separators=(",", ":"), default=str)
+
+
+class LiveSubscription:
+    """One spectator connection; created and consumed on the event loop."""
+
+    def __init__(self, hub: "LiveHub", tournament_id: int, queue_size: int):
+        self.hub = hub
+        self.tournament_id = tournament_id
+        self.loop = asyncio.get_running_loop()
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue(queue_size)
+
+    def _offer(self, data: str) -> None:
+        if data == CLOSED:
+            # Final event: nothing queued before it matters any more
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        try:
+            self._queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # Slow consumer: drop its backlog and have it refetch instead
+            dropped = 0
+            while not self._queue.empty():
+                self._queue.get_nowait()
+                dropped += 1
+            self._queue.put_nowait(RESYNC)
+            self.hub._record_overflow(dropped + 1)
+
+    async def next(self, timeout: float) -> Optional[str]:
+        """The next encoded event, or None if nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LiveHub:
+    """Fan-out of encoded events to the subscribers of each tournament."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[LiveSubscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.overflows = 0
+        self.dropped = 0
+
+    def subscribe(self, tournament_id: int) -> LiveSubscription:
+        """Register a subscriber; must be called from the event loop that consumes it."""
+        subscription = LiveSubscription(self, tournament_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(tournament_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LiveSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.tournament_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.tournament_id]
+
+    def publish(self, tournament_id: int, events: List[str]) -> None:
+        """
+        Hand encoded events to a tournament's subscribers.  Safe to call from
+        any thread; delivery happens on each subscriber's event loop, one
+        callback per loop rather than per subscriber.
+        """
+        if not events:
+            return
+        with self._lock:
+            self.published += len(events)
+            subscribers = list(self._subscribers.get(tournament_id, ()))
+        by_loop: Dict[asyncio.AbstractEventLoop, List[LiveSubscription]] = {}
+        for subscription in subscribers:
+            by_loop.setdefault(subscription.loop, []).append(subscription)
+        for loop, group in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver, group, events)
+            except RuntimeError:
+                # The loop is gone (server shutting down)
+                for subscription in group:
+                    self.unsubscribe(subscription)
+
+    def close(self, tournament_id: int) -> None:
+        """
+        Drop a tournament's subscribers, each after a final ``closed`` event.
+        Safe to call from any thread.
+        """
+        with self._lock:
+            subscribers = self._subscribers.pop(tournament_id, set())
+        by_loop: Dict[asyncio.AbstractEventLoop, List[LiveSubscription]] = {}
+        for subscription in subscribers:
+            by_loop.setdefault(subscription.loop, []).append(subscription)
+        for loop, group in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver, group, [CLOSED])
+            except RuntimeError:
+                pass
+
+    def _record_overflow(self, dropped: int) -> None:
+        with self._lock:
+            self.overflows += 1
+            self.dropped += dropped
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "channels": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "queue_size": self.queue_size,
+                "published": self.published,
+                "overflows": self.overflows,
+                "dropped": self.dropped,
+            }
+
+
+def _deliver(subscriptions: List[LiveSubscription], events: List[str]) -> None:
+    for subscription in subscriptions:
+        for data in events:
+            subscription._offer(data)
+
+
+live_hub = LiveHub(settings.LIVE_QUEUE_SIZE)
+
+
+# ── Publishing from the service layer ──
+def publish_event(db: Session, tournament_id: int, event_type: str, **fields: Any) -> None:
+    """Queue a change event for a tournament's spectators; sent when the transaction commits."""
+    db.info.setdefault(_PENDING_KEY, []).append(
+        (tournament_id, {"type": event_type, **fields})
+    )
+
+
+def publish_match(db: Session, match) -> None:
+    """
+    Queue the state of a pool or bracket match.  The match is read when the
+    transaction commits, so a match touched several times is sent once, as
+    it ends up.
+    """
+    db.info.setdefault(_PENDING_KEY, []).append((match.tournament_id, match))
+
+
+def close_channel(db: Session, tournament_id: int) -> None:
+    """Close a tournament's live channel once the transaction commits (e.g. on unpublish)."""
+    db.info.setdefault(_CLOSE_KEY, set()).add(tournament_id)
+
+
+def _encode(item: Any) -> Optional[str]:
+    if isinstance(item, dict):
+        return encode_event(item)
+    if isinstance(item, PoolMatch):
+        return encode_event({
+            "type": "pool_match", "match": {f: getattr(item, f) for f in _POOL_MATCH_FIELDS},
+        })
+    if isinstance(item, BracketMatch):
+        return encode_event({
+            "type": "bracket_match", "match": {f: getattr(item, f) for f in _BRACKET_MATCH_FIELDS},
+        })
+    return None
+
+
+@event.listens_for(Session, "before_commit")
+def _encode_pending(session: Session) -> None:
+    # Matches are read here: after the commit their attributes are expired
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    encoded: Dict[int, List[str]] = session.info.setdefault(_ENCODED_KEY, {})
+    seen: Set[int] = set()
+    for tournament_id, item in reversed(pending):
+        if not isinstance(item, dict):
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+        data = _encode(item)
+        if data is not None:
+            encoded.setdefault(tournament_id, []).append(data)
+    for events in encoded.values():
+        events.reverse()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_encoded(session: Session) -> None:
+    encoded = session.info.pop(_ENCODED_KEY, None)
+    for tournament_id, events in (encoded or {}).items():
+        live_hub.publish(tournament_id, events)
+    for tournament_id in session.info.pop(_CLOSE_KEY, ()):
+        live_hub.close(tournament_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_ENCODED_KEY, None)
+    session.info.pop(_CLOSE_KEY, None)
@@ -0,0 +1,115 @@
+"""
+Match history service: a player's played pool and bracket matches across
+all tournaments, newest first, with keyset pagination.
+
+The history is the union of four index range scans, one per player column
+of pool_matches and bracket_matches, all in the same order: tournament
+(most recently created first), bracket stage before pool stage, then match
+id descending.  Each scan stops after one page, so the first page costs
+the same for a newcomer and for a veteran with thousands of matches.
+"""
+import heapq
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy import and_, or_, true
+from sqlalchemy.orm import Session
+
+from app.models.player import Player
+from app.models.tournament import Tournament
+from app.models.tournament_models import PoolMatch, BracketMatch
+
+# (tournament_id, stage, match_id); stage 1 = bracket, 0 = pool
+HistoryKey = Tuple[int, int, int]
+
+_STAGES = ((0, "pool", PoolMatch), (1, "bracket", BracketMatch))
+
+
+def encode_history_cursor(key: HistoryKey) -> str:
+    return ":".join(str(v) for v in key)
+
+
+def decode_history_cursor(cursor: str) -> HistoryKey:
+    try:
+        tournament_id, stage, match_id = (int(v) for v in cursor.split(":"))
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    return (tournament_id, stage, match_id)
+
+
+def _after(model, stage: int, cursor: Optional[HistoryKey]):
+    """Filter for rows of one stage that sort after ``cursor``."""
+    if cursor is None:
+        return true()
+    c_tid, c_stage, c_id = cursor
+    if stage < c_stage:
+        return model.tournament_id <= c_tid
+    if stage > c_stage:
+        return model.tournament_id < c_tid
+    return or_(
+        model.tournament_id < c_tid,
+        and_(model.tournament_id == c_tid, model.id < c_id),
+    )
+
+
+def get_player_matches(
+    db: Session, player_id: int, limit: int = 50, after: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of a player's match history and the cursor of the next page
+    (None on the last page).  Raises ValueError for a malformed cursor.
+    """
+    cursor = decode_history_cursor(after) if after else None
+
+    scans = []
+    for stage, match_type, model in _STAGES:
+        for column in (model.player1_id, model.player2_id):
+            rows = (
+                db.query(model)
+                .filter(
+                    column == player_id,
+                    model.played == 1,
+                    model.player1_id.isnot(None), model.player2_id.isnot(None),
+                    _after(model, stage, cursor),
+                )
+                .order_by(model.tournament_id.desc(), model.id.desc())
+                .limit(limit + 1)
+                .all()
+            )
+            scans.append([((m.tournament_id, stage, m.id), match_type, m) for m in rows])
+
+    merged = heapq.merge(*scans, key=lambda item: item[0], reverse=True)
+    page = [item for _, item in zip(range(limit + 1), merged)]
+    next_cursor = encode_history_cursor(page[limit - 1][0]) if len(page) > limit else None
+    page = page[:limit]
+
+    tournament_ids = {m.tournament_id for _, _, m in page}
+    opponent_ids = {
+        m.player2_id if m.player1_id == player_id else m.player1_id for _, _, m in page
+    }
+    tournaments = {
+        t.id: t for t in db.query(Tournament).filter(Tournament.id.in_(tournament_ids))
+    } if tournament_ids else {}
+    names = dict(
+        db.query(Player.id, Player.name).filter(Player.id.in_(opponent_ids)).all()
+    ) if opponent_ids else {}
+
+    result = []
+    for _, match_type, m in page:
+        is_p1 = m.player1_id == player_id
+        opponent_id = m.player2_id if is_p1 else m.player1_id
+        t = tournaments.get(m.tournament_id)
+        result.append({
+            "match_type": match_type,
+            "match_id": m.id,
+            "tournament_id": m.tournament_id,
+            "tournament_name": t.name if t else "",
+            "tournament_date": t.start_date if t else None,
+            "stage": "pool" if match_type == "pool" else m.bracket_type,
+            "round_number": m.round_number,
+            "opponent_id": opponent_id,
+            "opponent_name": names.get(opponent_id, "Unknown"),
+            "player_legs": (m.player1_legs if is_p1 else m.player2_legs) or 0,
+            "opponent_legs": (m.player2_legs if is_p1 else m.player1_legs) or 0,
+            "won": m.winner_id == player_id,
+        })
+    return result, next_cursor
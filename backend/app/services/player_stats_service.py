@@ -0,0 +1,234 @@
+"""
+Player stats service: career aggregates kept in player_stats.
+
+Scoring services report each match's state before and after a change and
+the stats rows of the two players are adjusted by the difference, so a
+profile read is a single primary-key lookup.  Placements count while a
+tournament is finished: they are added when it finishes and withdrawn
+before its bracket is corrected, regenerated or deleted.
+``rebuild_player_stats`` recomputes the whole table from the match tables.
+"""
+from typing import List, Dict, Any, Optional, Iterable, Sequence, Tuple
+
+from sqlalchemy import case, func, insert, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.player_stats import PlayerStats
+from app.models.tournament import Tournament, TournamentStatus
+from app.models.tournament_models import PoolMatch, BracketMatch
+from app.services.bracket_facts_service import MatchFacts, match_facts, load_bracket_facts_bulk
+from app.services.ranking_service import placements_from_facts
+
+_FIELDS = (
+    "matches_played", "matches_won", "legs_won", "legs_lost",
+    "titles", "tournaments_placed", "placement_sum",
+)
+
+# (player1_id, player2_id, player1_legs, player2_legs, winner_id) of a
+# played match with both players, or None when it does not count
+MatchState = Optional[Tuple[int, int, int, int, int]]
+
+StatsDelta = Dict[int, Dict[str, int]]
+
+
+def match_state(match) -> MatchState:
+    """Snapshot of a pool or bracket match as far as the stats are concerned."""
+    if match.played != 1 or match.player1_id is None or match.player2_id is None:
+        return None
+    return (
+        match.player1_id, match.player2_id,
+        match.player1_legs or 0, match.player2_legs or 0, match.winner_id,
+    )
+
+
+def _add(deltas: StatsDelta, player_id: int, sign: int, **values: int) -> None:
+    row = deltas.setdefault(player_id, dict.fromkeys(_FIELDS, 0))
+    for field, value in values.items():
+        row[field] += sign * value
+
+
+def _match_delta(deltas: StatsDelta, state: MatchState, sign: int) -> None:
+    if state is None:
+        return
+    p1, p2, l1, l2, winner_id = state
+    _add(deltas, p1, sign, matches_played=1, matches_won=int(winner_id == p1), legs_won=l1, legs_lost=l2)
+    _add(deltas, p2, sign, matches_played=1, matches_won=int(winner_id == p2), legs_won=l2, legs_lost=l1)
+
+
+def _placement_delta(deltas: StatsDelta, placements: Dict[int, int], sign: int) -> None:
+    for pid, placement in placements.items():
+        _add(deltas, pid, sign, titles=int(placement == 1), tournaments_placed=1, placement_sum=placement)
+
+
+def _apply(db: Session, deltas: StatsDelta) -> None:
+    for pid, delta in deltas.items():
+        if not any(delta.values()):
+            continue
+        row = db.get(PlayerStats, pid)
+        if row is None:
+            row = PlayerStats(player_id=pid, **dict.fromkeys(_FIELDS, 0))
+            db.add(row)
+        for field, value in delta.items():
+            setattr(row, field, getattr(row, field) + value)
+    db.flush()
+
+
+def record_match_change(db: Session, before: MatchState, after: MatchState) -> None:
+    """Adjust the stats of a match that went from ``before`` to ``after``; does not commit."""
+    if before == after:
+        return
+    deltas: StatsDelta = {}
+    _match_delta(deltas, before, -1)
+    _match_delta(deltas, after, 1)
+    _apply(db, deltas)
+
+
+def _placed(facts: Sequence[MatchFacts]) -> Dict[int, int]:
+    bracket_players = {pid for f in facts for pid in (f.player1_id, f.player2_id) if pid}
+    return {
+        p["player_id"]: p["placement"]
+        for p in placements_from_facts(facts, bracket_players) if p["placement"]
+    }
+
+
+def bracket_placements(matches: Iterable[BracketMatch]) -> Dict[int, int]:
+    """Players with a bracket placement, computed from (possibly unflushed) match rows."""
+    return _placed(sorted(
+        (match_facts(m) for m in matches),
+        key=lambda f: (f.bracket_type, -f.round_number),
+    ))
+
+
+def record_placements(db: Session, placements: Dict[int, int], sign: int = 1) -> None:
+    """Add (``sign=1``) or withdraw (``sign=-1``) a finished tournament's placements."""
+    deltas: StatsDelta = {}
+    _placement_delta(deltas, placements, sign)
+    _apply(db, deltas)
+
+
+def withdraw_tournament_stats(
+    db: Session, tournament: Tournament, pool: bool = False, bracket: bool = False,
+) -> None:
+    """
+    Withdraw a tournament's placements (if it is finished) and, optionally,
+    its played pool and/or bracket matches, before they are regenerated or
+    deleted.  Does not commit.
+    """
+    deltas: StatsDelta = {}
+    bracket_matches = None
+    if bracket or tournament.status == TournamentStatus.FINISHED:
+        bracket_matches = (
+            db.query(BracketMatch).filter(BracketMatch.tournament_id == tournament.id).all()
+        )
+    if tournament.status == TournamentStatus.FINISHED:
+        _placement_delta(deltas, bracket_placements(bracket_matches), -1)
+    if bracket:
+        for m in bracket_matches:
+            _match_delta(deltas, match_state(m), -1)
+    if pool:
+        for m in db.query(PoolMatch).filter(PoolMatch.tournament_id == tournament.id, PoolMatch.played == 1):
+            _match_delta(deltas, match_state(m), -1)
+    _apply(db, deltas)
+
+
+def get_player_stats(db: Session, player_id: int) -> Dict[str, Any]:
+    """Career stats of one player (zeros when the player has not played yet)."""
+    row = db.get(PlayerStats, player_id)
+    values = {f: getattr(row, f) for f in _FIELDS} if row else dict.fromkeys(_FIELDS, 0)
+    played = values["matches_played"]
+    placed = values["tournaments_placed"]
+    return {
+        "player_id": player_id,
+        "matches_played": played,
+        "matches_won": values["matches_won"],
+        "matches_lost": played - values["matches_won"],
+        "win_rate": round(values["matches_won"] / played, 4) if played else None,
+        "legs_won": values["legs_won"],
+        "legs_lost": values["legs_lost"],
+        "titles": values["titles"],
+        "tournaments_placed": placed,
+        "average_placement": round(values["placement_sum"] / placed, 2) if placed else None,
+    }
+
+
+def _match_sides():
+    """One row per (match, player) for every counted pool and bracket match."""
+    sides = []
+    for model in (PoolMatch, BracketMatch):
+        counted = (model.played == 1, model.player1_id.isnot(None), model.player2_id.isnot(None))
+        for me, me_legs, other_legs in (
+            (model.player1_id, model.player1_legs, model.player2_legs),
+            (model.player2_id, model.player2_legs, model.player1_legs),
+        ):
+            sides.append(
+                select(
+                    me.label("player_id"),
+                    case((model.winner_id == me, 1), else_=0).label("won"),
+                    func.coalesce(me_legs, 0).label("legs_won"),
+                    func.coalesce(other_legs, 0).label("legs_lost"),
+                ).where(*counted)
+            )
+    return union_all(*sides).subquery()
+
+
+def compute_player_stats(db: Session) -> StatsDelta:
+    """Full recomputation of every player's stats from the match tables."""
+    stats: StatsDelta = {}
+    sides = _match_sides()
+    for pid, played, won, legs_won, legs_lost in db.query(
+        sides.c.player_id, func.count(), func.sum(sides.c.won),
+        func.sum(sides.c.legs_won), func.sum(sides.c.legs_lost),
+    ).group_by(sides.c.player_id):
+        _add(stats, pid, 1, matches_played=played, matches_won=won, legs_won=legs_won, legs_lost=legs_lost)
+
+    versions = dict(
+        db.query(Tournament.id, Tournament.bracket_version)
+        .filter(Tournament.status == TournamentStatus.FINISHED)
+        .all()
+    )
+    for facts in load_bracket_facts_bulk(db, {tid: v or 0 for tid, v in versions.items()}).values():
+        _placement_delta(stats, _placed(facts.matches), 1)
+    return stats
+
+
+def rebuild_player_stats(db: Session) -> int:
+    """Rewrite the player_stats table from scratch; returns the number of rows written."""
+    stats = compute_player_stats(db)
+    db.query(PlayerStats).delete()
+    if stats:
+        db.execute(insert(PlayerStats), [{"player_id": pid, **values} for pid, values in stats.items()])
+    db.commit()
+    return len(stats)
+
+
+def verify_player_stats(db: Session) -> List[Dict[str, Any]]:
+    """Players whose stored stats differ from a full recomputation."""
+    expected = {
+        pid: values for pid, values in compute_player_stats(db).items() if any(values.values())
+    }
+    actual = {
+        row.player_id: {f: getattr(row, f) for f in _FIELDS}
+        for row in db.query(PlayerStats)
+        if any(getattr(row, f) for f in _FIELDS)
+    }
+    return [
+        {"player_id": pid, "expected": expected.get(pid), "actual": actual.get(pid)}
+        for pid in sorted(set(expected) | set(actual))
+        if expected.get(pid) != actual.get(pid)
+    ]
+
+
+def backfill_player_stats() -> int:
+    """
+    Build the stats table for databases created before it existed.
+    Returns the number of rows written (0 when it was already populated).
+    """
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if db.query(PlayerStats.player_id).first() is not None:
+            return 0
+        return rebuild_player_stats(db)
+    finally:
+        db.close()
@@ -6,11 +6,19 @@ import random
 from itertools import combinations
 from typing import List, Dict, Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
 from app.models.tournament import Tournament, TournamentStatus
 from app.models.tournament_models import TournamentPlayer, Pool, PoolMatch
 from app.models.player import Player
+from app.services.rating_service import get_ratings, record_match_result, remove_match_results
+from app.services.player_stats_service import match_state, record_match_change, withdraw_tournament_stats
+from app.services.dashboard_service import (
+    played_match_count, record_matches_played, set_tournament_status,
+)
+from app.services.tournament_version_service import bump_tournament_version
+from app.services.head_to_head_service import record_pair_result, remove_pair_results
+from app.services.live_service import publish_event, publish_match
 
 
 def _assign_play_order(matches: List["PoolMatch"]) -> None:
@@ -49,8 +57,14 @@ def _assign_play_order(matches: List["PoolMatch"]) -> None:
         remaining.remove(best_match)
 
 
-def generate_pools(db: Session, tournament: Tournament) -> List[Pool]:
-    """Automatically assign players to pools and generate round-robin matches."""
+def generate_pools(db: Session, tournament: Tournament, seeding: str = "random") -> List[Pool]:
+    """
+    Automatically assign players to pools and generate round-robin matches.
+
+    ``seeding="rating"`` orders players by their current rating and deals
+    them out in snake order so every pool gets a similar strength mix;
+    the rating order is stored as each player's seed.
+    """
     # Get players
     tp_list = (
         db.query(TournamentPlayer)
@@ -66,6 +80,19 @@ def generate_pools(db: Session, tournament: Tournament) -> List[Pool]:
     group_size = tournament.group_size or 4
     num_groups = max(1, math.ceil(len(player_ids) / group_size))
 
+    if seeding == "rating":
+        ratings = get_ratings(db, player_ids)
+        player_ids.sort(key=lambda pid: -ratings[pid])
+        seeds = {pid: i + 1 for i, pid in enumerate(player_ids)}
+        for tp in tp_list:
+            tp.seed = seeds[tp.player_id]
+
+    # Withdraw ratings and stats of the pool matches about to be deleted
+    remove_match_results(db, "pool", tournament_id=tournament.id)
+    withdraw_tournament_stats(db, tournament, pool=True)
+    remove_pair_results(db, "pool", tournament.id)
+    record_matches_played(db, tournament, -played_match_count(db, PoolMatch, tournament.id))
+
     # Delete existing pools
     db.query(PoolMatch).filter(PoolMatch.tournament_id == tournament.id).delete()
     for p in db.query(Pool).filter(Pool.tournament_id == tournament.id).all():
@@ -87,9 +114,12 @@ def generate_pools(db: Session, tournament: Tournament) -> List[Pool]:
         db.flush()
         pools.append(pool)
 
-    # Distribute players round-robin across pools
+    # Distribute players round-robin across pools (snake order when seeded)
     for idx, pid in enumerate(player_ids):
-        pool = pools[idx % num_groups]
+        slot = idx % num_groups
+        if seeding == "rating" and (idx // num_groups) % 2 == 1:
+            slot = num_groups - 1 - slot
+        pool = pools[slot]
         tp = next(t for t in tp_list if t.player_id == pid)
         tp.pool_id = pool.id
 
@@ -118,11 +148,67 @@ def generate_pools(db: Session, tournament: Tournament) -> List[Pool]:
     # Assign fair play order across all pools
     _assign_play_order(all_matches)
 
-    tournament.status = TournamentStatus.POOL_STAGE
+    set_tournament_status(db, tournament, TournamentStatus.POOL_STAGE)
+    bump_tournament_version(tournament)
+    publish_event(db, tournament.id, "pools_generated", status=tournament.status)
     db.commit()
     return pools
 
 
+def get_pool_rows(db: Session, tournament_id: int) -> List[Dict[str, Any]]:
+    """
+    Pools of a tournament with their players and matches, as plain dicts
+    shaped like PoolOut (see ``pool_rows_adapter``).  Three queries, player
+    names joined in, whatever the number of pools.
+    """
+    pools = {
+        pid: {"id": pid, "tournament_id": tid, "name": name, "players": [], "matches": []}
+        for pid, tid, name in
+        db.query(Pool.id, Pool.tournament_id, Pool.name)
+        .filter(Pool.tournament_id == tournament_id)
+        .order_by(Pool.id)
+    }
+    if not pools:
+        return []
+
+    players = (
+        db.query(TournamentPlayer.pool_id, TournamentPlayer.player_id, Player.name, TournamentPlayer.seed)
+        .outerjoin(Player, Player.id == TournamentPlayer.player_id)
+        .filter(TournamentPlayer.pool_id.in_(list(pools)))
+        .order_by(TournamentPlayer.id)
+    )
+    for pool_id, player_id, name, seed in players:
+        pools[pool_id]["players"].append({
+            "player_id": player_id,
+            "player_name": name if name is not None else "Unknown",
+            "seed": seed,
+        })
+
+    p1, p2, w = aliased(Player), aliased(Player), aliased(Player)
+    matches = (
+        db.query(
+            PoolMatch.id, PoolMatch.pool_id, PoolMatch.tournament_id,
+            PoolMatch.player1_id, PoolMatch.player2_id,
+            PoolMatch.player1_legs, PoolMatch.player2_legs,
+            PoolMatch.winner_id, PoolMatch.played, PoolMatch.round_number, PoolMatch.play_order,
+            p1.name.label("player1_name"), p2.name.label("player2_name"),
+            w.name.label("winner_name"),
+        )
+        .outerjoin(p1, p1.id == PoolMatch.player1_id)
+        .outerjoin(p2, p2.id == PoolMatch.player2_id)
+        .outerjoin(w, w.id == PoolMatch.winner_id)
+        .filter(PoolMatch.tournament_id == tournament_id)
+        .order_by(PoolMatch.play_order.asc().nullslast(), PoolMatch.id.asc())
+    )
+    for row in matches:
+        pool = pools.get(row.pool_id)
+        if pool is not None:
+            match = dict(row._mapping)
+            match["pool_name"] = pool["name"]
+            pool["matches"].append(match)
+    return list(pools.values())
+
+
 def get_pool_standings(db: Session, tournament_id: int) -> List[Dict[str, Any]]:
     """Calculate standings for all pools in a tournament."""
     pools = db.query(Pool).filter(Pool.tournament_id == tournament_id).all()
@@ -201,6 +287,11 @@ def update_pool_match_score(
     if player1_legs == player2_legs:
         raise ValueError("Match must have a winner (no draws)")
 
+    tournament = db.get(Tournament, match.tournament_id)
+    before = match_state(match)
+    if match.played != 1:
+        record_matches_played(db, tournament, 1)
+    bump_tournament_version(tournament)
     match.player1_legs = player1_legs
     match.player2_legs = player2_legs
     match.played = 1
@@ -210,6 +301,14 @@ def update_pool_match_score(
     else:
         match.winner_id = match.player2_id
 
+    loser_id = match.player2_id if match.winner_id == match.player1_id else match.player1_id
+    record_match_result(db, "pool", match.id, match.tournament_id, match.winner_id, loser_id)
+    after = match_state(match)
+    record_match_change(db, before, after)
+    record_pair_result(db, "pool", match, before, after)
+    publish_match(db, match)
+    publish_event(db, match.tournament_id, "standings", pool_id=match.pool_id)
+
     db.commit()
     db.refresh(match)
     return match
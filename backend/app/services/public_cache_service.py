@@ -0,0 +1,176 @@
+"""
+Public response cache: a bounded LRU/TTL cache for the anonymous read
+endpoints (tournament pools, standings, bracket and ranking points,
+ranking standings and history).
+
+Entries are keyed by resource and carry the ETag (version) they were built
+for, so a hit answers both the body and If-None-Match without touching the
+database.  Each entry is tagged with the tournament and/or ranking it was
+built from.  The services that bump a tournament version or a ranking's
+entries version queue an invalidation of that tag on the session; it is
+applied once the transaction commits, and a rollback discards it.  A fill
+that raced with an invalidation is not stored.  The TTL bounds staleness
+from writes made by other processes.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# ("tournament", id) or ("ranking", id)
+CacheTag = Tuple[str, int]
+
+_PENDING_KEY = "public_cache_invalidations"
+
+
+class _Entry:
+    __slots__ = ("etag", "value", "tags", "expires_at")
+
+    def __init__(self, etag: Optional[str], value: Any, tags: Tuple[CacheTag, ...], expires_at: float):
+        self.etag = etag
+        self.value = value
+        self.tags = tags
+        self.expires_at = expires_at
+
+
+class PublicCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._by_tag: Dict[CacheTag, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; fills started before one are dropped
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[Optional[str], Any]]:
+        """(etag, value) of a live entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.etag, entry.value
+
+    def put(
+        self, key: Hashable, tags: Iterable[CacheTag], etag: Optional[str], value: Any,
+        generation: int,
+    ) -> None:
+        """Store an entry built after ``generation`` was read (dropped if it is stale)."""
+        tags = tuple(tags)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._remove(key)
+            self._entries[key] = _Entry(etag, value, tags, time.monotonic() + self.ttl_seconds)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[CacheTag]) -> None:
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in list(self._by_tag.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def invalidate_kind(self, kind: str) -> None:
+        """Drop every entry tagged with a tag of ``kind`` ("tournament" or "ranking")."""
+        with self._lock:
+            tags = [tag for tag in self._by_tag if tag[0] == kind]
+        self.invalidate(tags)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._by_tag.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+
+public_cache = PublicCache(settings.PUBLIC_CACHE_SIZE, settings.PUBLIC_CACHE_TTL_SECONDS)
+
+
+# ── Write-driven invalidation ──
+def _queue(db: Optional[Session], item: Any) -> None:
+    """Queue ``item`` (a tag, or a tag kind) on the session; without one, apply it now."""
+    if db is not None:
+        db.info.setdefault(_PENDING_KEY, []).append(item)
+    elif isinstance(item, tuple):
+        public_cache.invalidate([item])
+    else:
+        public_cache.invalidate_kind(item)
+
+
+def invalidate_tournament(db: Optional[Session], tournament_id: int) -> None:
+    """Drop a tournament's cached responses once the transaction commits."""
+    _queue(db, ("tournament", tournament_id))
+
+
+def invalidate_ranking(db: Optional[Session], ranking_id: int) -> None:
+    """Drop a ranking's cached responses once the transaction commits."""
+    _queue(db, ("ranking", ranking_id))
+
+
+def invalidate_all_rankings(db: Optional[Session]) -> None:
+    """Drop every cached ranking response (e.g. after a player rename)."""
+    _queue(db, "ranking")
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    pending: Optional[List[Any]] = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    public_cache.invalidate({item for item in pending if isinstance(item, tuple)})
+    for kind in {item for item in pending if isinstance(item, str)}:
+        public_cache.invalidate_kind(kind)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
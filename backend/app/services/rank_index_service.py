@@ -0,0 +1,219 @@
+"""
+Rank index: an in-process sorted index over a ranking's materialized
+standings for O(log n) per-player rank lookups.
+
+Keys are ``(-total_points, best_placement or 9999, player_id)`` kept in a
+sorted list, so a player's rank is a binary search and tied players
+(equal points and best placement) share a rank position.
+
+The index follows ``Ranking.entries_version``.  The ranking service records
+the standing rows it changes on the session, and they are applied to the
+index only after the transaction commits; a rollback discards them.  Any
+version mismatch simply rebuilds the index from ranking_standings.
+
+A cached index is never modified: committed changes are applied to a copy
+that then replaces it, so a reader bisecting an index it already holds
+never sees a half-applied change.
+"""
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.ranking import Ranking, RankingStanding
+
+# Maximum number of rankings indexed in memory
+CACHE_SIZE = 64
+
+_NO_PLACEMENT = 9999
+
+# player_id -> (total_points, best_placement), or None when the row was removed
+StandingChanges = Dict[int, Optional[Tuple[int, Optional[int]]]]
+
+
+def _key(player_id: int, total_points: int, best_placement: Optional[int]) -> Tuple[int, int, int]:
+    return (-total_points, best_placement or _NO_PLACEMENT, player_id)
+
+
+class RankIndex:
+    """Immutable once cached; ``set`` and ``remove`` are for building a new one."""
+
+    def __init__(self, ranking_id: int, version: int):
+        self.ranking_id = ranking_id
+        self.version = version
+        self.keys: List[Tuple[int, int, int]] = []
+        self.by_player: Dict[int, Tuple[int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def set(self, player_id: int, total_points: int, best_placement: Optional[int]) -> None:
+        self.remove(player_id)
+        key = _key(player_id, total_points, best_placement)
+        insort(self.keys, key)
+        self.by_player[player_id] = key
+
+    def remove(self, player_id: int) -> None:
+        key = self.by_player.pop(player_id, None)
+        if key is not None:
+            del self.keys[bisect_left(self.keys, key)]
+
+    def patched(self, version: int, changes: StandingChanges) -> "RankIndex":
+        """A copy of this index with ``changes`` applied, at ``version``."""
+        index = RankIndex(self.ranking_id, version)
+        index.keys = list(self.keys)
+        index.by_player = dict(self.by_player)
+        for pid, row in changes.items():
+            if row is None:
+                index.remove(pid)
+            else:
+                index.set(pid, row[0], row[1])
+        return index
+
+    def rank(self, player_id: int) -> Optional[int]:
+        """Shared (competition) rank: 1 + number of players strictly ahead."""
+        key = self.by_player.get(player_id)
+        if key is None:
+            return None
+        return bisect_left(self.keys, key[:2]) + 1
+
+    def position(self, player_id: int) -> Optional[Dict[str, Any]]:
+        """Rank of a player plus the nearest players strictly above and below."""
+        key = self.by_player.get(player_id)
+        if key is None:
+            return None
+        first = bisect_left(self.keys, key[:2])
+        after = bisect_right(self.keys, (key[0], key[1], float("inf")))
+
+        above = self.keys[first - 1] if first > 0 else None
+        below = self.keys[after] if after < len(self.keys) else None
+        return {
+            "rank": first + 1,
+            "total_points": -key[0],
+            "players_ranked": len(self.keys),
+            "above": (
+                {"player_id": above[2], "rank": bisect_left(self.keys, above[:2]) + 1,
+                 "total_points": -above[0]}
+                if above else None
+            ),
+            "below": (
+                {"player_id": below[2], "rank": after + 1, "total_points": -below[0]}
+                if below else None
+            ),
+        }
+
+    def page(
+        self, after: Optional[Tuple[int, int, int]] = None, limit: Optional[int] = None,
+    ) -> Tuple[List[Tuple[int, int, int]], Optional[Tuple[int, int, int]]]:
+        """
+        Keys of the next ``limit`` players after the ``after`` key, plus the
+        key to continue from (None on the last page).  No sorting involved.
+        """
+        start = bisect_right(self.keys, after) if after is not None else 0
+        end = len(self.keys) if limit is None else min(start + limit, len(self.keys))
+        keys = self.keys[start:end]
+        next_key = keys[-1] if keys and end < len(self.keys) else None
+        return keys, next_key
+
+
+def encode_cursor(key: Tuple[int, int, int]) -> str:
+    """Keyset cursor for (total_points, best_placement, player_id)."""
+    return f"{-key[0]}:{key[1]}:{key[2]}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int, int]:
+    try:
+        points, best, player_id = (int(v) for v in cursor.split(":"))
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    return (-points, best, player_id)
+
+
+def standing_key(standing: Dict[str, Any]) -> Tuple[int, int, int]:
+    """Sort key of a standings dict, matching the index order."""
+    return _key(standing["player_id"], standing["total_points"], standing["best_placement"])
+
+
+_cache: "OrderedDict[int, RankIndex]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _build_index(db: Session, ranking_id: int, version: int) -> RankIndex:
+    index = RankIndex(ranking_id, version)
+    rows = (
+        db.query(RankingStanding.player_id, RankingStanding.total_points, RankingStanding.best_placement)
+        .filter(RankingStanding.ranking_id == ranking_id)
+        .all()
+    )
+    index.keys = sorted(_key(pid, total, best) for pid, total, best in rows)
+    index.by_player = {k[2]: k for k in index.keys}
+    return index
+
+
+def get_rank_index(db: Session, ranking_id: int) -> RankIndex:
+    """Return the rank index of a ranking, rebuilding it if it is stale."""
+    version = (
+        db.query(Ranking.entries_version)
+        .filter(Ranking.id == ranking_id)
+        .scalar()
+    ) or 0
+    with _lock:
+        index = _cache.get(ranking_id)
+        if index is not None and index.version == version:
+            _cache.move_to_end(ranking_id)
+            return index
+
+    index = _build_index(db, ranking_id, version)
+    with _lock:
+        _cache[ranking_id] = index
+        _cache.move_to_end(ranking_id)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+# ── Keeping the index in step with committed standings ──
+_PENDING_KEY = "rank_index_pending"
+
+
+def record_standing_changes(
+    db: Session, ranking_id: int, new_version: int, changes: Optional[StandingChanges],
+) -> None:
+    """
+    Queue standing changes made in this session's transaction.
+
+    ``changes=None`` means the standings were rewritten wholesale and the
+    index should be dropped instead of patched.
+    """
+    db.info.setdefault(_PENDING_KEY, []).append((ranking_id, new_version, changes))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    with _lock:
+        for ranking_id, new_version, changes in pending:
+            index = _cache.get(ranking_id)
+            if index is None:
+                continue
+            if changes is None or index.version != new_version - 1:
+                # Rewritten, or we missed a change made elsewhere: rebuild lazily
+                del _cache[ranking_id]
+                continue
+            # Swap in a patched copy: readers may be using the current one
+            _cache[ranking_id] = index.patched(new_version, changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def clear_rank_index_cache() -> None:
+    with _lock:
+        _cache.clear()
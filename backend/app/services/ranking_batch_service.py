@@ -0,0 +1,167 @@
+"""
+Batch ranking recalculation: rebuild the entries of every tournament in a
+ranking in one pass.
+
+Bracket matches and rosters of all tournaments come from the shared
+bracket facts loader (cache misses are bulk-loaded with two queries),
+placements and points are computed concurrently in a process pool (of
+spawned, not forked, workers), and the entries that differ from the stored ones plus the materialized
+standings are written in a single transaction.  The database is only
+written to in the final step, so the write lock is held for the bulk
+writes alone.
+"""
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Iterator, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.ranking import Ranking
+from app.models.tournament import Tournament
+from app.services.bracket_facts_service import MatchFacts, load_bracket_facts_bulk
+from app.services.ranking_service import (
+    PointsConfig, points_config, compute_tournament_entries, _write_standings,
+    diff_ranking_entries, apply_entry_diff, _stored_entries,
+)
+
+logger = logging.getLogger(__name__)
+
+# Below this many tournaments the cost of starting worker processes
+# outweighs the computation itself, so the batch runs in-process.
+PARALLEL_THRESHOLD = 16
+
+# (tournament_id, bracket matches, roster player ids)
+TournamentFacts = Tuple[int, Sequence[MatchFacts], Sequence[int]]
+
+# Shared worker pool, created on first use.  Workers are spawned: forking
+# would copy the ranking-job thread's locks and the pooled SQLite
+# connections into the child.  Spawning is slow, so the pool is reused.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _discard_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _compute_chunk(
+    config: PointsConfig, chunk: List[TournamentFacts],
+) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    """Worker entry point: compute the entries of a chunk of tournaments."""
+    return [
+        (tid, compute_tournament_entries(config, matches, roster))
+        for tid, matches, roster in chunk
+    ]
+
+
+def _chunks(items: List[TournamentFacts], workers: int) -> List[List[TournamentFacts]]:
+    # A few chunks per worker keeps the pool balanced and progress granular
+    size = max(1, math.ceil(len(items) / (workers * 4)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def iter_recalculate_ranking(
+    db: Session, ranking_id: int, max_workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Recalculate all tournaments of a ranking, yielding progress events.
+
+    Events are dicts with a ``stage`` key:
+    ``loaded`` (tournament count), ``computed`` (tournaments done / total,
+    emitted per finished chunk) and ``done`` (final totals).
+    Nothing is written until every tournament has been computed.
+    """
+    ranking = db.query(Ranking).filter(Ranking.id == ranking_id).first()
+    if not ranking:
+        raise ValueError("Ranking not found")
+    config = points_config(ranking)
+
+    versions = dict(
+        db.query(Tournament.id, Tournament.bracket_version)
+        .filter(Tournament.ranking_id == ranking_id)
+        .order_by(Tournament.id)
+        .all()
+    )
+    tournament_ids = list(versions)
+    loaded = load_bracket_facts_bulk(db, versions) if versions else {}
+    facts = [(tid, loaded[tid].matches, loaded[tid].roster) for tid in tournament_ids]
+    total = len(facts)
+    yield {"stage": "loaded", "tournaments": total}
+
+    results: Dict[int, List[Dict[str, Any]]] = {}
+    workers = max_workers or os.cpu_count() or 1
+
+    if total < PARALLEL_THRESHOLD or workers == 1:
+        for chunk in _chunks(facts, 1):
+            results.update(_compute_chunk(config, chunk))
+            yield {"stage": "computed", "done": len(results), "total": total}
+    else:
+        workers = min(workers, total)
+        pool = _process_pool()
+        futures = [pool.submit(_compute_chunk, config, chunk) for chunk in _chunks(facts, workers)]
+        try:
+            for future in as_completed(futures):
+                results.update(future.result())
+                yield {"stage": "computed", "done": len(results), "total": total}
+        except BrokenProcessPool:
+            # A worker died; the next batch starts a fresh pool
+            _discard_process_pool()
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+
+    entries = sum(len(results[tid]) for tid in tournament_ids)
+
+    # Single write transaction: apply only the changed entries and rebuild
+    # the standings
+    diff = diff_ranking_entries(
+        ranking_id, _stored_entries(db, ranking_id, tournament_ids) if tournament_ids else [],
+        {tid: results[tid] for tid in tournament_ids},
+    )
+    apply_entry_diff(db, diff)
+    _write_standings(db, ranking_id)
+    db.commit()
+
+    logger.info(
+        "Recalculated ranking %s: %d tournaments, %d entries, %d rows changed",
+        ranking_id, total, entries, diff.rows_changed,
+    )
+    yield {
+        "stage": "done",
+        "tournaments_processed": total,
+        "entries_created": entries,
+        "inserted": len(diff.inserts),
+        "updated": len(diff.updates),
+        "deleted": len(diff.deletes),
+        "rows_changed": diff.rows_changed,
+    }
+
+
+def recalculate_ranking(
+    db: Session, ranking_id: int, max_workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """Recalculate all tournaments of a ranking and return the final totals."""
+    summary: Dict[str, Any] = {}
+    for event in iter_recalculate_ranking(db, ranking_id, max_workers=max_workers):
+        summary = event
+    return {k: v for k, v in summary.items() if k != "stage"}
@@ -0,0 +1,232 @@
+"""
+Ranking history: standings at any point in time and per-player
+points-over-time series.
+
+Entries are ordered once by tournament date and turned into per-player
+prefix sums, so standings "as of" a date are a binary search per player
+instead of a re-aggregation of every entry.  The prefix sums are cached
+in-process per ranking and rebuilt when ``Ranking.entries_version`` moves.
+For rolling-window rankings the standings as of a date are the difference
+of two prefix sums (the window's end minus its start).  Best-N rankings
+total each player's slice through a bounded heap instead.
+"""
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Iterable
+
+from sqlalchemy.orm import Session
+
+from app.models.player import Player
+from app.models.ranking import Ranking, RankingEntry
+from app.models.tournament import Tournament
+from app.services.ranking_service import CountedResults, mark_counted, tournament_date
+
+# Maximum number of rankings whose history is kept in memory
+CACHE_SIZE = 64
+
+
+class _PlayerHistory:
+    """Prefix sums over one player's entries, in tournament order."""
+    __slots__ = ("player_id", "player_name", "positions", "entries", "cum_points", "best")
+
+    def __init__(self, player_id: int, player_name: str):
+        self.player_id = player_id
+        self.player_name = player_name
+        self.positions: List[int] = []      # index into RankingHistory.dates
+        self.entries: List[Dict[str, Any]] = []
+        self.cum_points: List[int] = []
+        self.best: List[Optional[int]] = []  # running best placement
+
+
+class RankingHistory:
+    def __init__(self, ranking_id: int, version: int):
+        self.ranking_id = ranking_id
+        self.version = version
+        self.dates: List[date] = []          # one per tournament, ascending
+        self.players: Dict[int, _PlayerHistory] = {}
+
+    def _count_at(self, as_of: Optional[date]) -> int:
+        """Number of tournaments on or before ``as_of``."""
+        if as_of is None:
+            return len(self.dates)
+        return bisect_right(self.dates, as_of)
+
+    def standings(
+        self, as_of: Optional[date] = None, window_days: Optional[int] = None,
+        best_n: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Standings counting only tournaments dated on or before ``as_of``
+        and, with ``window_days``, after ``as_of - window_days``.  With
+        ``best_n`` only each player's best N results in that range count.
+        """
+        cutoff = self._count_at(as_of)
+        start = 0
+        if window_days:
+            start = self._count_at((as_of or date.today()) - timedelta(days=window_days))
+        standings = []
+        for ph in self.players.values():
+            j = bisect_right(ph.positions, cutoff - 1)
+            i = bisect_right(ph.positions, start - 1)
+            if j <= i:
+                continue
+            if i == 0:
+                total, best = ph.cum_points[j - 1], ph.best[j - 1]
+            else:
+                total = ph.cum_points[j - 1] - ph.cum_points[i - 1]
+                placements = [e["placement"] for e in ph.entries[i:j] if e["placement"]]
+                best = min(placements) if placements else None
+            # Copies: the cached entries are shared between requests
+            results = mark_counted([dict(e) for e in ph.entries[i:j]], best_n)
+            if best_n:
+                counted = CountedResults(best_n)
+                for e in results:
+                    counted.push(e["points"])
+                total = counted.total
+            standings.append({
+                "player_id": ph.player_id,
+                "player_name": ph.player_name,
+                "total_points": total,
+                "tournaments_played": j - i,
+                "best_placement": best,
+                "tournament_results": results,
+            })
+        standings.sort(key=lambda x: (-x["total_points"], x["best_placement"] or 9999, x["player_id"]))
+        return standings
+
+    def series(
+        self, player_ids: Optional[Iterable[int]] = None, best_n: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Cumulative points after each tournament, per player."""
+        if player_ids is None:
+            selected = list(self.players.values())
+        else:
+            selected = [self.players[pid] for pid in player_ids if pid in self.players]
+        if best_n:
+            return [self._best_n_series(ph, best_n) for ph in selected]
+        return [
+            {
+                "player_id": ph.player_id,
+                "player_name": ph.player_name,
+                "points": [
+                    {
+                        "date": self.dates[pos],
+                        "tournament_id": e["tournament_id"],
+                        "tournament_name": e["tournament_name"],
+                        "points": e["points"],
+                        "total_points": total,
+                    }
+                    for pos, e, total in zip(ph.positions, ph.entries, ph.cum_points)
+                ],
+            }
+            for ph in selected
+        ]
+
+    def _best_n_series(self, ph: _PlayerHistory, best_n: int) -> Dict[str, Any]:
+        """Series of a best-N ranking: the running total of the best N results."""
+        counted = CountedResults(best_n)
+        points = []
+        for pos, e in zip(ph.positions, ph.entries):
+            counted.push(e["points"])
+            points.append({
+                "date": self.dates[pos],
+                "tournament_id": e["tournament_id"],
+                "tournament_name": e["tournament_name"],
+                "points": e["points"],
+                "total_points": counted.total,
+            })
+        return {"player_id": ph.player_id, "player_name": ph.player_name, "points": points}
+
+
+def _build_history(db: Session, ranking_id: int, version: int) -> RankingHistory:
+    rows = (
+        db.query(RankingEntry, Tournament.name, tournament_date(), Player.name)
+        .join(Tournament, Tournament.id == RankingEntry.tournament_id)
+        .outerjoin(Player, Player.id == RankingEntry.player_id)
+        .filter(RankingEntry.ranking_id == ranking_id)
+        .order_by(tournament_date(), RankingEntry.tournament_id, RankingEntry.id)
+        .all()
+    )
+
+    history = RankingHistory(ranking_id, version)
+    last_tournament = None
+    for e, tournament_name, t_date, player_name in rows:
+        if e.tournament_id != last_tournament:
+            if isinstance(t_date, str):
+                t_date = date.fromisoformat(t_date)
+            history.dates.append(t_date)
+            last_tournament = e.tournament_id
+        pos = len(history.dates) - 1
+
+        ph = history.players.get(e.player_id)
+        if ph is None:
+            ph = history.players[e.player_id] = _PlayerHistory(e.player_id, player_name or "Unknown")
+        prev_total = ph.cum_points[-1] if ph.cum_points else 0
+        prev_best = ph.best[-1] if ph.best else None
+
+        ph.positions.append(pos)
+        ph.entries.append({
+            "id": e.id,
+            "ranking_id": e.ranking_id,
+            "tournament_id": e.tournament_id,
+            "tournament_name": tournament_name or "Unknown",
+            "player_id": e.player_id,
+            "player_name": ph.player_name,
+            "placement": e.placement,
+            "points": e.points,
+        })
+        ph.cum_points.append(prev_total + (e.points or 0))
+        if e.placement and (prev_best is None or e.placement < prev_best):
+            ph.best.append(e.placement)
+        else:
+            ph.best.append(prev_best)
+
+    return history
+
+
+_cache: "OrderedDict[int, RankingHistory]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_ranking_history(db: Session, ranking_id: int) -> RankingHistory:
+    """Return the (cached) prefix-sum history of a ranking."""
+    version = (
+        db.query(Ranking.entries_version)
+        .filter(Ranking.id == ranking_id)
+        .scalar()
+    ) or 0
+    with _lock:
+        history = _cache.get(ranking_id)
+        if history is not None and history.version == version:
+            _cache.move_to_end(ranking_id)
+            return history
+
+    history = _build_history(db, ranking_id, version)
+    with _lock:
+        _cache[ranking_id] = history
+        _cache.move_to_end(ranking_id)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return history
+
+
+def get_ranking_standings_as_of(db: Session, ranking_id: int, as_of: date) -> List[Dict[str, Any]]:
+    """
+    Ranking standings counting only tournaments dated on or before ``as_of``
+    (and inside the rolling window ending at ``as_of``, if the ranking has one).
+    """
+    window_days, best_n = (
+        db.query(Ranking.window_days, Ranking.best_n).filter(Ranking.id == ranking_id).first()
+        or (None, None)
+    )
+    return get_ranking_history(db, ranking_id).standings(as_of, window_days, best_n)
+
+
+def get_ranking_points_series(
+    db: Session, ranking_id: int, player_ids: Optional[Iterable[int]] = None,
+) -> List[Dict[str, Any]]:
+    """Per-player cumulative points after each tournament of the ranking."""
+    best_n = db.query(Ranking.best_n).filter(Ranking.id == ranking_id).scalar()
+    return get_ranking_history(db, ranking_id).series(player_ids, best_n)
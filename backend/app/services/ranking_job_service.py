@@ -0,0 +1,224 @@
+"""
+Ranking jobs: automatic ranking recalculation off the request path.
+
+When a linked tournament finishes (or a finished bracket is corrected) the
+scoring request only records a job row in its own transaction.  After that
+transaction commits, the job is handed to a single in-process worker thread
+that runs recalculate_ranking_entries in its own session, so the score
+request never waits for the ranking.
+
+There is one job row per (ranking, tournament): triggers that arrive while
+the job is still queued coalesce into the next run, and a trigger that
+arrives while it is running makes the worker run it once more afterwards.
+Failures are kept on the job row (status ``failed`` plus the error) and
+logged.  Jobs left queued or running by a previous process are resumed by
+``resume_ranking_jobs`` at startup.
+"""
+import logging
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.ranking import RankingJob
+from app.models.tournament import Tournament
+from app.services.ranking_service import recalculate_ranking_entries
+
+logger = logging.getLogger(__name__)
+
+JobKey = Tuple[int, int]  # (ranking_id, tournament_id)
+
+_PENDING_KEY = "ranking_jobs_pending"
+
+
+class _Worker:
+    """Single background thread draining a de-duplicated queue of job keys."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._queue: deque = deque()
+        self._queued: set = set()
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, key: JobKey) -> None:
+        with self._cond:
+            if key in self._queued:
+                return
+            self._queued.add(key)
+            self._queue.append(key)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="ranking-jobs", daemon=True,
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue)
+                key = self._queue.popleft()
+                self._queued.discard(key)
+                self._busy = True
+            try:
+                run_ranking_job(*key)
+            except Exception:
+                logger.exception("Ranking job %s crashed", key)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+_worker = _Worker()
+
+
+def enqueue_ranking_job(db: Session, ranking_id: int, tournament_id: int) -> None:
+    """
+    Request a recalculation of one tournament's ranking entries.
+
+    Runs in the caller's transaction; the worker picks the job up only
+    after that transaction commits.
+    """
+    job = (
+        db.query(RankingJob)
+        .filter(RankingJob.ranking_id == ranking_id, RankingJob.tournament_id == tournament_id)
+        .first()
+    )
+    if job is None:
+        db.add(RankingJob(
+            ranking_id=ranking_id, tournament_id=tournament_id,
+            status="queued", generation=1, triggers=1, runs=0,
+        ))
+    else:
+        if job.status != "running":
+            job.status = "queued"
+        job.generation = RankingJob.generation + 1
+        job.triggers = RankingJob.triggers + 1
+        job.requested_at = func.now()
+    db.info.setdefault(_PENDING_KEY, set()).add((ranking_id, tournament_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    for key in pending or ():
+        _worker.submit(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def run_ranking_job(ranking_id: int, tournament_id: int) -> Optional[str]:
+    """
+    Run one queued job in a fresh session and record its outcome.
+    Returns the final status, or None when there was nothing to run.
+    """
+    db = SessionLocal()
+    try:
+        job = (
+            db.query(RankingJob)
+            .filter(RankingJob.ranking_id == ranking_id, RankingJob.tournament_id == tournament_id)
+            .first()
+        )
+        if job is None or job.status != "queued":
+            return None
+        job_id, generation = job.id, job.generation
+
+        tournament = db.get(Tournament, tournament_id)
+        if tournament is None:
+            db.delete(job)
+            db.commit()
+            return None
+
+        job.status = "running"
+        job.started_at = func.now()
+        db.commit()
+
+        status, error = "done", None
+        try:
+            # Skip tournaments that were unlinked from the ranking meanwhile
+            if tournament.ranking_id == ranking_id:
+                recalculate_ranking_entries(db, ranking_id, tournament_id)
+        except Exception as e:
+            db.rollback()
+            logger.exception("Ranking job %s (ranking %s, tournament %s) failed",
+                             job_id, ranking_id, tournament_id)
+            status, error = "failed", f"{type(e).__name__}: {e}"
+
+        finished = (
+            db.query(RankingJob)
+            .filter(RankingJob.id == job_id, RankingJob.generation == generation)
+            .update({
+                "status": status, "error": error,
+                "finished_at": func.now(), "runs": RankingJob.runs + 1,
+            }, synchronize_session=False)
+        )
+        if not finished:
+            # Triggered again while running: run once more with fresh data
+            db.query(RankingJob).filter(RankingJob.id == job_id).update({
+                "status": "queued", "error": error,
+                "finished_at": func.now(), "runs": RankingJob.runs + 1,
+            }, synchronize_session=False)
+            status = "queued"
+        db.commit()
+        if not finished:
+            _worker.submit((ranking_id, tournament_id))
+        return status
+    finally:
+        db.close()
+
+
+def retry_ranking_job(db: Session, job: RankingJob) -> None:
+    """Queue a failed (or finished) job again and commit."""
+    enqueue_ranking_job(db, job.ranking_id, job.tournament_id)
+    db.commit()
+
+
+def list_ranking_jobs(
+    db: Session, ranking_id: Optional[int] = None, status: Optional[str] = None,
+) -> List[RankingJob]:
+    query = db.query(RankingJob)
+    if ranking_id is not None:
+        query = query.filter(RankingJob.ranking_id == ranking_id)
+    if status is not None:
+        query = query.filter(RankingJob.status == status)
+    return query.order_by(RankingJob.requested_at.desc(), RankingJob.id.desc()).all()
+
+
+def resume_ranking_jobs() -> int:
+    """
+    Re-submit jobs a previous process left queued or running.
+    Returns the number of jobs resumed.
+    """
+    db = SessionLocal()
+    try:
+        db.query(RankingJob).filter(RankingJob.status == "running").update(
+            {"status": "queued"}, synchronize_session=False,
+        )
+        db.commit()
+        keys = (
+            db.query(RankingJob.ranking_id, RankingJob.tournament_id)
+            .filter(RankingJob.status == "queued")
+            .all()
+        )
+    finally:
+        db.close()
+    for key in keys:
+        _worker.submit(tuple(key))
+    return len(keys)
+
+
+def wait_for_ranking_jobs(timeout: Optional[float] = None) -> bool:
+    """Block until the worker is idle; False if the timeout expired first."""
+    return _worker.wait(timeout)
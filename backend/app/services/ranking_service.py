@@ -4,15 +4,39 @@ Ranking service: compute player rankings across multiple tournaments.
 Points are awarded based on final tournament placements (fixed mode)
 or bracket depth (flexible mode).
 Placements are determined from the bracket results (knockout stage).
+
+Bracket matches and rosters are read through the shared, version-cached
+bracket facts loader (bracket_facts_service).
+
+Per-player totals are materialized in RankingStanding and kept in step
+with RankingEntry by applying the difference between a tournament's old
+and new entries, so standings reads do not re-aggregate the ranking.
+
+Rankings with a rolling window only count results of tournaments dated
+after ``Ranking.window_cutoff``.  Moving the cutoff forward subtracts just
+the expiring tournaments' entries from the standings (sliding-window sums)
+rather than re-aggregating.
+
+Rankings with ``best_n`` only count each player's N highest results.  The
+counted set is a min-heap bounded to N points (CountedResults): a new
+result either fills the heap or displaces its smallest entry.
 """
-from typing import List, Dict, Any, Optional
+import heapq
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence, Tuple, NamedTuple
 
+from sqlalchemy import case, func, insert, select, update
 from sqlalchemy.orm import Session
 
-from app.models.ranking import Ranking, RankingEntry
+from app.models.ranking import Ranking, RankingEntry, RankingStanding
 from app.models.tournament import Tournament, TournamentStatus
-from app.models.tournament_models import BracketMatch, TournamentPlayer
 from app.models.player import Player
+from app.services.bracket_facts_service import MatchFacts, load_bracket_facts
+from app.services.public_cache_service import invalidate_ranking
+from app.services.rank_index_service import (
+    StandingChanges, get_rank_index, record_standing_changes,
+    encode_cursor, decode_cursor, standing_key,
+)
 
 
 def _get_points_for_placement(ranking: Ranking, placement: int) -> int:
@@ -30,6 +54,61 @@ def _get_points_for_placement(ranking: Ranking, placement: int) -> int:
     return mapping.get(placement, ranking.points_participation)
 
 
+class PointsConfig(NamedTuple):
+    """Picklable copy of a Ranking's points configuration."""
+    points_mode: str
+    winner_bracket_multiplier: int
+    loser_bracket_multiplier: int
+    flexible_base_winner: int
+    flexible_base_loser: int
+    points_first: int
+    points_second: int
+    points_third: int
+    points_fourth: int
+    points_fifth: int
+    points_sixth: int
+    points_seventh: int
+    points_eighth: int
+    points_participation: int
+
+
+def points_config(ranking: Ranking) -> PointsConfig:
+    """Snapshot a ranking's points configuration."""
+    return PointsConfig(*(getattr(ranking, f) for f in PointsConfig._fields))
+
+
+def _load_tournament_facts(
+    db: Session, tournament_id: int, version: Optional[int] = None,
+) -> Tuple[Tuple[MatchFacts, ...], Tuple[int, ...]]:
+    facts = load_bracket_facts(db, tournament_id, version)
+    return facts.matches, facts.roster
+
+
+def _bracket_wins(matches: Sequence[MatchFacts]) -> Dict[int, Tuple[int, int]]:
+    """player_id -> (winner bracket / grand final wins, loser bracket wins)."""
+    wins: Dict[int, Tuple[int, int]] = {}
+
+    for m in matches:
+        if m.played != 1 or not m.winner_id:
+            continue
+        wb, lb = wins.get(m.winner_id, (0, 0))
+        if m.bracket_type in ("winner", "grand_final"):
+            wins[m.winner_id] = (wb + 1, lb)
+        elif m.bracket_type == "loser":
+            wins[m.winner_id] = (wb, lb + 1)
+
+    return wins
+
+
+def _bracket_win_bonus(
+    matches: Sequence[MatchFacts], wb_mult: int, lb_mult: int,
+) -> Dict[int, int]:
+    return {
+        pid: wb * wb_mult + lb * lb_mult
+        for pid, (wb, lb) in _bracket_wins(matches).items()
+    }
+
+
 def compute_bracket_win_points(
     db: Session, tournament_id: int, ranking: Ranking,
 ) -> Dict[int, int]:
@@ -41,26 +120,24 @@ def compute_bracket_win_points(
 
     Returns dict of player_id -> bracket bonus points.
     """
-    bracket_matches = (
-        db.query(BracketMatch)
-        .filter(BracketMatch.tournament_id == tournament_id, BracketMatch.played == 1)
-        .all()
+    matches, _ = _load_tournament_facts(db, tournament_id)
+    return _bracket_win_bonus(
+        matches, ranking.winner_bracket_multiplier, ranking.loser_bracket_multiplier,
     )
 
-    wb_mult = ranking.winner_bracket_multiplier
-    lb_mult = ranking.loser_bracket_multiplier
-
-    player_bonus: Dict[int, int] = {}
 
-    for m in bracket_matches:
-        if not m.winner_id:
-            continue
-        if m.bracket_type in ("winner", "grand_final"):
-            player_bonus[m.winner_id] = player_bonus.get(m.winner_id, 0) + wb_mult
-        elif m.bracket_type == "loser":
-            player_bonus[m.winner_id] = player_bonus.get(m.winner_id, 0) + lb_mult
+def _bracket_types(matches: Sequence[MatchFacts]) -> Dict[int, str]:
+    player_types: Dict[int, str] = {}
+    for m in matches:
+        for pid in (m.player1_id, m.player2_id):
+            if pid is None:
+                continue
+            if m.bracket_type in ("winner", "grand_final"):
+                player_types[pid] = "winner"
+            elif pid not in player_types:
+                player_types[pid] = "loser"
 
-    return player_bonus
+    return player_types
 
 
 def _get_player_bracket_types(
@@ -74,49 +151,24 @@ def _get_player_bracket_types(
     Players only in loser bracket matches -> 'loser'.
     Players not in any bracket match -> 'loser' (fallback).
     """
-    bracket_matches = (
-        db.query(BracketMatch)
-        .filter(BracketMatch.tournament_id == tournament_id)
-        .all()
-    )
+    matches, _ = _load_tournament_facts(db, tournament_id)
+    return _bracket_types(matches)
 
-    player_types: Dict[int, str] = {}
-    for m in bracket_matches:
-        for pid in (m.player1_id, m.player2_id):
-            if pid is None:
-                continue
-            if m.bracket_type in ("winner", "grand_final"):
-                player_types[pid] = "winner"
-            elif pid not in player_types:
-                player_types[pid] = "loser"
 
-    return player_types
-
-
-def compute_flexible_points(
-    db: Session, tournament_id: int, ranking: Ranking,
+def _flexible_points(
+    matches: Sequence[MatchFacts], roster: Sequence[int], config: PointsConfig,
 ) -> List[Dict[str, Any]]:
-    """
-    Flexible mode: base points (different for winner/loser bracket) + bracket win bonus.
+    all_player_ids = set(roster)
 
-    Winner bracket players start with flexible_base_winner,
-    Loser bracket players start with flexible_base_loser,
-    then each earns additional points for bracket match wins.
-    """
-    tp_list = (
-        db.query(TournamentPlayer)
-        .filter(TournamentPlayer.tournament_id == tournament_id)
-        .all()
+    bracket_bonus = _bracket_win_bonus(
+        matches, config.winner_bracket_multiplier, config.loser_bracket_multiplier,
     )
-    all_player_ids = {tp.player_id for tp in tp_list}
-
-    bracket_bonus = compute_bracket_win_points(db, tournament_id, ranking)
-    player_brackets = _get_player_bracket_types(db, tournament_id)
+    player_brackets = _bracket_types(matches)
 
     result = []
     for pid in all_player_ids:
         bracket_type = player_brackets.get(pid, "loser")
-        base = ranking.flexible_base_winner if bracket_type == "winner" else ranking.flexible_base_loser
+        base = config.flexible_base_winner if bracket_type == "winner" else config.flexible_base_loser
         total = base + bracket_bonus.get(pid, 0)
         result.append({
             "player_id": pid,
@@ -125,58 +177,44 @@ def compute_flexible_points(
         })
 
     # Sort by points descending to derive placement
-    result.sort(key=lambda x: -x["points"])
+    result.sort(key=lambda x: (-x["points"], x["player_id"]))
     for i, r in enumerate(result):
         r["placement"] = i + 1
 
     return result
 
 
-def compute_tournament_placements(db: Session, tournament_id: int) -> List[Dict[str, Any]]:
+def compute_flexible_points(
+    db: Session, tournament_id: int, ranking: Ranking,
+) -> List[Dict[str, Any]]:
     """
-    Determine player placements from bracket results.
-
-    Returns a list of dicts: [{"player_id": int, "placement": int}, ...]
-    sorted by placement ascending.
+    Flexible mode: base points (different for winner/loser bracket) + bracket win bonus.
 
-    Placement logic:
-    - Grand final winner = 1st, loser = 2nd
-    - If no grand final, winner bracket final winner = 1st, loser = 2nd
-    - Players eliminated in earlier rounds get lower placements
-    - Players who only participated in pools get participation placement
+    Winner bracket players start with flexible_base_winner,
+    Loser bracket players start with flexible_base_loser,
+    then each earns additional points for bracket match wins.
     """
-    bracket_matches = (
-        db.query(BracketMatch)
-        .filter(BracketMatch.tournament_id == tournament_id)
-        .order_by(BracketMatch.bracket_type, BracketMatch.round_number.desc())
-        .all()
-    )
+    matches, roster = _load_tournament_facts(db, tournament_id)
+    return _flexible_points(matches, roster, points_config(ranking))
 
-    if not bracket_matches:
+
+def placements_from_facts(matches: Sequence[MatchFacts], roster: Sequence[int]) -> List[Dict[str, Any]]:
+    """Final placement of every roster player (None = participation) from a tournament's bracket facts."""
+    if not matches:
         # No bracket — give all tournament players participation placement
-        tp_list = (
-            db.query(TournamentPlayer)
-            .filter(TournamentPlayer.tournament_id == tournament_id)
-            .all()
-        )
-        return [{"player_id": tp.player_id, "placement": None} for tp in tp_list]
+        return [{"player_id": pid, "placement": None} for pid in roster]
 
     # Find all players in the tournament
-    tp_list = (
-        db.query(TournamentPlayer)
-        .filter(TournamentPlayer.tournament_id == tournament_id)
-        .all()
-    )
-    all_player_ids = {tp.player_id for tp in tp_list}
+    all_player_ids = set(roster)
 
     # Track placements: player_id -> placement
     placements: Dict[int, int] = {}
     placed_players = set()
 
     # Find the grand final first
-    grand_finals = [m for m in bracket_matches if m.bracket_type == "grand_final" and m.played == 1]
-    winner_matches = [m for m in bracket_matches if m.bracket_type == "winner"]
-    loser_matches = [m for m in bracket_matches if m.bracket_type == "loser"]
+    grand_finals = [m for m in matches if m.bracket_type == "grand_final" and m.played == 1]
+    winner_matches = [m for m in matches if m.bracket_type == "winner"]
+    loser_matches = [m for m in matches if m.bracket_type == "loser"]
 
     # Sort by round desc to process from final backwards
     winner_matches.sort(key=lambda m: -m.round_number)
@@ -197,7 +235,7 @@ def compute_tournament_placements(db: Session, tournament_id: int) -> List[Dict[
 
     # Process winner bracket from final backwards
     if winner_matches:
-        rounds_grouped: Dict[int, List[BracketMatch]] = {}
+        rounds_grouped: Dict[int, List[MatchFacts]] = {}
         for m in winner_matches:
             rounds_grouped.setdefault(m.round_number, []).append(m)
 
@@ -235,7 +273,7 @@ def compute_tournament_placements(db: Session, tournament_id: int) -> List[Dict[
 
     # Process loser bracket similarly
     if loser_matches:
-        rounds_grouped_lb: Dict[int, List[BracketMatch]] = {}
+        rounds_grouped_lb: Dict[int, List[MatchFacts]] = {}
         for m in loser_matches:
             rounds_grouped_lb.setdefault(m.round_number, []).append(m)
 
@@ -276,12 +314,565 @@ def compute_tournament_placements(db: Session, tournament_id: int) -> List[Dict[
     return result
 
 
+def compute_tournament_placements(db: Session, tournament_id: int) -> List[Dict[str, Any]]:
+    """
+    Determine player placements from bracket results.
+
+    Returns a list of dicts: [{"player_id": int, "placement": int}, ...]
+    sorted by placement ascending.
+
+    Placement logic:
+    - Grand final winner = 1st, loser = 2nd
+    - If no grand final, winner bracket final winner = 1st, loser = 2nd
+    - Players eliminated in earlier rounds get lower placements
+    - Players who only participated in pools get participation placement
+    """
+    matches, roster = _load_tournament_facts(db, tournament_id)
+    return placements_from_facts(matches, roster)
+
+
+def _entry_points(config: PointsConfig, entry: Dict[str, Any]) -> int:
+    """Points of one entry from its stored scoring facts."""
+    if config.points_mode == "flexible":
+        base = config.flexible_base_winner if entry["in_winner_bracket"] else config.flexible_base_loser
+        return (
+            base
+            + entry["winner_bracket_wins"] * config.winner_bracket_multiplier
+            + entry["loser_bracket_wins"] * config.loser_bracket_multiplier
+        )
+    if entry["bracket_placement"]:
+        return _get_points_for_placement(config, entry["bracket_placement"])
+    return config.points_participation
+
+
+def score_entries(config: PointsConfig, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Set ``points`` and ``placement`` of a tournament's entries from their
+    scoring facts.  Fixed mode uses the bracket placement; flexible mode
+    places players by points (ties by player id).
+    """
+    for e in entries:
+        e["points"] = _entry_points(config, e)
+    if config.points_mode == "flexible":
+        entries.sort(key=lambda e: (-e["points"], e["player_id"]))
+        for i, e in enumerate(entries):
+            e["placement"] = i + 1
+    else:
+        for e in entries:
+            e["placement"] = e["bracket_placement"]
+    return entries
+
+
+def compute_tournament_entries(
+    config: PointsConfig, matches: Sequence[MatchFacts], roster: Sequence[int],
+) -> List[Dict[str, Any]]:
+    """
+    Compute the ranking entries of one tournament from its bracket facts.
+
+    Pure function of its arguments, so it can run in a worker process.
+    Besides ``player_id``, ``placement`` and ``points`` each entry carries
+    the facts points are derived from (bracket placement, winner bracket
+    membership and bracket win counts), so a change of the ranking's
+    points configuration can re-score stored entries without the bracket.
+    """
+    wins = _bracket_wins(matches)
+    bracket_types = _bracket_types(matches)
+    entries = []
+    for p in placements_from_facts(matches, roster):
+        pid = p["player_id"]
+        wb_wins, lb_wins = wins.get(pid, (0, 0))
+        entries.append({
+            "player_id": pid,
+            "bracket_placement": p["placement"],
+            "in_winner_bracket": bracket_types.get(pid) == "winner",
+            "winner_bracket_wins": wb_wins,
+            "loser_bracket_wins": lb_wins,
+        })
+    return score_entries(config, entries)
+
+
+def rescore_ranking_entries(db: Session, ranking: Ranking) -> Optional[int]:
+    """
+    Re-score every entry of a ranking after its points configuration changed.
+
+    Points (and flexible-mode placements) are recomputed from the scoring
+    facts stored on each entry by a single UPDATE ... FROM, and the
+    standings are rebuilt; nothing is re-derived from the bracket.  Does
+    not commit.  Returns the number of entries updated, or None when the
+    ranking has legacy entries without scoring facts, which need a full
+    recalculation instead.
+    """
+    legacy = (
+        db.query(RankingEntry.id)
+        .filter(RankingEntry.ranking_id == ranking.id, RankingEntry.in_winner_bracket.is_(None))
+        .first()
+    )
+    if legacy:
+        return None
+
+    config = points_config(ranking)
+    if config.points_mode == "flexible":
+        points = (
+            case(
+                (RankingEntry.in_winner_bracket, config.flexible_base_winner),
+                else_=config.flexible_base_loser,
+            )
+            + RankingEntry.winner_bracket_wins * config.winner_bracket_multiplier
+            + RankingEntry.loser_bracket_wins * config.loser_bracket_multiplier
+        )
+    else:
+        points = case(
+            {p: _get_points_for_placement(config, p) for p in range(1, 9)},
+            value=RankingEntry.bracket_placement,
+            else_=config.points_participation,
+        )
+
+    scored = (
+        select(
+            RankingEntry.id.label("entry_id"),
+            points.label("points"),
+            func.row_number().over(
+                partition_by=RankingEntry.tournament_id,
+                order_by=(points.desc(), RankingEntry.player_id),
+            ).label("rank"),
+        )
+        .where(RankingEntry.ranking_id == ranking.id)
+        .subquery()
+    )
+    placement = scored.c.rank if config.points_mode == "flexible" else RankingEntry.bracket_placement
+    result = db.execute(
+        update(RankingEntry)
+        .where(RankingEntry.id == scored.c.entry_id)
+        .values(points=scored.c.points, placement=placement)
+        .execution_options(synchronize_session=False)
+    )
+    _write_standings(db, ranking.id)
+    return result.rowcount
+
+
+# (player_id, points, placement) of a single ranking entry
+EntryFacts = Tuple[int, int, Optional[int]]
+
+
+# ── Best-N results ──
+class CountedResults:
+    """
+    The points a player's standing counts when only the best ``limit``
+    results count (all of them when ``limit`` is None).
+
+    Kept as a min-heap bounded to ``limit`` entries, so adding a result is
+    O(log N): it fills the heap or replaces the smallest counted result.
+    """
+    __slots__ = ("limit", "heap", "total")
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.heap: List[int] = []
+        self.total = 0
+
+    def push(self, points: Optional[int]) -> int:
+        """Add one result; returns the change of the counted total."""
+        points = points or 0
+        if self.limit is None or len(self.heap) < self.limit:
+            heapq.heappush(self.heap, points)
+            change = points
+        elif points > self.heap[0]:
+            change = points - heapq.heapreplace(self.heap, points)
+        else:
+            change = 0
+        self.total += change
+        return change
+
+
+def _best_n(db: Session, ranking_id: int) -> Optional[int]:
+    return db.query(Ranking.best_n).filter(Ranking.id == ranking_id).scalar()
+
+
+def mark_counted(results: List[Dict[str, Any]], best_n: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    Set ``counted`` on a player's results: the ``best_n`` highest points
+    count (ties go to the earlier tournament), the rest are dropped.
+    """
+    if not best_n:
+        counted = range(len(results))
+    else:
+        order = sorted(
+            range(len(results)),
+            key=lambda i: (-(results[i]["points"] or 0), results[i]["tournament_id"]),
+        )
+        counted = order[:best_n]
+    counted = set(counted)
+    for i, r in enumerate(results):
+        r["counted"] = i in counted
+    return results
+
+
+def _counted_totals(
+    db: Session, ranking_id: int, player_ids: Optional[Sequence[int]],
+    cutoff: Optional[date], best_n: Optional[int],
+) -> Dict[int, int]:
+    """Counted total per player, from the entries inside the window."""
+    query = (
+        db.query(RankingEntry.player_id, RankingEntry.points)
+        .outerjoin(Tournament, Tournament.id == RankingEntry.tournament_id)
+        .filter(RankingEntry.ranking_id == ranking_id)
+    )
+    if player_ids is not None:
+        query = query.filter(RankingEntry.player_id.in_(player_ids))
+    counted: Dict[int, CountedResults] = {}
+    for pid, points in _in_window(query, cutoff):
+        results = counted.get(pid)
+        if results is None:
+            results = counted[pid] = CountedResults(best_n)
+        results.push(points)
+    return {pid: results.total for pid, results in counted.items()}
+
+
+def set_ranking_best_n(db: Session, ranking: Ranking) -> None:
+    """Apply a changed ``ranking.best_n`` by rewriting the standings.  Does not commit."""
+    db.flush()
+    _write_standings(db, ranking.id)
+
+
+# ── Rolling window ──
+def tournament_date():
+    """Date a tournament's results count on: its start date, or the day it was created."""
+    return func.coalesce(Tournament.start_date, func.date(Tournament.created_at))
+
+
+def window_cutoff_for(window_days: Optional[int], today: Optional[date] = None) -> Optional[date]:
+    """Cutoff of a rolling window: results dated on or before it no longer count."""
+    if not window_days:
+        return None
+    return (today or date.today()) - timedelta(days=window_days)
+
+
+def _window_cutoff(db: Session, ranking_id: int) -> Optional[date]:
+    return db.query(Ranking.window_cutoff).filter(Ranking.id == ranking_id).scalar()
+
+
+def _in_window(query, cutoff: Optional[date]):
+    """Restrict a query joined to Tournament to results inside the window."""
+    if cutoff is None:
+        return query
+    return query.filter(tournament_date() > cutoff)
+
+
+def tournament_counts(db: Session, ranking_id: int, tournament_id: int) -> bool:
+    """Whether a tournament's results currently count in the ranking's standings."""
+    cutoff = _window_cutoff(db, ranking_id)
+    if cutoff is None:
+        return True
+    query = db.query(Tournament.id).filter(Tournament.id == tournament_id)
+    return _in_window(query, cutoff).first() is not None
+
+
+def _tournament_facts(db: Session, ranking_id: int, tournament_ids: Sequence[int]) -> List[EntryFacts]:
+    return [
+        tuple(e) for e in
+        db.query(RankingEntry.player_id, RankingEntry.points, RankingEntry.placement)
+        .filter(
+            RankingEntry.ranking_id == ranking_id,
+            RankingEntry.tournament_id.in_(tournament_ids),
+        )
+    ]
+
+
+def set_ranking_window(db: Session, ranking: Ranking, today: Optional[date] = None) -> None:
+    """
+    Apply a changed ``ranking.window_days``: set the cutoff and rewrite the
+    standings from the entries inside the new window.  Does not commit.
+    """
+    ranking.window_cutoff = window_cutoff_for(ranking.window_days, today)
+    db.flush()
+    _write_standings(db, ranking.id)
+
+
+def roll_ranking_window(db: Session, ranking: Ranking, today: Optional[date] = None) -> int:
+    """
+    Move a rolling window forward to ``today``: subtract the entries of the
+    tournaments that left the window from the standings.  Costs one lookup
+    of the ranking's tournaments plus the expiring entries.  Does not
+    commit; returns the number of entries expired.
+    """
+    new_cutoff = window_cutoff_for(ranking.window_days, today)
+    old_cutoff = ranking.window_cutoff
+    if new_cutoff is None or (old_cutoff is not None and new_cutoff <= old_cutoff):
+        return 0
+    if old_cutoff is None:
+        set_ranking_window(db, ranking, today)
+        return 0
+
+    expiring = [
+        tid for (tid,) in
+        db.query(Tournament.id).filter(
+            Tournament.ranking_id == ranking.id,
+            tournament_date() > old_cutoff,
+            tournament_date() <= new_cutoff,
+        )
+    ]
+    ranking.window_cutoff = new_cutoff
+    db.flush()
+    removed = _tournament_facts(db, ranking.id, expiring) if expiring else []
+    if removed:
+        _apply_standings_delta(db, ranking.id, removed=removed, added=[])
+    return len(removed)
+
+
+def move_tournament_date(
+    db: Session, ranking_id: int, tournament_id: int, counted_before: bool,
+) -> None:
+    """
+    Follow a tournament date change: add or subtract its entries when the
+    change moved it into or out of the ranking's window.  Call after the
+    new date has been flushed; does not commit.
+    """
+    counted_now = tournament_counts(db, ranking_id, tournament_id)
+    if counted_now == counted_before:
+        bump_entries_version(db, ranking_id)
+        return
+    facts = _tournament_facts(db, ranking_id, [tournament_id])
+    if not facts:
+        bump_entries_version(db, ranking_id)
+        return
+    if counted_now:
+        _apply_standings_delta(db, ranking_id, removed=[], added=facts)
+    else:
+        _apply_standings_delta(db, ranking_id, removed=facts, added=[])
+
+
+def bump_entries_version(
+    db: Session, ranking_id: int,
+    standing_changes: Optional[StandingChanges] = None, rebuilt: bool = False,
+) -> int:
+    """
+    Mark a ranking's entries as changed; runs in the caller's transaction.
+
+    ``standing_changes`` (or ``rebuilt`` for a wholesale rewrite) is handed
+    to the rank index, which applies it once the transaction commits.
+    Returns the new version.
+    """
+    db.query(Ranking).filter(Ranking.id == ranking_id).update(
+        {Ranking.entries_version: Ranking.entries_version + 1},
+        synchronize_session=False,
+    )
+    version = db.query(Ranking.entries_version).filter(Ranking.id == ranking_id).scalar()
+    record_standing_changes(db, ranking_id, version, None if rebuilt else (standing_changes or {}))
+    invalidate_ranking(db, ranking_id)
+    return version
+
+
+def _apply_standings_delta(
+    db: Session,
+    ranking_id: int,
+    removed: Iterable[EntryFacts],
+    added: Iterable[EntryFacts],
+) -> None:
+    """
+    Update the materialized standings of a ranking by subtracting the
+    removed entries and adding the new ones.
+
+    Totals and tournament counts are adjusted in place.  The best placement
+    only needs a lookup when a removed entry held a player's best placement;
+    that lookup is a grouped MIN over the remaining entries of just those
+    players.  Must be called after the entry changes have been flushed and
+    runs inside the caller's transaction.
+    """
+    delta: Dict[int, Dict[str, Any]] = {}
+
+    def _slot(pid: int) -> Dict[str, Any]:
+        return delta.setdefault(pid, {"points": 0, "played": 0, "removed": set(), "added": set()})
+
+    for pid, points, placement in removed:
+        d = _slot(pid)
+        d["points"] -= points or 0
+        d["played"] -= 1
+        if placement:
+            d["removed"].add(placement)
+    for pid, points, placement in added:
+        d = _slot(pid)
+        d["points"] += points or 0
+        d["played"] += 1
+        if placement:
+            d["added"].add(placement)
+
+    if not delta:
+        return
+
+    changes: StandingChanges = {}
+    rows = {
+        s.player_id: s
+        for s in db.query(RankingStanding).filter(
+            RankingStanding.ranking_id == ranking_id,
+            RankingStanding.player_id.in_(delta.keys()),
+        )
+    }
+
+    cutoff = _window_cutoff(db, ranking_id)
+    needs_best_lookup: List[int] = []
+    for pid, d in delta.items():
+        row = rows.get(pid)
+        if row is None:
+            if d["played"] <= 0:
+                continue
+            row = RankingStanding(
+                ranking_id=ranking_id, player_id=pid,
+                total_points=0, tournaments_played=0, best_placement=None,
+            )
+            db.add(row)
+            rows[pid] = row
+
+        row.total_points += d["points"]
+        row.tournaments_played += d["played"]
+
+        if row.tournaments_played <= 0:
+            db.delete(row)
+            changes[pid] = None
+            continue
+
+        if row.best_placement is not None and row.best_placement in d["removed"]:
+            needs_best_lookup.append(pid)
+        elif d["added"]:
+            best_added = min(d["added"])
+            if row.best_placement is None or best_added < row.best_placement:
+                row.best_placement = best_added
+
+    if needs_best_lookup:
+        query = (
+            db.query(RankingEntry.player_id, func.min(RankingEntry.placement))
+            .outerjoin(Tournament, Tournament.id == RankingEntry.tournament_id)
+            .filter(
+                RankingEntry.ranking_id == ranking_id,
+                RankingEntry.player_id.in_(needs_best_lookup),
+            )
+        )
+        best = dict(_in_window(query, cutoff).group_by(RankingEntry.player_id).all())
+        for pid in needs_best_lookup:
+            rows[pid].best_placement = best.get(pid)
+
+    best_n = _best_n(db, ranking_id)
+    if best_n:
+        # Only the best N results count: re-total the affected players
+        kept = [pid for pid in rows if pid not in changes]
+        for pid, total in _counted_totals(db, ranking_id, kept, cutoff, best_n).items():
+            rows[pid].total_points = total
+
+    for pid, row in rows.items():
+        if pid not in changes:
+            changes[pid] = (row.total_points, row.best_placement)
+    bump_entries_version(db, ranking_id, changes)
+    db.flush()
+
+
+# Entry ids per DELETE statement when applying a diff
+DELETE_CHUNK = 500
+
+# Columns of a RankingEntry written by a recalculation
+ENTRY_FIELDS = (
+    "placement", "points", "bracket_placement", "in_winner_bracket",
+    "winner_bracket_wins", "loser_bracket_wins",
+)
+
+
+class EntryDiff(NamedTuple):
+    """Row changes that turn the stored entries into freshly computed ones."""
+    inserts: List[Dict[str, Any]]
+    updates: List[Dict[str, Any]]   # {"id": ..., <changed entry fields>}
+    deletes: List[int]
+    removed: List[EntryFacts]       # standings facts that went away ...
+    added: List[EntryFacts]         # ... and their replacements
+    unchanged: int
+
+    @property
+    def rows_changed(self) -> int:
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+
+def diff_ranking_entries(
+    ranking_id: int, existing: Iterable[Any], computed: Dict[int, List[Dict[str, Any]]],
+) -> EntryDiff:
+    """
+    Compare stored entries (rows with ``id``, ``tournament_id``,
+    ``player_id`` and the entry fields) with computed entries per
+    tournament.  Only rows whose fields differ are updated; standings facts
+    are reported only when points or placement changed.
+    """
+    stored: Dict[Tuple[int, int], Any] = {}
+    deletes: List[int] = []
+    removed: List[EntryFacts] = []
+    for row in existing:
+        key = (row.tournament_id, row.player_id)
+        if key in stored:
+            # Duplicate left over from before the unique constraint
+            deletes.append(row.id)
+            removed.append((row.player_id, row.points, row.placement))
+        else:
+            stored[key] = row
+
+    inserts: List[Dict[str, Any]] = []
+    updates: List[Dict[str, Any]] = []
+    added: List[EntryFacts] = []
+    unchanged = 0
+    for tid, entries in computed.items():
+        for e in entries:
+            row = stored.pop((tid, e["player_id"]), None)
+            if row is None:
+                inserts.append({"ranking_id": ranking_id, "tournament_id": tid, **e})
+                added.append((e["player_id"], e["points"], e["placement"]))
+                continue
+            changed = {f: e[f] for f in ENTRY_FIELDS if getattr(row, f) != e[f]}
+            if not changed:
+                unchanged += 1
+                continue
+            updates.append({"id": row.id, **changed})
+            if "points" in changed or "placement" in changed:
+                removed.append((row.player_id, row.points, row.placement))
+                added.append((e["player_id"], e["points"], e["placement"]))
+
+    for row in stored.values():
+        deletes.append(row.id)
+        removed.append((row.player_id, row.points, row.placement))
+    return EntryDiff(inserts, updates, deletes, removed, added, unchanged)
+
+
+def apply_entry_diff(db: Session, diff: EntryDiff) -> None:
+    """Write an entry diff with bulk statements; does not touch the standings."""
+    if diff.deletes:
+        for i in range(0, len(diff.deletes), DELETE_CHUNK):
+            db.query(RankingEntry).filter(
+                RankingEntry.id.in_(diff.deletes[i:i + DELETE_CHUNK])
+            ).delete(synchronize_session=False)
+    if diff.updates:
+        db.execute(update(RankingEntry), diff.updates)
+    if diff.inserts:
+        db.execute(insert(RankingEntry), diff.inserts)
+    db.flush()
+
+
+def _stored_entries(db: Session, ranking_id: int, tournament_ids: Sequence[int]):
+    return (
+        db.query(
+            RankingEntry.id, RankingEntry.tournament_id, RankingEntry.player_id,
+            *(getattr(RankingEntry, f) for f in ENTRY_FIELDS),
+        )
+        .filter(
+            RankingEntry.ranking_id == ranking_id,
+            RankingEntry.tournament_id.in_(tournament_ids),
+        )
+        .order_by(RankingEntry.id)
+        .all()
+    )
+
+
 def recalculate_ranking_entries(
     db: Session, ranking_id: int, tournament_id: int
-) -> List[RankingEntry]:
+) -> Dict[str, int]:
     """
     Recalculate ranking entries for a specific tournament within a ranking.
-    Deletes existing entries for tournament and recreates them.
+
+    The fresh entries are diffed against the stored ones and only the rows
+    that differ are inserted, updated or deleted, so unchanged entries keep
+    their ids.  Returns the entry count and the number of rows changed.
     """
     ranking = db.query(Ranking).filter(Ranking.id == ranking_id).first()
     if not ranking:
@@ -291,45 +882,60 @@ def recalculate_ranking_entries(
     if not tournament or tournament.ranking_id != ranking_id:
         raise ValueError("Tournament not found or not assigned to this ranking")
 
-    # Delete existing entries for this tournament in this ranking
+    matches, roster = _load_tournament_facts(db, tournament_id, tournament.bracket_version)
+    computed = compute_tournament_entries(points_config(ranking), matches, roster)
+    diff = diff_ranking_entries(
+        ranking_id, _stored_entries(db, ranking_id, [tournament_id]), {tournament_id: computed},
+    )
+
+    apply_entry_diff(db, diff)
+    if not tournament_counts(db, ranking_id, tournament_id):
+        # Outside the rolling window: the standings are not affected
+        if diff.rows_changed:
+            bump_entries_version(db, ranking_id)
+    elif diff.removed or diff.added:
+        _apply_standings_delta(db, ranking_id, removed=diff.removed, added=diff.added)
+
+    db.commit()
+    return {
+        "entries_created": len(computed),
+        "inserted": len(diff.inserts),
+        "updated": len(diff.updates),
+        "deleted": len(diff.deletes),
+        "rows_changed": diff.rows_changed,
+    }
+
+
+def remove_tournament_entries(db: Session, ranking_id: int, tournament_id: int) -> int:
+    """
+    Remove a tournament's entries from a ranking and subtract them from the
+    standings.  Does not commit; returns the number of entries removed.
+    """
+    old_entries = (
+        db.query(RankingEntry.player_id, RankingEntry.points, RankingEntry.placement)
+        .filter(
+            RankingEntry.ranking_id == ranking_id,
+            RankingEntry.tournament_id == tournament_id,
+        )
+        .all()
+    )
+    if not old_entries:
+        return 0
+    counted = tournament_counts(db, ranking_id, tournament_id)
     db.query(RankingEntry).filter(
         RankingEntry.ranking_id == ranking_id,
         RankingEntry.tournament_id == tournament_id,
     ).delete()
     db.flush()
-
-    entries = []
-
-    if ranking.points_mode == "flexible":
-        # Flexible mode: points from bracket depth
-        flex_results = compute_flexible_points(db, tournament_id, ranking)
-        for p in flex_results:
-            entry = RankingEntry(
-                ranking_id=ranking_id,
-                tournament_id=tournament_id,
-                player_id=p["player_id"],
-                placement=p["placement"],
-                points=p["points"],
-            )
-            db.add(entry)
-            entries.append(entry)
+    if counted:
+        _apply_standings_delta(db, ranking_id, removed=[tuple(e) for e in old_entries], added=[])
     else:
-        # Fixed mode: placement points only (no bracket win bonus)
-        placements = compute_tournament_placements(db, tournament_id)
-        for p in placements:
-            pts = _get_points_for_placement(ranking, p["placement"]) if p["placement"] else ranking.points_participation
-            entry = RankingEntry(
-                ranking_id=ranking_id,
-                tournament_id=tournament_id,
-                player_id=p["player_id"],
-                placement=p["placement"],
-                points=pts,
-            )
-            db.add(entry)
-            entries.append(entry)
+        bump_entries_version(db, ranking_id)
+    return len(old_entries)
 
-    db.commit()
-    return entries
+
+# Players fetched per query while streaming standings
+STANDINGS_CHUNK = 500
 
 
 def get_ranking_standings(db: Session, ranking_id: int) -> List[Dict[str, Any]]:
@@ -337,45 +943,269 @@ def get_ranking_standings(db: Session, ranking_id: int) -> List[Dict[str, Any]]:
     Get aggregated ranking standings across all tournaments for a ranking.
     Returns sorted list of players with total points.
     """
-    entries = (
-        db.query(RankingEntry)
-        .filter(RankingEntry.ranking_id == ranking_id)
-        .all()
-    )
+    keys, _ = get_ranking_standings_page(db, ranking_id)
+    return list(iter_ranking_standings(db, ranking_id, keys, include_results=True))
 
-    # Aggregate by player
-    player_data: Dict[int, Dict[str, Any]] = {}
-    for e in entries:
-        if e.player_id not in player_data:
-            player = db.query(Player).filter(Player.id == e.player_id).first()
-            player_data[e.player_id] = {
-                "player_id": e.player_id,
-                "player_name": player.name if player else "Unknown",
-                "total_points": 0,
-                "tournaments_played": 0,
-                "best_placement": None,
-                "tournament_results": [],
+
+def get_ranking_standings_page(
+    db: Session, ranking_id: int,
+    limit: Optional[int] = None, after: Optional[str] = None,
+) -> Tuple[List[Tuple[int, int, int]], Optional[str]]:
+    """
+    Select one keyset page of the standings, ordered by total points desc,
+    best placement asc, player id asc.
+
+    The page is a slice of the ranking's rank index, so the top K never
+    requires sorting the whole population.  Returns the index keys of the
+    page and the cursor of the next page (None on the last page).
+    Raises ValueError for a malformed cursor.
+    """
+    after_key = decode_cursor(after) if after else None
+    keys, next_key = get_rank_index(db, ranking_id).page(after_key, limit)
+    return keys, encode_cursor(next_key) if next_key else None
+
+
+def iter_ranking_standings(
+    db: Session, ranking_id: int, keys: List[Tuple[int, int, int]],
+    include_results: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield standings rows for the given index keys, in order.
+
+    Totals come from the materialized RankingStanding rows, fetched with
+    player names in chunks; the per-tournament breakdown is only loaded
+    when ``include_results`` is set.
+    """
+    cutoff = _window_cutoff(db, ranking_id) if include_results else None
+    best_n = _best_n(db, ranking_id) if include_results else None
+    for start in range(0, len(keys), STANDINGS_CHUNK):
+        chunk = [k[2] for k in keys[start:start + STANDINGS_CHUNK]]
+        rows = {
+            st.player_id: (st, player_name)
+            for st, player_name in (
+                db.query(RankingStanding, Player.name)
+                .outerjoin(Player, Player.id == RankingStanding.player_id)
+                .filter(
+                    RankingStanding.ranking_id == ranking_id,
+                    RankingStanding.player_id.in_(chunk),
+                )
+            )
+        }
+
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        if include_results:
+            query = (
+                db.query(RankingEntry, Tournament.name)
+                .outerjoin(Tournament, Tournament.id == RankingEntry.tournament_id)
+                .filter(
+                    RankingEntry.ranking_id == ranking_id,
+                    RankingEntry.player_id.in_(chunk),
+                )
+            )
+            for e, tournament_name in _in_window(query, cutoff).order_by(RankingEntry.id):
+                results.setdefault(e.player_id, []).append({
+                    "id": e.id,
+                    "ranking_id": e.ranking_id,
+                    "tournament_id": e.tournament_id,
+                    "tournament_name": tournament_name or "Unknown",
+                    "player_id": e.player_id,
+                    "player_name": None,
+                    "placement": e.placement,
+                    "points": e.points,
+                })
+
+        for pid in chunk:
+            if pid not in rows:
+                continue  # removed since the page was selected
+            st, player_name = rows[pid]
+            player_name = player_name or "Unknown"
+            tournament_results = mark_counted(results.get(pid, []), best_n)
+            for r in tournament_results:
+                r["player_name"] = player_name
+            yield {
+                "player_id": pid,
+                "player_name": player_name,
+                "total_points": st.total_points,
+                "tournaments_played": st.tournaments_played,
+                "best_placement": st.best_placement,
+                "tournament_results": tournament_results,
             }
 
-        pd = player_data[e.player_id]
-        pd["total_points"] += e.points
-        pd["tournaments_played"] += 1
-        if e.placement:
-            if pd["best_placement"] is None or e.placement < pd["best_placement"]:
-                pd["best_placement"] = e.placement
 
-        tournament = db.query(Tournament).filter(Tournament.id == e.tournament_id).first()
-        pd["tournament_results"].append({
+def paginate_standings(
+    standings: List[Dict[str, Any]],
+    limit: Optional[int] = None, after: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Apply the same keyset pagination to an already sorted standings list."""
+    if after:
+        after_key = decode_cursor(after)
+        standings = [s for s in standings if standing_key(s) > after_key]
+    if limit is None or len(standings) <= limit:
+        return standings, None
+    page = standings[:limit]
+    return page, encode_cursor(standing_key(page[-1]))
+
+
+def get_player_ranking_position(
+    db: Session, ranking_id: int, player_id: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Rank, points, gaps to the neighbouring players and tournament breakdown
+    of one player, looked up in the ranking's rank index.
+
+    Returns None when the player has no entries in the ranking.
+    """
+    position = get_rank_index(db, ranking_id).position(player_id)
+    if position is None:
+        return None
+
+    standing = (
+        db.query(RankingStanding)
+        .filter(RankingStanding.ranking_id == ranking_id, RankingStanding.player_id == player_id)
+        .first()
+    )
+    if standing is None:
+        return None
+
+    above, below = position["above"], position["below"]
+    names = dict(
+        db.query(Player.id, Player.name)
+        .filter(Player.id.in_([p["player_id"] for p in (above, below) if p] + [player_id]))
+        .all()
+    )
+    player_name = names.get(player_id, "Unknown")
+    for neighbour in (above, below):
+        if neighbour:
+            neighbour["player_name"] = names.get(neighbour["player_id"], "Unknown")
+            neighbour["points_gap"] = abs(neighbour["total_points"] - standing.total_points)
+
+    query = (
+        db.query(RankingEntry, Tournament.name)
+        .outerjoin(Tournament, Tournament.id == RankingEntry.tournament_id)
+        .filter(RankingEntry.ranking_id == ranking_id, RankingEntry.player_id == player_id)
+    )
+    results = _in_window(query, _window_cutoff(db, ranking_id)).order_by(RankingEntry.id).all()
+    tournament_results = mark_counted([
+        {
             "id": e.id,
             "ranking_id": e.ranking_id,
             "tournament_id": e.tournament_id,
-            "tournament_name": tournament.name if tournament else "Unknown",
+            "tournament_name": tournament_name or "Unknown",
             "player_id": e.player_id,
-            "player_name": pd["player_name"],
+            "player_name": player_name,
             "placement": e.placement,
             "points": e.points,
-        })
+        }
+        for e, tournament_name in results
+    ], _best_n(db, ranking_id))
+    return {
+        "player_id": player_id,
+        "player_name": player_name,
+        "rank": position["rank"],
+        "players_ranked": position["players_ranked"],
+        "total_points": standing.total_points,
+        "tournaments_played": standing.tournaments_played,
+        "best_placement": standing.best_placement,
+        "above": above,
+        "below": below,
+        "tournament_results": tournament_results,
+    }
 
-    standings = list(player_data.values())
-    standings.sort(key=lambda x: (-x["total_points"], x["best_placement"] or 9999))
+
+def _compute_standings_from_entries(db: Session, ranking_id: int) -> Dict[int, Tuple[int, int, Optional[int]]]:
+    """
+    Full recomputation: player_id -> (total_points, tournaments_played,
+    best_placement).  With ``best_n`` the total counts only the best N
+    results; tournaments played and best placement cover all of them.
+    """
+    query = (
+        db.query(
+            RankingEntry.player_id,
+            func.coalesce(func.sum(RankingEntry.points), 0),
+            func.count(RankingEntry.id),
+            func.min(RankingEntry.placement),
+        )
+        .outerjoin(Tournament, Tournament.id == RankingEntry.tournament_id)
+        .filter(RankingEntry.ranking_id == ranking_id)
+    )
+    cutoff = _window_cutoff(db, ranking_id)
+    rows = _in_window(query, cutoff).group_by(RankingEntry.player_id).all()
+    standings = {pid: (int(total), int(played), best) for pid, total, played, best in rows}
+    best_n = _best_n(db, ranking_id)
+    if best_n:
+        for pid, total in _counted_totals(db, ranking_id, None, cutoff, best_n).items():
+            _, played, best = standings[pid]
+            standings[pid] = (total, played, best)
     return standings
+
+
+def verify_ranking_standings(db: Session, ranking_id: int) -> List[Dict[str, Any]]:
+    """
+    Compare the materialized standings of a ranking against a full
+    recomputation from its entries.
+
+    Returns a list of mismatches (empty when the table is consistent).
+    """
+    expected = _compute_standings_from_entries(db, ranking_id)
+    actual = {
+        s.player_id: (s.total_points, s.tournaments_played, s.best_placement)
+        for s in db.query(RankingStanding).filter(RankingStanding.ranking_id == ranking_id)
+    }
+
+    mismatches = []
+    for pid in sorted(set(expected) | set(actual)):
+        if expected.get(pid) != actual.get(pid):
+            mismatches.append({
+                "player_id": pid,
+                "expected": expected.get(pid),
+                "actual": actual.get(pid),
+            })
+    return mismatches
+
+
+def backfill_ranking_standings() -> int:
+    """
+    Build standings for rankings that have entries but no materialized rows.
+    Returns the number of rankings rebuilt.
+    """
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with_entries = {rid for (rid,) in db.query(RankingEntry.ranking_id).distinct()}
+        with_standings = {rid for (rid,) in db.query(RankingStanding.ranking_id).distinct()}
+        missing = sorted(with_entries - with_standings)
+        for rid in missing:
+            rebuild_ranking_standings(db, rid)
+        return len(missing)
+    finally:
+        db.close()
+
+
+def rebuild_ranking_standings(db: Session, ranking_id: int) -> int:
+    """
+    Rebuild the materialized standings of a ranking from its entries.
+    Returns the number of standing rows written.
+    """
+    written = _write_standings(db, ranking_id)
+    db.commit()
+    return written
+
+
+def _write_standings(db: Session, ranking_id: int) -> int:
+    """Replace a ranking's standings with a full recomputation; does not commit."""
+    bump_entries_version(db, ranking_id, rebuilt=True)
+    db.query(RankingStanding).filter(RankingStanding.ranking_id == ranking_id).delete()
+    expected = _compute_standings_from_entries(db, ranking_id)
+    if expected:
+        db.execute(insert(RankingStanding), [
+            {
+                "ranking_id": ranking_id,
+                "player_id": pid,
+                "total_points": total,
+                "tournaments_played": played,
+                "best_placement": best,
+            }
+            for pid, (total, played, best) in expected.items()
+        ])
+    return len(expected)
@@ -0,0 +1,66 @@
+"""
+Rolling-window roll-forward: expire results that left each ranking's window.
+
+``roll_forward_rankings`` moves every windowed ranking's cutoff to today;
+each move only subtracts the entries of the tournaments that expired since
+the last roll (see ranking_service.roll_ranking_window).  It runs at
+startup and then once a day from a background thread.
+"""
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from app.core.database import SessionLocal
+from app.models.ranking import Ranking
+from app.services.ranking_service import roll_ranking_window
+
+logger = logging.getLogger(__name__)
+
+# Seconds after midnight at which the daily roll-forward runs
+ROLL_AT_SECONDS = 60
+
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def roll_forward_rankings(today: Optional[date] = None) -> Dict[int, int]:
+    """
+    Roll every rolling-window ranking forward to ``today``, one transaction
+    per ranking.  Returns ranking id -> number of entries expired.
+    """
+    db = SessionLocal()
+    expired: Dict[int, int] = {}
+    try:
+        for ranking in db.query(Ranking).filter(Ranking.window_days.isnot(None)).all():
+            try:
+                expired[ranking.id] = roll_ranking_window(db, ranking, today)
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.exception("Rolling ranking %s forward failed", ranking.id)
+        return expired
+    finally:
+        db.close()
+
+
+def _seconds_until_next_roll() -> float:
+    now = datetime.now()
+    next_run = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (next_run - now).total_seconds() + ROLL_AT_SECONDS
+
+
+def _run() -> None:
+    while True:
+        threading.Event().wait(_seconds_until_next_roll())
+        expired = roll_forward_rankings()
+        logger.info("Rolled ranking windows forward: %s", expired)
+
+
+def start_window_scheduler() -> None:
+    """Start the daily roll-forward thread (once per process)."""
+    global _thread
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_run, name="ranking-window", daemon=True)
+            _thread.start()
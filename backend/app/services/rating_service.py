@@ -0,0 +1,379 @@
+"""
+Rating service: Elo-style player ratings across all tournaments.
+
+Results are rated in one canonical order, the order of play: tournaments
+by date, pool matches in play order, then the bracket round by round,
+with the match id breaking ties.  Every rated result is logged in
+rating_changes with its place in that order and the ratings both players
+had before the match.
+
+A result that lands after everything already rated (the live case) is
+applied in O(1) to the two players' rating rows.  A result that lands
+earlier, a corrected or removed result, or a tournament moved to another
+date replays from that point only the changes of the players whose
+rating it affected, starting from the logged checkpoints.  The full
+replay rebuilds the log from the match tables in the same order, so both
+paths give the same ratings.
+"""
+import heapq
+from datetime import date, datetime
+from typing import List, Dict, Any, Optional, Iterable, Set, Tuple
+
+from sqlalchemy import insert, or_, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.player import Player
+from app.models.rating import PlayerRating, RatingChange
+from app.models.tournament import Tournament
+from app.models.tournament_models import PoolMatch, BracketMatch
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+
+# Bracket rounds are placed after every pool match of their tournament
+BRACKET_POSITION = 1_000_000
+
+# (played_on, tournament_id, position, match_type, match_id)
+OrderKey = Tuple[date, int, int, str, int]
+
+
+def win_probability(rating_a: float, rating_b: float) -> float:
+    """Expected score of a player rated ``rating_a`` against ``rating_b``."""
+    return 1.0 / (1.0 + 10 ** ((rating_b - rating_a) / 400.0))
+
+
+def _delta(winner_rating: float, loser_rating: float) -> float:
+    return K_FACTOR * (1.0 - win_probability(winner_rating, loser_rating))
+
+
+def get_ratings(db: Session, player_ids: Iterable[int]) -> Dict[int, float]:
+    """Current ratings of the given players (unrated players get the initial rating)."""
+    player_ids = list(player_ids)
+    ratings = {pid: INITIAL_RATING for pid in player_ids}
+    if player_ids:
+        ratings.update(
+            db.query(PlayerRating.player_id, PlayerRating.rating)
+            .filter(PlayerRating.player_id.in_(player_ids))
+            .all()
+        )
+    return ratings
+
+
+def _rating_row(db: Session, player_id: int) -> PlayerRating:
+    row = db.get(PlayerRating, player_id)
+    if row is None:
+        row = PlayerRating(player_id=player_id, rating=INITIAL_RATING, matches_rated=0)
+        db.add(row)
+    return row
+
+
+# ── Rating order ──
+def _played_on(start_date: Optional[date], created_at: Optional[datetime]) -> date:
+    """The date a tournament's results are rated at."""
+    if start_date is not None:
+        return start_date
+    return (created_at or datetime.now()).date()
+
+
+def _position(db: Session, match_type: str, match_id: int) -> int:
+    if match_type == "pool":
+        return db.get(PoolMatch, match_id).play_order or 0
+    return BRACKET_POSITION + db.get(BracketMatch, match_id).round_number
+
+
+def _order_columns():
+    return (
+        RatingChange.played_on, RatingChange.tournament_id, RatingChange.position,
+        RatingChange.match_type, RatingChange.match_id,
+    )
+
+
+def _key(change: RatingChange) -> OrderKey:
+    return (change.played_on, change.tournament_id, change.position, change.match_type, change.match_id)
+
+
+def _involving(player_id: int):
+    return or_(RatingChange.winner_id == player_id, RatingChange.loser_id == player_id)
+
+
+def _rating_before(db: Session, player_id: int, start: OrderKey) -> float:
+    """A player's rating just before ``start``, from their last earlier change."""
+    last = (
+        db.query(RatingChange)
+        .filter(_involving(player_id), tuple_(*_order_columns()) < tuple_(*start))
+        .order_by(*(c.desc() for c in _order_columns()))
+        .first()
+    )
+    if last is None:
+        return INITIAL_RATING
+    if last.winner_id == player_id:
+        return last.winner_before + last.delta
+    return last.loser_before - last.delta
+
+
+def _changes_from(db: Session, player_id: int, start: OrderKey, inclusive: bool) -> List[RatingChange]:
+    order = tuple_(*_order_columns())
+    bound = order >= tuple_(*start) if inclusive else order > tuple_(*start)
+    return db.query(RatingChange).filter(_involving(player_id), bound).order_by(*_order_columns()).all()
+
+
+def _replay(db: Session, start: OrderKey, players: Set[int], played: Dict[int, int]) -> None:
+    """
+    Recompute the rating changes from ``start`` on.
+
+    ``players`` are the players whose rating changes at ``start``: their
+    later changes are recomputed in rating order, and a player they meet
+    is followed from that match on.  Everyone else keeps their stored
+    checkpoints.  ``played`` adjusts the players' matches_rated.
+    """
+    db.flush()
+    current = {pid: _rating_before(db, pid, start) for pid in players}
+    queue: List[Tuple[OrderKey, int, RatingChange]] = []
+    done: Set[int] = set()
+
+    def follow(player_id: int, after: OrderKey, inclusive: bool) -> None:
+        for c in _changes_from(db, player_id, after, inclusive):
+            if c.id not in done:
+                heapq.heappush(queue, (_key(c), c.id, c))
+
+    for pid in players:
+        follow(pid, start, True)
+    while queue:
+        key, cid, c = heapq.heappop(queue)
+        if cid in done:
+            continue
+        done.add(cid)
+        for pid, stored in ((c.winner_id, c.winner_before), (c.loser_id, c.loser_before)):
+            if pid not in current:
+                # Unaffected up to here, so the stored checkpoint still holds
+                current[pid] = stored
+                follow(pid, key, False)
+        c.winner_before = current[c.winner_id]
+        c.loser_before = current[c.loser_id]
+        c.delta = _delta(c.winner_before, c.loser_before)
+        current[c.winner_id] = c.winner_before + c.delta
+        current[c.loser_id] = c.loser_before - c.delta
+
+    for pid, rating in current.items():
+        row = db.get(PlayerRating, pid)
+        matches_rated = (row.matches_rated if row is not None else 0) + played.get(pid, 0)
+        if matches_rated <= 0:
+            # No rated results left: the player is unrated again
+            if row is not None:
+                db.delete(row)
+            continue
+        row = row or _rating_row(db, pid)
+        row.rating = rating
+        row.matches_rated = matches_rated
+    db.flush()
+
+
+def record_match_result(
+    db: Session, match_type: str, match_id: int, tournament_id: int,
+    winner_id: int, loser_id: int,
+) -> None:
+    """
+    Apply a scored match to the ratings.  A new result that comes after
+    every rated one is applied in O(1); an earlier or a changed result
+    triggers a targeted replay.  Runs in the caller's transaction.
+    """
+    existing = (
+        db.query(RatingChange)
+        .filter(RatingChange.match_type == match_type, RatingChange.match_id == match_id)
+        .first()
+    )
+    if existing is not None:
+        if (existing.winner_id, existing.loser_id) == (winner_id, loser_id):
+            return
+        # Corrected result: rated again at the same place in the order
+        played: Dict[int, int] = {}
+        for pid in (existing.winner_id, existing.loser_id):
+            played[pid] = played.get(pid, 0) - 1
+        for pid in (winner_id, loser_id):
+            played[pid] = played.get(pid, 0) + 1
+        players = {existing.winner_id, existing.loser_id, winner_id, loser_id}
+        existing.winner_id, existing.loser_id = winner_id, loser_id
+        _replay(db, _key(existing), players, played)
+        return
+
+    t = db.get(Tournament, tournament_id)
+    change = RatingChange(
+        match_type=match_type, match_id=match_id, tournament_id=tournament_id,
+        played_on=_played_on(t.start_date, t.created_at), position=_position(db, match_type, match_id),
+        winner_id=winner_id, loser_id=loser_id,
+    )
+    later = (
+        db.query(RatingChange.id)
+        .filter(tuple_(*_order_columns()) > tuple_(*_key(change)))
+        .first()
+    )
+    if later is not None:
+        # Lands before results already rated: slot it in and replay after it
+        change.winner_before = change.loser_before = INITIAL_RATING
+        change.delta = 0.0
+        db.add(change)
+        _replay(db, _key(change), {winner_id, loser_id}, {winner_id: 1, loser_id: 1})
+        return
+
+    winner = _rating_row(db, winner_id)
+    loser = _rating_row(db, loser_id)
+    change.winner_before = winner.rating
+    change.loser_before = loser.rating
+    change.delta = _delta(winner.rating, loser.rating)
+    db.add(change)
+    winner.rating += change.delta
+    loser.rating -= change.delta
+    winner.matches_rated += 1
+    loser.matches_rated += 1
+    db.flush()
+
+
+def remove_match_results(
+    db: Session, match_type: str,
+    match_ids: Optional[Iterable[int]] = None, tournament_id: Optional[int] = None,
+) -> int:
+    """
+    Withdraw rated results (a reset bracket match, regenerated pools or
+    bracket, a deleted tournament) and replay the affected later changes.
+    Players left without rated results lose their rating row.  Returns the
+    number of results removed.
+    """
+    query = db.query(RatingChange).filter(RatingChange.match_type == match_type)
+    if match_ids is not None:
+        query = query.filter(RatingChange.match_id.in_(list(match_ids)))
+    if tournament_id is not None:
+        query = query.filter(RatingChange.tournament_id == tournament_id)
+    changes = query.all()
+    if not changes:
+        return 0
+    start = min(_key(c) for c in changes)
+    played: Dict[int, int] = {}
+    for c in changes:
+        for pid in (c.winner_id, c.loser_id):
+            played[pid] = played.get(pid, 0) - 1
+        db.delete(c)
+    _replay(db, start, set(played), played)
+    return len(changes)
+
+
+def move_tournament_ratings(db: Session, tournament: Tournament) -> None:
+    """Re-place a tournament's rated results after its date changed."""
+    changes = db.query(RatingChange).filter(RatingChange.tournament_id == tournament.id).all()
+    played_on = _played_on(tournament.start_date, tournament.created_at)
+    if not changes or all(c.played_on == played_on for c in changes):
+        return
+    start = min(_key(c) for c in changes)
+    players: Set[int] = set()
+    for c in changes:
+        c.played_on = played_on
+        players.update((c.winner_id, c.loser_id))
+    _replay(db, min(start, min(_key(c) for c in changes)), players, {})
+
+
+def replay_all_ratings(db: Session) -> Dict[str, int]:
+    """
+    Rebuild all ratings from the full history of played pool and bracket
+    matches, in rating order.  Computed in memory and written with bulk
+    inserts in one transaction.
+    """
+    played_on = {
+        tid: _played_on(start_date, created_at)
+        for tid, start_date, created_at in db.query(Tournament.id, Tournament.start_date, Tournament.created_at)
+    }
+    results: List[Tuple[OrderKey, int, int, int]] = []
+    pool_rows = (
+        db.query(PoolMatch.id, PoolMatch.tournament_id, PoolMatch.winner_id,
+                 PoolMatch.player1_id, PoolMatch.player2_id, PoolMatch.play_order)
+        .filter(PoolMatch.played == 1, PoolMatch.winner_id.isnot(None))
+        .all()
+    )
+    for m in pool_rows:
+        key = (played_on[m.tournament_id], m.tournament_id, m.play_order or 0, "pool", m.id)
+        results.append((key, m.winner_id, m.player1_id, m.player2_id))
+    bracket_rows = (
+        db.query(BracketMatch.id, BracketMatch.tournament_id, BracketMatch.winner_id,
+                 BracketMatch.player1_id, BracketMatch.player2_id, BracketMatch.round_number)
+        .filter(
+            BracketMatch.played == 1, BracketMatch.winner_id.isnot(None),
+            BracketMatch.player1_id.isnot(None), BracketMatch.player2_id.isnot(None),
+        )
+        .all()
+    )
+    for m in bracket_rows:
+        key = (played_on[m.tournament_id], m.tournament_id, BRACKET_POSITION + m.round_number, "bracket", m.id)
+        results.append((key, m.winner_id, m.player1_id, m.player2_id))
+    results.sort(key=lambda r: r[0])
+
+    ratings: Dict[int, float] = {}
+    counts: Dict[int, int] = {}
+    changes: List[Dict[str, Any]] = []
+    for (day, tid, position, match_type, match_id), winner_id, player1_id, player2_id in results:
+        loser_id = player2_id if winner_id == player1_id else player1_id
+        wr = ratings.get(winner_id, INITIAL_RATING)
+        lr = ratings.get(loser_id, INITIAL_RATING)
+        delta = _delta(wr, lr)
+        changes.append({
+            "match_type": match_type, "match_id": match_id, "tournament_id": tid,
+            "played_on": day, "position": position,
+            "winner_id": winner_id, "loser_id": loser_id,
+            "winner_before": wr, "loser_before": lr, "delta": delta,
+        })
+        ratings[winner_id] = wr + delta
+        ratings[loser_id] = lr - delta
+        counts[winner_id] = counts.get(winner_id, 0) + 1
+        counts[loser_id] = counts.get(loser_id, 0) + 1
+
+    db.query(RatingChange).delete()
+    db.query(PlayerRating).delete()
+    if changes:
+        db.execute(insert(RatingChange), changes)
+    if ratings:
+        db.execute(insert(PlayerRating), [
+            {"player_id": pid, "rating": rating, "matches_rated": counts[pid]}
+            for pid, rating in ratings.items()
+        ])
+    db.commit()
+    return {"matches_rated": len(changes), "players_rated": len(ratings)}
+
+
+def backfill_ratings() -> int:
+    """
+    Rebuild the ratings of databases created before ratings existed, or
+    whose changes were logged before the rating order was.  Returns the
+    number of results rated (0 when the log was already complete).
+    """
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if db.query(RatingChange.id).first() is not None:
+            if db.query(RatingChange.id).filter(RatingChange.played_on.is_(None)).first() is None:
+                return 0
+        elif (
+            db.query(PoolMatch.id).filter(PoolMatch.played == 1, PoolMatch.winner_id.isnot(None)).first() is None
+            and db.query(BracketMatch.id).filter(BracketMatch.played == 1, BracketMatch.winner_id.isnot(None)).first() is None
+        ):
+            return 0
+        return replay_all_ratings(db)["matches_rated"]
+    finally:
+        db.close()
+
+
+def get_rating_table(db: Session, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Rated players ordered by rating."""
+    query = (
+        db.query(PlayerRating, Player.name)
+        .join(Player, Player.id == PlayerRating.player_id)
+        .order_by(PlayerRating.rating.desc(), PlayerRating.player_id)
+    )
+    if limit:
+        query = query.limit(limit)
+    return [
+        {
+            "player_id": r.player_id,
+            "player_name": name,
+            "rating": round(r.rating, 1),
+            "matches_rated": r.matches_rated,
+        }
+        for r, name in query.all()
+    ]
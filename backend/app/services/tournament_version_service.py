@@ -0,0 +1,62 @@
+"""
+Tournament versions: a per-tournament counter bumped by every write to
+the tournament, its roster, pools, matches or ranking link.
+
+Read endpoints derive their ETag from it, so a polling client that already
+has the current representation costs a single primary-key lookup.  Every
+bump also drops the tournament's entries from the public response cache.
+"""
+from sqlalchemy.orm import Session, object_session
+
+from app.core.etag import make_etag
+from app.models.ranking import Ranking
+from app.models.tournament import Tournament
+from app.models.tournament_models import TournamentPlayer
+from app.services.public_cache_service import invalidate_tournament
+
+
+def bump_tournament_version(tournament: Tournament) -> None:
+    """Mark a tournament as changed (applied on flush)."""
+    tournament.version = Tournament.version + 1
+    if tournament.id is not None:
+        invalidate_tournament(object_session(tournament), tournament.id)
+
+
+def bump_tournament_versions(db: Session, *criteria) -> int:
+    """Bump every tournament matching ``criteria``; returns the number bumped."""
+    tournament_ids = [tid for (tid,) in db.query(Tournament.id).filter(*criteria)]
+    if not tournament_ids:
+        return 0
+    for tournament_id in tournament_ids:
+        invalidate_tournament(db, tournament_id)
+    return (
+        db.query(Tournament)
+        .filter(Tournament.id.in_(tournament_ids))
+        .update({Tournament.version: Tournament.version + 1}, synchronize_session=False)
+    )
+
+
+def bump_player_tournaments(db: Session, player_id: int) -> int:
+    """Bump the tournaments a player takes part in (their reads show the player)."""
+    tournament_ids = (
+        db.query(TournamentPlayer.tournament_id)
+        .filter(TournamentPlayer.player_id == player_id)
+        .scalar_subquery()
+    )
+    return bump_tournament_versions(db, Tournament.id.in_(tournament_ids))
+
+
+def tournament_etag(db: Session, tournament: Tournament, with_ranking: bool = False) -> str:
+    """
+    ETag of a tournament read.  ``with_ranking`` adds the linked ranking's
+    entries version for reads that show ranking points.  The rows' random
+    epochs keep a recreated row that reuses a deleted id from matching.
+    """
+    parts = [tournament.id, tournament.epoch, tournament.version or 0]
+    if with_ranking and tournament.ranking_id:
+        ranking = (
+            db.query(Ranking.epoch, Ranking.entries_version).filter(Ranking.id == tournament.ranking_id).first()
+        )
+        if ranking is not None:
+            parts += ["r", tournament.ranking_id, ranking.epoch, ranking.entries_version or 0]
+    return make_etag(*parts)
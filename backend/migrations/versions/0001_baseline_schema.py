@@ -0,0 +1,209 @@
+"""Baseline schema: the tables as first created by Base.metadata.create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('players',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('nickname', sa.String(length=100), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_players_id', 'players', ['id'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('is_approved', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table('rankings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=True),
+    sa.Column('points_mode', sa.String(length=20), nullable=False),
+    sa.Column('winner_bracket_multiplier', sa.Integer(), nullable=True),
+    sa.Column('loser_bracket_multiplier', sa.Integer(), nullable=True),
+    sa.Column('flexible_base_winner', sa.Integer(), nullable=True),
+    sa.Column('flexible_base_loser', sa.Integer(), nullable=True),
+    sa.Column('points_first', sa.Integer(), nullable=True),
+    sa.Column('points_second', sa.Integer(), nullable=True),
+    sa.Column('points_third', sa.Integer(), nullable=True),
+    sa.Column('points_fourth', sa.Integer(), nullable=True),
+    sa.Column('points_fifth', sa.Integer(), nullable=True),
+    sa.Column('points_sixth', sa.Integer(), nullable=True),
+    sa.Column('points_seventh', sa.Integer(), nullable=True),
+    sa.Column('points_eighth', sa.Integer(), nullable=True),
+    sa.Column('points_participation', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_rankings_id', 'rankings', ['id'], unique=False)
+
+    op.create_table('tournaments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('location', sa.String(length=200), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('game_format', sa.String(length=50), nullable=True),
+    sa.Column('num_players', sa.Integer(), nullable=True),
+    sa.Column('group_size', sa.Integer(), nullable=True),
+    sa.Column('best_of_legs_pool', sa.Integer(), nullable=True),
+    sa.Column('best_of_legs_knockout', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=30), nullable=False),
+    sa.Column('is_published', sa.Boolean(), nullable=False),
+    sa.Column('ranking_id', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['ranking_id'], ['rankings.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tournaments_id', 'tournaments', ['id'], unique=False)
+
+    op.create_table('bracket_matches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('bracket_type', sa.String(length=20), nullable=False),
+    sa.Column('round_number', sa.Integer(), nullable=False),
+    sa.Column('match_number', sa.Integer(), nullable=False),
+    sa.Column('player1_id', sa.Integer(), nullable=True),
+    sa.Column('player2_id', sa.Integer(), nullable=True),
+    sa.Column('player1_legs', sa.Integer(), nullable=True),
+    sa.Column('player2_legs', sa.Integer(), nullable=True),
+    sa.Column('winner_id', sa.Integer(), nullable=True),
+    sa.Column('loser_id', sa.Integer(), nullable=True),
+    sa.Column('played', sa.Integer(), nullable=True),
+    sa.Column('next_winner_match_id', sa.Integer(), nullable=True),
+    sa.Column('next_loser_match_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['loser_id'], ['players.id'], ),
+    sa.ForeignKeyConstraint(['next_loser_match_id'], ['bracket_matches.id'], ),
+    sa.ForeignKeyConstraint(['next_winner_match_id'], ['bracket_matches.id'], ),
+    sa.ForeignKeyConstraint(['player1_id'], ['players.id'], ),
+    sa.ForeignKeyConstraint(['player2_id'], ['players.id'], ),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['winner_id'], ['players.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_bracket_matches_id', 'bracket_matches', ['id'], unique=False)
+
+    op.create_table('pools',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pools_id', 'pools', ['id'], unique=False)
+
+    op.create_table('ranking_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ranking_id', sa.Integer(), nullable=False),
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('placement', sa.Integer(), nullable=True),
+    sa.Column('points', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['ranking_id'], ['rankings.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ranking_entries_id', 'ranking_entries', ['id'], unique=False)
+
+    op.create_table('pool_matches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('pool_id', sa.Integer(), nullable=False),
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('player1_id', sa.Integer(), nullable=False),
+    sa.Column('player2_id', sa.Integer(), nullable=False),
+    sa.Column('player1_legs', sa.Integer(), nullable=True),
+    sa.Column('player2_legs', sa.Integer(), nullable=True),
+    sa.Column('winner_id', sa.Integer(), nullable=True),
+    sa.Column('played', sa.Integer(), nullable=True),
+    sa.Column('round_number', sa.Integer(), nullable=True),
+    sa.Column('play_order', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['player1_id'], ['players.id'], ),
+    sa.ForeignKeyConstraint(['player2_id'], ['players.id'], ),
+    sa.ForeignKeyConstraint(['pool_id'], ['pools.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['winner_id'], ['players.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pool_matches_id', 'pool_matches', ['id'], unique=False)
+
+    op.create_table('tournament_players',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('seed', sa.Integer(), nullable=True),
+    sa.Column('pool_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['pool_id'], ['pools.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tournament_players_id', 'tournament_players', ['id'], unique=False)
+
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tournament_players_id', table_name='tournament_players')
+
+    op.drop_table('tournament_players')
+    op.drop_index('ix_pool_matches_id', table_name='pool_matches')
+
+    op.drop_table('pool_matches')
+    op.drop_index('ix_ranking_entries_id', table_name='ranking_entries')
+
+    op.drop_table('ranking_entries')
+    op.drop_index('ix_pools_id', table_name='pools')
+
+    op.drop_table('pools')
+    op.drop_index('ix_bracket_matches_id', table_name='bracket_matches')
+
+    op.drop_table('bracket_matches')
+    op.drop_index('ix_tournaments_id', table_name='tournaments')
+
+    op.drop_table('tournaments')
+    op.drop_index('ix_rankings_id', table_name='rankings')
+
+    op.drop_table('rankings')
+    op.drop_index('ix_users_username', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+
+    op.drop_table('users')
+    op.drop_index('ix_players_id', table_name='players')
+
+    op.drop_table('players')
@@ -0,0 +1,50 @@
+"""Materialized ranking standings
+
+Databases created by ``Base.metadata.create_all`` before migrations were
+introduced are stamped at the baseline; create_all already added this
+table to the ones created after it existed, so it is only created when
+missing.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('ranking_standings'):
+        return
+    op.create_table(
+        'ranking_standings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ranking_id', sa.Integer(), nullable=False),
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('total_points', sa.Integer(), nullable=False),
+        sa.Column('tournaments_played', sa.Integer(), nullable=False),
+        sa.Column('best_placement', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['ranking_id'], ['rankings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('ranking_id', 'player_id', name='uq_ranking_standings_player'),
+    )
+    op.create_index('ix_ranking_standings_id', 'ranking_standings', ['id'])
+    op.create_index('ix_ranking_standings_order', 'ranking_standings', ['ranking_id', 'total_points', 'best_placement'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ranking_standings_order', table_name='ranking_standings')
+    op.drop_index('ix_ranking_standings_id', table_name='ranking_standings')
+    op.drop_table('ranking_standings')
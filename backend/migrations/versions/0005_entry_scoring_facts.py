@@ -0,0 +1,37 @@
+"""Scoring facts on ranking entries
+
+Entries written before this revision keep NULL facts; a ranking that has
+any is recalculated from the brackets instead of re-scored.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ranking_entries', sa.Column('bracket_placement', sa.Integer(), nullable=True))
+    op.add_column('ranking_entries', sa.Column('in_winner_bracket', sa.Boolean(), nullable=True))
+    op.add_column('ranking_entries', sa.Column('winner_bracket_wins', sa.Integer(), nullable=True))
+    op.add_column('ranking_entries', sa.Column('loser_bracket_wins', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('ranking_entries') as batch_op:
+        batch_op.drop_column('loser_bracket_wins')
+        batch_op.drop_column('winner_bracket_wins')
+        batch_op.drop_column('in_winner_bracket')
+        batch_op.drop_column('bracket_placement')
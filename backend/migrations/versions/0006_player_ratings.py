@@ -0,0 +1,55 @@
+"""Player ratings and the rating change log
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 09:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'player_ratings',
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Float(), nullable=False),
+        sa.Column('matches_rated', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('player_id'),
+    )
+    op.create_table(
+        'rating_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('match_type', sa.String(length=20), nullable=False),
+        sa.Column('match_id', sa.Integer(), nullable=False),
+        sa.Column('tournament_id', sa.Integer(), nullable=False),
+        sa.Column('winner_id', sa.Integer(), nullable=False),
+        sa.Column('loser_id', sa.Integer(), nullable=False),
+        sa.Column('winner_before', sa.Float(), nullable=False),
+        sa.Column('loser_before', sa.Float(), nullable=False),
+        sa.Column('delta', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['loser_id'], ['players.id']),
+        sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['winner_id'], ['players.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('match_type', 'match_id', name='uq_rating_changes_match'),
+    )
+    op.create_index('ix_rating_changes_id', 'rating_changes', ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rating_changes_id', table_name='rating_changes')
+    op.drop_table('rating_changes')
+    op.drop_table('player_ratings')
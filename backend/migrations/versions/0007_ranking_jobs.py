@@ -0,0 +1,48 @@
+"""Ranking recalculation jobs
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'ranking_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ranking_id', sa.Integer(), nullable=False),
+        sa.Column('tournament_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('generation', sa.Integer(), nullable=False),
+        sa.Column('triggers', sa.Integer(), nullable=False),
+        sa.Column('runs', sa.Integer(), nullable=False),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('requested_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['ranking_id'], ['rankings.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('ranking_id', 'tournament_id', name='uq_ranking_jobs_tournament'),
+    )
+    op.create_index('ix_ranking_jobs_id', 'ranking_jobs', ['id'])
+    op.create_index('ix_ranking_jobs_status', 'ranking_jobs', ['status'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ranking_jobs_status', table_name='ranking_jobs')
+    op.drop_index('ix_ranking_jobs_id', table_name='ranking_jobs')
+    op.drop_table('ranking_jobs')
@@ -0,0 +1,39 @@
+"""Player career stats
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 10:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'player_stats',
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('matches_played', sa.Integer(), nullable=False),
+        sa.Column('matches_won', sa.Integer(), nullable=False),
+        sa.Column('legs_won', sa.Integer(), nullable=False),
+        sa.Column('legs_lost', sa.Integer(), nullable=False),
+        sa.Column('titles', sa.Integer(), nullable=False),
+        sa.Column('tournaments_placed', sa.Integer(), nullable=False),
+        sa.Column('placement_sum', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('player_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('player_stats')
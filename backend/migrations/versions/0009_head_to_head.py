@@ -0,0 +1,67 @@
+"""Head-to-head records and match lists
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'head_to_head',
+        sa.Column('player_low_id', sa.Integer(), nullable=False),
+        sa.Column('player_high_id', sa.Integer(), nullable=False),
+        sa.Column('matches', sa.Integer(), nullable=False),
+        sa.Column('low_wins', sa.Integer(), nullable=False),
+        sa.Column('high_wins', sa.Integer(), nullable=False),
+        sa.Column('low_legs', sa.Integer(), nullable=False),
+        sa.Column('high_legs', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['player_high_id'], ['players.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['player_low_id'], ['players.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('player_low_id', 'player_high_id'),
+    )
+    op.create_index('ix_head_to_head_high', 'head_to_head', ['player_high_id'])
+    op.create_table(
+        'head_to_head_matches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('player_low_id', sa.Integer(), nullable=False),
+        sa.Column('player_high_id', sa.Integer(), nullable=False),
+        sa.Column('match_type', sa.String(length=20), nullable=False),
+        sa.Column('match_id', sa.Integer(), nullable=False),
+        sa.Column('tournament_id', sa.Integer(), nullable=False),
+        sa.Column('winner_id', sa.Integer(), nullable=False),
+        sa.Column('low_legs', sa.Integer(), nullable=False),
+        sa.Column('high_legs', sa.Integer(), nullable=False),
+        sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['player_high_id'], ['players.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['player_low_id'], ['players.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['winner_id'], ['players.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('match_type', 'match_id', name='uq_head_to_head_matches_match'),
+    )
+    op.create_index('ix_head_to_head_matches_id', 'head_to_head_matches', ['id'])
+    op.create_index('ix_head_to_head_matches_pair', 'head_to_head_matches', ['player_low_id', 'player_high_id', 'id'])
+    op.create_index('ix_head_to_head_matches_tournament', 'head_to_head_matches', ['tournament_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_head_to_head_matches_tournament', table_name='head_to_head_matches')
+    op.drop_index('ix_head_to_head_matches_pair', table_name='head_to_head_matches')
+    op.drop_index('ix_head_to_head_matches_id', table_name='head_to_head_matches')
+    op.drop_table('head_to_head_matches')
+    op.drop_index('ix_head_to_head_high', table_name='head_to_head')
+    op.drop_table('head_to_head')
@@ -0,0 +1,33 @@
+"""Per-player match history indexes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_pool_matches_player1', 'pool_matches', ['player1_id', 'tournament_id'])
+    op.create_index('ix_pool_matches_player2', 'pool_matches', ['player2_id', 'tournament_id'])
+    op.create_index('ix_bracket_matches_player1', 'bracket_matches', ['player1_id', 'tournament_id'])
+    op.create_index('ix_bracket_matches_player2', 'bracket_matches', ['player2_id', 'tournament_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bracket_matches_player2', table_name='bracket_matches')
+    op.drop_index('ix_bracket_matches_player1', table_name='bracket_matches')
+    op.drop_index('ix_pool_matches_player2', table_name='pool_matches')
+    op.drop_index('ix_pool_matches_player1', table_name='pool_matches')
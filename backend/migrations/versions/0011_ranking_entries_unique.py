@@ -0,0 +1,34 @@
+"""One ranking entry per player and tournament
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 10:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the newest of any duplicate entries the constraint would reject
+    op.execute(
+        'DELETE FROM ranking_entries WHERE id NOT IN ('
+        'SELECT MAX(id) FROM ranking_entries GROUP BY ranking_id, tournament_id, player_id)'
+    )
+    with op.batch_alter_table('ranking_entries') as batch_op:
+        batch_op.create_unique_constraint('uq_ranking_entries_player', ['ranking_id', 'tournament_id', 'player_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('ranking_entries') as batch_op:
+        batch_op.drop_constraint('uq_ranking_entries_player', type_='unique')
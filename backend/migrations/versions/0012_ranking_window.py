@@ -0,0 +1,32 @@
+"""Rolling-window rankings
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 10:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, Sequence[str], None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rankings', sa.Column('window_days', sa.Integer(), nullable=True))
+    op.add_column('rankings', sa.Column('window_cutoff', sa.Date(), nullable=True))
+    op.create_index('ix_tournaments_ranking_id', 'tournaments', ['ranking_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tournaments_ranking_id', table_name='tournaments')
+    with op.batch_alter_table('rankings') as batch_op:
+        batch_op.drop_column('window_cutoff')
+        batch_op.drop_column('window_days')
@@ -0,0 +1,35 @@
+"""Dashboard counters
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19 11:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0015'
+down_revision: Union[str, Sequence[str], None] = '0014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'dashboard_counters',
+        sa.Column('owner_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('active_tournaments', sa.Integer(), nullable=False),
+        sa.Column('total_tournaments', sa.Integer(), nullable=False),
+        sa.Column('total_players', sa.Integer(), nullable=False),
+        sa.Column('matches_played', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('owner_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dashboard_counters')
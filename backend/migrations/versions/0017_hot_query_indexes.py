@@ -0,0 +1,47 @@
+"""Indexes on the hot filter columns
+
+Pool, bracket, roster and ranking reads filter on these columns; with
+foreign keys enforced, deletes of pools, bracket matches and players
+also look them up.  ``python -m app.check_query_plans`` verifies that the
+main service queries use them.
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-19 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0017'
+down_revision: Union[str, Sequence[str], None] = '0016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_pools_tournament', 'pools', ['tournament_id']),
+    ('ix_pool_matches_pool', 'pool_matches', ['pool_id']),
+    ('ix_pool_matches_tournament', 'pool_matches', ['tournament_id']),
+    (
+        'ix_bracket_matches_tournament', 'bracket_matches',
+        ['tournament_id', 'bracket_type', 'round_number', 'match_number'],
+    ),
+    ('ix_bracket_matches_next_winner', 'bracket_matches', ['next_winner_match_id']),
+    ('ix_bracket_matches_next_loser', 'bracket_matches', ['next_loser_match_id']),
+    ('ix_tournament_players_pool', 'tournament_players', ['pool_id']),
+    ('ix_ranking_entries_player', 'ranking_entries', ['player_id', 'ranking_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,42 @@
+"""Rating order columns on the rating change log
+
+Existing changes keep NULL until the startup backfill rebuilds the log
+in rating order.
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-19 11:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0018'
+down_revision: Union[str, Sequence[str], None] = '0017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rating_changes', sa.Column('played_on', sa.Date(), nullable=True))
+    op.add_column('rating_changes', sa.Column('position', sa.Integer(), nullable=True))
+    op.create_index(
+        'ix_rating_changes_order', 'rating_changes',
+        ['played_on', 'tournament_id', 'position', 'match_type', 'match_id'],
+    )
+    op.create_index('ix_rating_changes_winner', 'rating_changes', ['winner_id'])
+    op.create_index('ix_rating_changes_loser', 'rating_changes', ['loser_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rating_changes_loser', table_name='rating_changes')
+    op.drop_index('ix_rating_changes_winner', table_name='rating_changes')
+    op.drop_index('ix_rating_changes_order', table_name='rating_changes')
+    with op.batch_alter_table('rating_changes') as batch_op:
+        batch_op.drop_column('position')
+        batch_op.drop_column('played_on')
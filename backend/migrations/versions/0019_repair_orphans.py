@@ -0,0 +1,83 @@
+"""Repair rows left dangling while foreign keys were not enforced
+
+Before SQLite enforced foreign keys, deleting a player or a pool left
+their match, roster and ranking rows behind.  Those rows now fail the
+foreign key checks of any write that touches them (e.g. rebuilding the
+ranking standings at startup).  Dangling references in nullable columns
+are cleared and rows with a dangling required reference are deleted,
+until ``PRAGMA foreign_key_check`` is clean.  Derived tables built from
+repaired rows are emptied so the startup backfills rebuild them.
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Dict, List, Sequence, Set, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0019'
+down_revision: Union[str, Sequence[str], None] = '0018'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables rebuilt at startup when empty, by the tables they are derived from
+MATCH_TABLES = {'pool_matches', 'bracket_matches'}
+RATING_TABLES = ['rating_changes', 'player_ratings']
+STATS_TABLES = ['player_stats', 'head_to_head_matches', 'head_to_head']
+
+# Each pass repairs the current violations; deleting a row can orphan its
+# own children, which the next pass picks up
+MAX_PASSES = 10
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    if conn.dialect.name != 'sqlite':
+        return
+    repaired: Set[str] = set()
+    rankings: Set[int] = set()
+    for _ in range(MAX_PASSES):
+        violations = conn.exec_driver_sql('PRAGMA foreign_key_check').fetchall()
+        if not violations:
+            break
+        columns: Dict[str, Dict[int, List[str]]] = {}
+        nullable: Dict[str, Set[str]] = {}
+        for table, rowid, _parent, fkid in violations:
+            if table not in columns:
+                columns[table] = {}
+                for fk in conn.exec_driver_sql(f'PRAGMA foreign_key_list("{table}")'):
+                    columns[table].setdefault(fk[0], []).append(fk[3])
+                nullable[table] = {
+                    col[1] for col in conn.exec_driver_sql(f'PRAGMA table_info("{table}")') if not col[3]
+                }
+            if table == 'ranking_entries':
+                rankings.add(conn.exec_driver_sql(
+                    'SELECT ranking_id FROM ranking_entries WHERE rowid = ?', (rowid,),
+                ).scalar())
+            fk_columns = columns[table][fkid]
+            if all(c in nullable[table] for c in fk_columns):
+                assignments = ', '.join(f'"{c}" = NULL' for c in fk_columns)
+                conn.exec_driver_sql(f'UPDATE "{table}" SET {assignments} WHERE rowid = ?', (rowid,))
+            else:
+                conn.exec_driver_sql(f'DELETE FROM "{table}" WHERE rowid = ?', (rowid,))
+            repaired.add(table)
+    else:
+        raise RuntimeError('Dangling foreign keys remain after repair')
+
+    for ranking_id in rankings:
+        conn.exec_driver_sql('DELETE FROM ranking_standings WHERE ranking_id = ?', (ranking_id,))
+    if repaired & (MATCH_TABLES | set(RATING_TABLES)):
+        for table in RATING_TABLES:
+            conn.exec_driver_sql(f'DELETE FROM {table}')
+    if repaired & (MATCH_TABLES | set(STATS_TABLES)):
+        for table in STATS_TABLES:
+            conn.exec_driver_sql(f'DELETE FROM {table}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Deleted rows cannot be restored, and nothing needs undoing
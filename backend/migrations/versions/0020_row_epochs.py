@@ -0,0 +1,38 @@
+"""Random row epochs for tournament and ranking ETags
+
+SQLite may reuse the id of a deleted row, and a recreated tournament's
+version starts over, so ETags also carry a random per-row epoch.
+Existing rows get a random one.
+
+Revision ID: 0020
+Revises: 0019
+Create Date: 2026-10-19 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0020'
+down_revision: Union[str, Sequence[str], None] = '0019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('tournaments', 'rankings')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        # NOT NULL, so the rows already there need a server default
+        op.add_column(table, sa.Column('epoch', sa.Integer(), nullable=False, server_default=sa.text('0')))
+        op.execute(f'UPDATE {table} SET epoch = abs(random() % 2147483648)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('epoch')
@@ -7,14 +7,15 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__))))
 
-from app.core.database import SessionLocal, engine, Base
+from app.core.database import SessionLocal
+from app.core.migrations import upgrade_database
 from app.core.security import get_password_hash
 from app.models.user import User
 from app.models.player import Player
 from app.models.tournament import Tournament
 from app.models.tournament_models import TournamentPlayer, Pool, PoolMatch, BracketMatch
 
-Base.metadata.create_all(bind=engine)
+upgrade_database()
 
 db = SessionLocal()
 try:
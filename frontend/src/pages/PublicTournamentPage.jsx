@@ -43,6 +43,46 @@ export default function PublicTournamentPage() {
     }).catch(() => setRankingPoints({}));
   }, [tournament, id]);
 
+  // Live updates: refetch what a pushed change touched (bursts are coalesced).
+  // Keyed on the id alone so refetched data does not reopen the stream; an
+  // unpublished tournament's stream is refused and the browser closes it.
+  useEffect(() => {
+    const source = new EventSource(`/api/public/tournaments/${id}/live`);
+    const stale = new Set();
+    let timer = null;
+    const refresh = () => {
+      timer = null;
+      if (stale.has('tournament')) {
+        publicApi.get(`/tournaments/${id}`).then((r) => setTournament(r.data));
+      } else {
+        if (stale.has('pools')) {
+          publicApi.get(`/tournaments/${id}/pools`).then((r) => setPools(r.data));
+          publicApi.get(`/tournaments/${id}/standings`).then((r) => setStandings(r.data));
+        }
+        if (stale.has('bracket')) {
+          publicApi.get(`/tournaments/${id}/bracket`).then((r) => setBracket(r.data));
+        }
+      }
+      stale.clear();
+    };
+    source.onmessage = (e) => {
+      const { type } = JSON.parse(e.data);
+      if (type === 'closed') {
+        // Unpublished: the server ends the stream, and must not be reconnected to
+        source.close();
+        return;
+      }
+      if (type === 'pool_match' || type === 'standings') stale.add('pools');
+      else if (type === 'bracket_match') stale.add('bracket');
+      else stale.add('tournament');
+      if (!timer) timer = setTimeout(refresh, 250);
+    };
+    return () => {
+      source.close();
+      if (timer) clearTimeout(timer);
+    };
+  }, [id]);
+
   if (loading) {
     return (
       <div className="flex items-center justify-center min-h-screen bg-gray-50 dark:bg-gray-950">